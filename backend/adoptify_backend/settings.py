@@ -14,8 +14,8 @@ from pathlib import Path
 # from decouple import AutoConfig, Config
 from dotenv import load_dotenv
 import os
-import sys
 from datetime import timedelta
+from corsheaders.defaults import default_headers
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -42,6 +42,8 @@ ALLOWED_HOSTS = os.getenv('ALLOWED_HOSTS', 'localhost').split(',')
 CORS_ALLOWED_ORIGINS = os.getenv('CORS_ALLOWED_ORIGINS', 'http://localhost:3000').split(',')
 CORS_ALLOW_CREDENTIALS = True
 CORS_ALLOW_ALL_ORIGINS = True  # Allow all origins for development
+CORS_ALLOW_HEADERS = (*default_headers, 'idempotency-key')  # Sent by the frontend's donation and application forms
+CORS_EXPOSE_HEADERS = ['Idempotent-Replayed']
 
 # Application definition
 
@@ -58,7 +60,13 @@ INSTALLED_APPS = [
 #    'phonenumber_field',
 ]
 
+# Compress responses with Brotli or gzip (see api/compression.py); turn it off when the front web server does it
+RESPONSE_COMPRESSION = os.getenv('RESPONSE_COMPRESSION', 'True').lower() in ('1', 'true', 'yes')
+
 MIDDLEWARE = [
+    'api.middleware.RequestMetricsMiddleware',  # Outermost, so it measures the whole request (see api/metrics.py)
+    *(['api.compression.CompressionMiddleware'] if RESPONSE_COMPRESSION else []),  # Negotiated through Accept-Encoding
+    'api.replicas.ReplicaRoutingMiddleware',  # Reads of GET requests may use a read replica (see api/replicas.py)
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.security.SecurityMiddleware',
@@ -68,6 +76,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'api.idempotency.IdempotencyMiddleware',  # Replays retried writes sent with an Idempotency-Key (see api/idempotency.py)
 ]
 
 ROOT_URLCONF = 'adoptify_backend.urls'
@@ -91,6 +100,13 @@ TEMPLATES = [
 WSGI_APPLICATION = 'adoptify_backend.wsgi.application'
 
 
+# How the app is served: dev (runserver), wsgi or asgi (gunicorn, see start.sh and gunicorn.conf.py)
+SERVER_MODE = os.getenv('SERVER_MODE', 'dev' if DEBUG else 'wsgi')
+
+# Serve the public catalogue (pet list/detail, shelters, health checks) from the async views in
+# api/async_views.py; only useful under an ASGI server, where they do not hold a thread while waiting
+ASYNC_VIEWS = os.getenv('ASYNC_VIEWS', str(SERVER_MODE == 'asgi')).lower() in ('1', 'true', 'yes')
+
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
@@ -102,16 +118,67 @@ DATABASES = {
         'PASSWORD': os.getenv('DB_PASSWORD'),
         'HOST': os.getenv('DB_HOST'),
         'PORT': os.getenv('DB_PORT', default='3306'),
+        # Keep connections open between requests (one per worker thread) and check them before reuse.
+        # Under ASGI, connections are not reused across requests, so persistence defaults to off there.
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', '0' if SERVER_MODE == 'asgi' else '60')),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'connect_timeout': int(os.getenv('DB_CONNECT_TIMEOUT', '5')),
+        },
     }
 }
 
-if 'test' in sys.argv:  # Check if tests are being run
-    DATABASES = {
-        'default': {
-            'ENGINE': 'django.db.backends.sqlite3',
-            'NAME': os.path.join(BASE_DIR, 'db_test.sqlite3'),
-        }
-    }
+# Read replicas: DB_REPLICA_HOSTS lists hosts serving replicated copies of the default database (same
+# name and credentials). api.replicas.PrimaryReplicaRouter spreads the reads of GET requests over them;
+# after a write, the user's reads stay on the primary for DB_REPLICA_STICKY_SECONDS.
+DATABASE_REPLICAS = []
+for index, host in enumerate(filter(None, os.getenv('DB_REPLICA_HOSTS', '').split(',')), start=1):
+    DATABASES[f'replica{index}'] = {**DATABASES['default'], 'HOST': host.strip(), 'TEST': {'MIRROR': 'default'}}
+    DATABASE_REPLICAS.append(f'replica{index}')
+
+DATABASE_ROUTERS = ['api.replicas.PrimaryReplicaRouter']
+REPLICA_STICKY_SECONDS = int(os.getenv('DB_REPLICA_STICKY_SECONDS', '10'))
+
+# Tests use adoptify_backend/test_settings.py (in-memory SQLite), selected by pytest.ini and manage.py test
+
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+# Defaults to the in-process locmem cache; point CACHE_BACKEND/CACHE_LOCATION at Redis or memcached
+# (e.g. django.core.cache.backends.redis.RedisCache, redis://redis:6379/1) to share it between workers.
+
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', 'adoptify-default'),
+    },
+    # Serialized pet rows (see api/cache.py). Entries are keyed by the row's updated_at, so a per-process
+    # cache never serves a stale row; it only has to hold about one copy of the catalogue.
+    'pet_rows': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'adoptify-pet-rows',
+        'OPTIONS': {'MAX_ENTRIES': int(os.getenv('PET_ROW_CACHE_SIZE', '20000'))},
+    },
+}
+
+# How long (in seconds) a cached /api/pets/ page is kept; writes invalidate it earlier (see api/cache.py)
+PET_LIST_CACHE_TIMEOUT = int(os.getenv('PET_LIST_CACHE_TIMEOUT', '300'))
+
+# The cache holding serialized pet rows: 'pet_rows' (per process), 'default' to share it through Redis,
+# or '' to serialize every row on every page build
+PET_ROW_CACHE_ALIAS = os.getenv('PET_ROW_CACHE_ALIAS', 'pet_rows')
+PET_ROW_CACHE_TIMEOUT = int(os.getenv('PET_ROW_CACHE_TIMEOUT', '86400'))
+
+# How often (in seconds) each process rebuilds its pet search index to pick up other workers' writes
+SEARCH_INDEX_REFRESH_SECONDS = int(os.getenv('SEARCH_INDEX_REFRESH_SECONDS', '300'))
+
+# How often (in seconds) each process rebuilds its shelter location index (see api/geo.py)
+GEO_INDEX_REFRESH_SECONDS = int(os.getenv('GEO_INDEX_REFRESH_SECONDS', '300'))
+
+# Local CSV (key,latitude,longitude) used to geocode shelter addresses; defaults to api/data/geocodes.csv
+GEOCODE_TABLE = os.getenv('GEOCODE_TABLE', '')
+
+# Number of rows validated and inserted (or exported) per batch by /api/pets/bulk/
+BULK_CHUNK_SIZE = int(os.getenv('BULK_CHUNK_SIZE', '500'))
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -158,13 +225,62 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')  # Directory to store media files
 
+# How /media/ is delivered (see api/media.py): "django" streams files from Python; "x-accel-redirect" (nginx)
+# or "x-sendfile" (Apache/lighttpd) let the front web server send them; "off" leaves /media/ to it entirely
+MEDIA_SERVING = os.getenv('MEDIA_SERVING', 'django')
+MEDIA_ACCEL_REDIRECT_PREFIX = os.getenv('MEDIA_ACCEL_REDIRECT_PREFIX', '/protected-media/')  # nginx internal location
+MEDIA_CACHE_SECONDS = int(os.getenv('MEDIA_CACHE_SECONDS', '3600'))  # For files without a content-hash name
+
+# Number of background threads resizing uploaded pet images (see api/images.py)
+IMAGE_PROCESSING_WORKERS = int(os.getenv('IMAGE_PROCESSING_WORKERS', '2'))
+
+# How long the response of a write sent with an Idempotency-Key is kept for replay (see api/idempotency.py)
+IDEMPOTENCY_KEY_TTL = int(os.getenv('IDEMPOTENCY_KEY_TTL', str(24 * 60 * 60)))
+
+# Brotli quality (0-11) for compressed responses: 5 compresses a page of pets within 10% of 11, about 100 times faster
+BROTLI_QUALITY = int(os.getenv('BROTLI_QUALITY', '5'))
+
+# Bearer token Prometheus must send to read /metrics; without one, /metrics is only served when DEBUG is on
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+
+# Logging
+# https://docs.djangoproject.com/en/5.1/topics/logging/
+# The "api" loggers (including one line per request from api.requests) are written as JSON lines.
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'json': {
+            '()': 'api.metrics.JsonFormatter',
+        },
+    },
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+            'formatter': 'json',
+        },
+    },
+    'loggers': {
+        'api': {
+            'handlers': ['console'],
+            'level': os.getenv('API_LOG_LEVEL', 'INFO'),
+            'propagate': False,
+        },
+    },
+}
+
+# DRF's HTML browsable API (templates, forms and a second rendering pass per request) is a development
+# tool: it is only enabled with DEBUG unless BROWSABLE_API says otherwise
+BROWSABLE_API = os.getenv('BROWSABLE_API', str(DEBUG)).lower() in ('1', 'true', 'yes')
+
 REST_FRAMEWORK = {
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
-        'rest_framework.renderers.BrowsableAPIRenderer',  # Ensure this is included
+        'api.renderers.InstrumentedJSONRenderer',  # JSONRenderer that reports its time to /metrics
+        *(['rest_framework.renderers.BrowsableAPIRenderer'] if BROWSABLE_API else []),
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.CachedJWTAuthentication',  # JWTAuthentication with a cached user lookup
     ),
 }
 
@@ -174,4 +290,11 @@ SIMPLE_JWT = {
     'ROTATE_REFRESH_TOKENS': True,
     'BLACKLIST_AFTER_ROTATION': True,
     'AUTH_HEADER_TYPES': ('Bearer',),
+    'TOKEN_OBTAIN_SERIALIZER': 'api.serializers.TokenObtainPairWithClaimsSerializer',  # Adds the is_staff claim
 }
+
+# Authenticated users are resolved from a short-lived in-process cache (see api/authentication.py).
+# Set AUTH_USER_CACHE_ALIAS to a shared cache (e.g. 'default' on Redis) to share entries between workers.
+AUTH_USER_CACHE_TTL = int(os.getenv('AUTH_USER_CACHE_TTL', '60'))
+AUTH_USER_CACHE_SIZE = int(os.getenv('AUTH_USER_CACHE_SIZE', '1024'))
+AUTH_USER_CACHE_ALIAS = os.getenv('AUTH_USER_CACHE_ALIAS', '')
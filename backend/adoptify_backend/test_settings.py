@@ -0,0 +1,60 @@
+"""
+Django settings for running the test suite (pytest, see pytest.ini, and `python manage.py test`).
+
+They extend adoptify_backend/settings.py with what makes tests fast and independent of local services:
+- An in-memory SQLite database (plus a "replica" mirror of it for the routing tests).
+- A fast password hasher (MD5): the default PBKDF2 makes every create_user and login take ~0.3s.
+- No migrations for the api app: its tables are created straight from the models. Set
+  TEST_MIGRATIONS=1 to run the real migrations instead (e.g. when a change touches them).
+- A per-process cache and MEDIA_ROOT, so pytest-xdist workers (pytest -n auto) share nothing;
+  each worker is its own process with its own in-memory database.
+"""
+
+import atexit
+import os
+import shutil
+import tempfile
+
+from .settings import *  # noqa: F401,F403
+
+SECRET_KEY = os.getenv('SECRET_KEY') or 'test-secret-key-not-for-production-use'
+DEBUG = False
+
+# ----------------------------------- Database -------------------------------------------
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': ':memory:',
+    },
+    # A mirror of the test database; routing tests enable it with DATABASE_REPLICAS=['replica']
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': ':memory:',
+        'TEST': {'MIRROR': 'default'},
+    },
+}
+DATABASE_REPLICAS = []
+
+if os.getenv('TEST_MIGRATIONS', '').lower() not in ('1', 'true', 'yes'):
+    MIGRATION_MODULES = {'api': None}  # Create the api tables from the models (syncdb), skipping its migrations
+
+# ----------------------------------- Speed -------------------------------------------
+PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']  # Never use outside tests
+
+# ------------------------------ Per-worker isolation -------------------------------------
+# A developer's CACHE_BACKEND (e.g. a shared Redis) must not leak entries between test processes
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'adoptify-test',
+    },
+    'pet_rows': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'adoptify-test-pet-rows',
+    },
+}
+AUTH_USER_CACHE_ALIAS = ''  # The in-process user cache (see api/authentication.py)
+
+# Uploaded files go to a throwaway directory per process (PYTEST_XDIST_WORKER is gw0, gw1, ...)
+MEDIA_ROOT = tempfile.mkdtemp(prefix=f"adoptify-media-{os.getenv('PYTEST_XDIST_WORKER', 'main')}-")
+atexit.register(shutil.rmtree, MEDIA_ROOT, ignore_errors=True)
@@ -12,24 +12,31 @@ to the appropriate views. It includes endpoints for:
 - Favourite pets functionality
 - Donation management
 
-Additionally, it serves media files during development when `DEBUG` is enabled.
+Additionally, it serves uploaded media files (or hands them to the front web server) according to
+`MEDIA_SERVING`.
 """
 
+import re
+
 from django.contrib import admin
-from django.urls import path
-from api import views
+from django.urls import path, re_path
+from api import views, async_views
 from api.views import CreateUserView, CreateAdminUserView, UpdateApplicationStatusView, UserDetailsView, AddFavouriteView
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from django.urls import include
 from django.conf import settings
-from django.conf.urls.static import static
+
+# Public read paths, served by the async views under ASGI (see api/async_views.py)
+catalogue = async_views if settings.ASYNC_VIEWS else views
 
 urlpatterns = [
     # ----------------------------------- Admin Panel -------------------------------------------
     path('admin/', admin.site.urls),  # Django admin panel
 
     # ----------------------------------- Health Check -------------------------------------------
-    path('', views.health_check, name='health_check'),  # Health check at root ("/")
+    path('', catalogue.health_check, name='health_check'),  # Health check at root ("/")
+    path('ready', catalogue.readiness_check, name='readiness_check'),  # Readiness probe (database reachable)
+    path('metrics', views.metrics_view, name='metrics'),  # Prometheus metrics (see api/metrics.py)
 
     # ----------------------------------- API Endpoints -------------------------------------------
     path("api/", include("api.urls")),  # Include API-specific URLs
@@ -49,12 +56,14 @@ urlpatterns = [
     path("api/user/register/", CreateUserView.as_view(), name="register"),  # User registration endpoint
     path("api/user/register/admin/", CreateAdminUserView.as_view(), name="register_admin"),  # Admin registration endpoint
     path("api/user/details/", UserDetailsView.as_view(), name="user_details"),  # User details endpoint
+    path("api/me/", views.MyProfileView.as_view(), name="my_profile"),  # Details, favourites, applications and donations in one call
 
     # ------------------------------------- Application Management -------------------------------------------
     path("api/adoption-application/", views.CreateAdoptionApplication.as_view(), name="adoption_application"),  # Create adoption application
     path("api/adoption-application/<int:pk>/", views.AdoptionView.as_view(), name="adoption_application_detail"),  # Adoption application detail view
     path("api/adoption-application/list/", views.AdoptionApplicationListView.as_view(), name="adoption_applications"),  # Adoption applications list view
     path("api/adoption-application/<int:pk>/update-status/", UpdateApplicationStatusView.as_view(), name="update_application_status"),  # Update application status endpoint
+    path("api/adoption-application/bulk-review/", views.BulkReviewApplicationsView.as_view(), name="bulk_review_applications"),  # Review many applications in one transaction
 
     # ------------------------------------- Shelter Management -------------------------------------------
     # Create a new shelter
@@ -70,7 +79,10 @@ urlpatterns = [
     path("api/admin/shelter-management/<int:pk>/", views.UpdateShelterManagementView.as_view(), name="update_shelter_management"),  # Shelter management update endpoint
 
     # Shelter list endpoint
-    path("api/admin/shelters/", views.ShelterListView.as_view(), name="shelter_list"),  # List all shelters
+    path("api/admin/shelters/", catalogue.ShelterListView.as_view(), name="shelter_list"),  # List all shelters
+
+    # Shelter dashboard stats
+    path("api/admin/shelters/stats/", views.ShelterStatsView.as_view(), name="shelter_stats"),  # Per-shelter dashboard counters
 
     # Update shelter
     path("api/admin/shelter/<int:pk>/", views.UpdateShelterView.as_view(), name="update_shelter"),  # Update shelter details
@@ -80,10 +92,17 @@ urlpatterns = [
     path("api/register-pet/", views.CreatePetView.as_view(), name="register_pet"),  # Pet registration endpoint
 
     # List all pets
-    path("api/pets/", views.PetListView.as_view(), name="pet_list"),  # Pet list endpoint
+    path("api/pets/", catalogue.PetListView.as_view(), name="pet_list"),  # Pet list endpoint
+
+    # Search pets
+    path("api/pets/search/", views.PetSearchView.as_view(), name="pet_search"),  # Pet search endpoint
+    path("api/pets/nearby/", views.NearbyPetsView.as_view(), name="pet_nearby"),  # Available pets near a point, nearest first
+
+    # Bulk import and export pets
+    path("api/pets/bulk/", views.PetBulkView.as_view(), name="pet_bulk"),  # Pet bulk import/export endpoint
 
     # Pet details
-    path("api/pets/<int:pk>/", views.PetDetailView.as_view(), name="pet_detail"),  # Pet detail endpoint
+    path("api/pets/<int:pk>/", catalogue.PetDetailView.as_view(), name="pet_detail"),  # Pet detail endpoint
 
     # -------------------------------------- Favourite a Pet ----------------------------------------
     # Add Favourite 
@@ -99,8 +118,11 @@ urlpatterns = [
     path("api/donate/", views.CreateDonationView.as_view(), name="donate"),  # Donation endpoint
     path("api/donations/<int:pk>/", views.DonationView.as_view(), name="donation_detail"),  # Donation detail endpoint
     path("api/donations/list/", views.DonationListView.as_view(), name="donation_list"),  # List of donations for a user
+    path("api/donations/report/", views.DonationReportView.as_view(), name="donation_report"),  # Donation totals for admins
 ]
 
-# Serve media files during development
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)  # Serve media files in development
+# Serve uploaded media unless the front web server serves MEDIA_ROOT itself (see api/media.py)
+if settings.MEDIA_SERVING != 'off':
+    urlpatterns += [
+        re_path(rf"^{re.escape(settings.MEDIA_URL.lstrip('/'))}(?P<path>.+)$", views.media_view, name="media"),
+    ]
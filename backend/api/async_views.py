@@ -0,0 +1,191 @@
+"""
+This module contains async versions of the public read paths of the Adoptify Pet Finder API.
+
+It includes:
+- AsyncAPIView: A Django async class-based view that authenticates, renders and reports errors the
+  way the DRF views do.
+- PetListView / PetDetailView / ShelterListView: The catalogue endpoints, reading through Django's
+  async ORM (aget, aaggregate, aiterator) so a slow query or media read does not hold a worker thread.
+- health_check / readiness_check: Async health endpoints.
+
+The responses (payloads, cursors, ETags, cache entries, errors) are the same as those of the sync
+views in api/views.py, which stay the default. The URLs switch to these views when ASYNC_VIEWS is
+set (by default when SERVER_MODE is 'asgi'); writes to a pet are still handled by the sync view.
+"""
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.core.exceptions import PermissionDenied
+from django.db import DatabaseError, connection
+from django.http import Http404, JsonResponse
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.exceptions import APIException, AuthenticationFailed, NotAuthenticated
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import exception_handler
+
+from . import views
+from .authentication import CachedJWTAuthentication
+from .cache import apet_list_cache_key, pet_list_cache_timeout
+from .conditional import aqueryset_validators, not_modified, not_modified_response, set_validators
+from .filters import filter_pets
+from .models import Pet, Shelter
+from .pagination import PetCursorPagination
+from .renderers import InstrumentedJSONRenderer
+from .replicas import acatalogue_recently_written, use_primary
+from .serializers import PetSerializer, ShelterSerializer
+
+# -------------------------------------- Base View -------------------------------------------
+
+# Async counterpart of APIView for read-only JSON endpoints
+class AsyncAPIView(View):
+    authentication_class = CachedJWTAuthentication
+    renderer_class = InstrumentedJSONRenderer
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        # Authenticated with JWT like the DRF views, which are exempt from the session CSRF check
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    async def dispatch(self, request, *args, **kwargs):
+        request = Request(request, authenticators=[self.authentication_class()])
+        try:
+            response = await super().dispatch(request, *args, **kwargs)
+        except (APIException, Http404, PermissionDenied) as exc:
+            response = self.handle_exception(request, exc)
+        return self.render(response)
+
+    async def perform_authentication(self, request):
+        """
+        Authenticate the request, like APIView.perform_authentication: an invalid or expired token is
+        refused even where anonymous users are allowed (the user lookup may query the database, so it
+        runs in a thread).
+        """
+        return await sync_to_async(lambda: request.user)()
+
+    async def authenticate(self, request):
+        """Require an authenticated user."""
+        user = await self.perform_authentication(request)
+        if not user.is_authenticated:
+            raise NotAuthenticated()
+        return user
+
+    def handle_exception(self, request, exc):
+        # Same status codes, error bodies and WWW-Authenticate header as DRF's exception handling
+        if isinstance(exc, (NotAuthenticated, AuthenticationFailed)):
+            exc.auth_header = self.authentication_class().authenticate_header(request)
+        return exception_handler(exc, {'request': request, 'view': self})
+
+    def render(self, response):
+        if not isinstance(response, Response) or response.is_rendered:
+            return response  # Plain Django responses
+        if getattr(response, 'accepted_renderer', None) is None:  # Delegated DRF views negotiate their own
+            response.accepted_renderer = self.renderer_class()
+            response.accepted_media_type = response.accepted_renderer.media_type
+            response.renderer_context = {'view': self, 'response': response}
+        return response.render()
+
+# -------------------------------------- Health Check -------------------------------------------
+
+# Basic Health Check Endpoint
+async def health_check(request):
+    return JsonResponse({"status": "OK", "message": "Backend is working"})
+
+# Readiness Check (the database answers queries); used by the container health check
+async def readiness_check(request):
+    try:
+        await sync_to_async(_select_one)()
+    except DatabaseError:
+        return JsonResponse({"status": "unavailable", "message": "Database is not reachable"}, status=503)
+    return JsonResponse({"status": "OK", "message": "Backend is ready"})
+
+def _select_one():
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1")
+
+# -------------------------------------- Pet Catalogue -------------------------------------------
+
+# List Pets (async version of views.PetListView)
+class PetListView(AsyncAPIView):
+    pagination_class = PetCursorPagination
+
+    async def get(self, request, shelter_id=None):
+        await self.perform_authentication(request)  # Anonymous users are allowed, but not a bad token
+        PetSerializer.requested_fields(request)  # Reject an invalid ?fields= before anything is cached
+        # Serve the page from the cache if this exact listing has been built since the last write
+        cache_key = await apet_list_cache_key(request, views.PetListView.get_cache_shelter_id(request, shelter_id))
+        cached = await cache.aget(cache_key)
+        if cached is None:
+            if await acatalogue_recently_written():
+                use_primary()  # The page is shared by everyone, so do not build it from a lagging replica
+            pets = await self.get_queryset(request, shelter_id)
+            validators = await aqueryset_validators(pets, views.PET_VALIDATOR_FIELDS, key=request.get_full_path())
+            if not_modified(request, *validators):
+                return not_modified_response(*validators, private=False)
+            cached = {'data': await self.build_page(request, pets), 'validators': tuple(validators)}
+            await cache.aset(cache_key, cached, pet_list_cache_timeout())
+
+        if not_modified(request, *cached['validators']):
+            return not_modified_response(*cached['validators'], private=False)
+        return set_validators(Response(cached['data']), *cached['validators'], private=False)
+
+    async def get_queryset(self, request, shelter_id):
+        if shelter_id:
+            if not await Shelter.objects.filter(pk=shelter_id).aexists():
+                raise Http404("No Shelter matches the given query.")
+            pets = Pet.objects.filter(shelter_id=shelter_id)
+        else:
+            pets = Pet.objects.all()
+        return filter_pets(pets, request.query_params)
+
+    async def build_page(self, request, pets):
+        paginator = self.pagination_class()
+        page = await paginator.apaginate_queryset(PetSerializer.setup_eager_loading(pets), request, view=self)
+        # The serialized rows are read and written with the sync cache API (a network round trip when
+        # PET_ROW_CACHE_ALIAS shares them through Redis), so serialize off the event loop
+        fields = PetSerializer.requested_fields(request)
+        data = await sync_to_async(lambda: PetSerializer(page, many=True, fields=fields).data, thread_sensitive=False)()
+        return paginator.get_paginated_response(data).data
+
+# Pet Details (async GET; updates and deletes are handled by the sync view)
+class PetDetailView(AsyncAPIView):
+    sync_view = staticmethod(sync_to_async(views.PetDetailView.as_view()))
+
+    async def get(self, request, pk):
+        await self.authenticate(request)
+        fields = PetSerializer.requested_fields(request)  # Optional ?fields= sparse fieldset
+        validators = await aqueryset_validators(Pet.objects.filter(pk=pk), views.PET_VALIDATOR_FIELDS)
+        if not_modified(request, *validators):
+            return not_modified_response(*validators)
+
+        try:
+            pet = await PetSerializer.setup_eager_loading(Pet.objects.all()).aget(pk=pk)
+        except Pet.DoesNotExist:
+            raise Http404("No Pet matches the given query.")
+        # One pet without the row cache: no I/O (variant URLs are built from Pet.variants_image)
+        return set_validators(Response(PetSerializer(pet, fields=fields).data), *validators)
+
+    async def put(self, request, pk):
+        return await self.sync_view(request._request, pk=pk)
+
+    async def patch(self, request, pk):
+        return await self.sync_view(request._request, pk=pk)
+
+    async def delete(self, request, pk):
+        return await self.sync_view(request._request, pk=pk)
+
+# -------------------------------------- Shelters -------------------------------------------
+
+# List All Shelters (async version of views.ShelterListView)
+class ShelterListView(AsyncAPIView):
+    async def get(self, request):
+        await self.authenticate(request)
+        fields = ShelterSerializer.requested_fields(request)  # Optional ?fields= sparse fieldset
+        shelters = Shelter.objects.all()
+        validators = await aqueryset_validators(shelters)
+        if not_modified(request, *validators):
+            return not_modified_response(*validators)
+
+        data = [ShelterSerializer(shelter, fields=fields).data async for shelter in shelters.aiterator()]
+        return set_validators(Response(data), *validators)
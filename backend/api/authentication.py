@@ -0,0 +1,140 @@
+"""
+This module contains the authentication classes of the Adoptify Pet Finder API.
+
+It includes:
+- UserCache: A bounded, short-TTL, in-process LRU of user rows, with an optional shared cache tier.
+- CachedJWTAuthentication: simplejwt's JWTAuthentication, resolving the user through UserCache
+  instead of querying the User table on every request.
+
+Cached users are dropped when a User is saved or deleted (see api/signals.py), which also covers
+deactivation. Other processes only see the change once their local entry expires, so the local
+TTL is kept short (AUTH_USER_CACHE_TTL). Passwords are never cached; the password field is loaded
+lazily if a view needs it.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.exceptions import ValidationError
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+STAFF_CLAIM = 'is_staff'  # Added to issued tokens (see TokenObtainPairWithClaimsSerializer)
+
+# User columns kept in the cache (everything but the password hash)
+CACHED_FIELDS = tuple(field.attname for field in User._meta.concrete_fields if field.attname != 'password')
+
+# --------------------------------------- User Cache -------------------------------------------
+
+class UserCache:
+    """
+    Caches user rows by primary key.
+
+    Entries live in a per-process LRU (bounded by AUTH_USER_CACHE_SIZE, expiring after
+    AUTH_USER_CACHE_TTL seconds). If AUTH_USER_CACHE_ALIAS names a Django cache, it is used as a
+    second tier shared by every worker.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # user id -> (expiry, field values)
+
+    @staticmethod
+    def ttl():
+        return getattr(settings, 'AUTH_USER_CACHE_TTL', 60)
+
+    @staticmethod
+    def max_size():
+        return getattr(settings, 'AUTH_USER_CACHE_SIZE', 1024)
+
+    @staticmethod
+    def shared_cache():
+        alias = getattr(settings, 'AUTH_USER_CACHE_ALIAS', '')
+        return caches[alias] if alias else None
+
+    @staticmethod
+    def shared_key(user_id):
+        return f'auth-user:{user_id}'
+
+    def get(self, user_id):
+        """Return a User built from the cache, loading and caching the row on a miss (None if it does not exist)."""
+        values = self._get_local(user_id)
+        if values is None:
+            shared = self.shared_cache()
+            values = shared.get(self.shared_key(user_id)) if shared else None
+            if values is None:
+                values = User.objects.filter(pk=user_id).values_list(*CACHED_FIELDS).first()
+                if values is None:
+                    return None
+                if shared:
+                    shared.set(self.shared_key(user_id), values, self.ttl())
+            self._set_local(user_id, values)
+        # A fresh instance per request, so views can modify request.user safely
+        return User.from_db('default', CACHED_FIELDS, values)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+        shared = self.shared_cache()
+        if shared:
+            shared.delete(self.shared_key(user_id))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _get_local(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return entry[1]
+
+    def _set_local(self, user_id, values):
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + self.ttl(), values)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_size():
+                self._entries.popitem(last=False)  # Evict the least recently used user
+
+user_cache = UserCache()
+
+# --------------------------------------- Authentication -------------------------------------------
+
+# JWT authentication without a User query on cache hits
+class CachedJWTAuthentication(JWTAuthentication):
+    def get_user(self, validated_token):
+        if api_settings.CHECK_REVOKE_TOKEN:
+            return super().get_user(validated_token)  # Needs the password hash, which is not cached
+
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+        try:
+            user = user_cache.get(User._meta.pk.to_python(user_id))
+        except ValidationError as e:  # Malformed id in a validly signed token
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+        if user is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        # Tokens issued before the user's staff status changed must not keep the old privileges
+        if STAFF_CLAIM in validated_token and validated_token[STAFF_CLAIM] != user.is_staff:
+            raise AuthenticationFailed(_("The user's permissions have changed."), code="permissions_changed")
+
+        return user
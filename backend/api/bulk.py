@@ -0,0 +1,213 @@
+"""
+This module implements the bulk pet import and export used by /api/pets/bulk/.
+
+It includes:
+- read_rows: Streams rows out of a CSV or NDJSON request body one line at a time.
+- import_pets: Validates rows in chunks with PetSerializer and inserts them with bulk_create.
+- export_pets: Streams a Pet queryset as CSV or NDJSON without loading it all into memory.
+
+Imports run in a single transaction and report the errors of every rejected row (by row number)
+instead of failing the whole file. Shelters are looked up once per chunk rather than once per row.
+"""
+
+import csv
+import json
+
+from django.conf import settings
+from django.db import transaction
+from rest_framework import serializers
+
+from .models import Pet, Shelter
+from .serializers import PetSerializer
+from .stats import record_pets_added
+
+CSV = 'csv'
+NDJSON = 'ndjson'
+FORMATS = (CSV, NDJSON)
+
+CONTENT_TYPES = {
+    CSV: 'text/csv',
+    NDJSON: 'application/x-ndjson',
+}
+
+# Columns written by the export (and accepted by the import, except the read-only ones)
+EXPORT_FIELDS = ['pet_id', 'name', 'age', 'gender', 'domesticated', 'adoption_status', 'pet_type', 'shelter_id', 'shelter_name', 'image']
+READ_ONLY_FIELDS = {'pet_id', 'shelter_name', 'image'}
+
+MAX_REPORTED_ERRORS = 1000  # Stop listing row errors after this many (they are still counted)
+
+def chunk_size():
+    """Return the number of rows validated and inserted per batch."""
+    return getattr(settings, 'BULK_CHUNK_SIZE', 500)
+
+def detect_format(content_type, requested=None):
+    """Return 'csv' or 'ndjson' from an explicit request or the Content-Type header, or None."""
+    if requested:
+        return requested if requested in FORMATS else None
+    content_type = (content_type or '').split(';')[0].strip().lower()
+    if content_type in ('text/csv', 'application/csv'):
+        return CSV
+    if content_type in ('application/x-ndjson', 'application/ndjson', 'application/jsonl', 'application/json-lines'):
+        return NDJSON
+    return None
+
+# --------------------------------------- Import -------------------------------------------
+
+def _decoded_lines(stream):
+    for line in stream:
+        yield line.decode('utf-8-sig') if isinstance(line, bytes) else line
+
+def read_rows(stream, file_format):
+    """
+    Yield (row number, row dict or error message) for each row of a CSV or NDJSON body.
+
+    Rows are numbered from 1 (the CSV header line is not counted).
+    """
+    lines = _decoded_lines(stream)
+    if file_format == CSV:
+        for number, row in enumerate(csv.DictReader(lines), start=1):
+            yield number, row
+        return
+
+    number = 0
+    for line in lines:
+        if not line.strip():
+            continue  # Allow blank lines (e.g. a trailing newline)
+        number += 1
+        try:
+            row = json.loads(line)
+        except ValueError:
+            yield number, "Invalid JSON."
+            continue
+        yield number, row if isinstance(row, dict) else "Each line must be a JSON object."
+
+class ChunkShelterField(serializers.PrimaryKeyRelatedField):
+    """Resolves shelter ids from the shelters preloaded for the current chunk instead of one query per row."""
+
+    def to_internal_value(self, data):
+        shelters = self.context.get('shelters', {})
+        try:
+            return shelters[int(data)]
+        except (KeyError, TypeError, ValueError):
+            self.fail('does_not_exist', pk_value=data)
+
+class PetImportSerializer(PetSerializer):
+    shelter_id = ChunkShelterField(queryset=Shelter.objects.all())
+
+    def validate_shelter_id(self, value):
+        return value  # Already resolved against the preloaded shelters
+
+def _clean(row):
+    """Drop read-only and empty columns and apply the same defaults as CreatePetView."""
+    data = {key: value for key, value in row.items() if key and key not in READ_ONLY_FIELDS and value not in (None, '')}
+    data.setdefault('adoption_status', 'Available')
+    data.setdefault('pet_type', 'Dog')
+    return data
+
+def _validate_chunk(chunk, errors, stats):
+    """Validate a chunk of (row number, row) pairs and return the Pet objects to insert."""
+    shelter_ids = set()
+    for _, row in chunk:
+        if isinstance(row, dict):
+            try:
+                shelter_ids.add(int(row.get('shelter_id')))
+            except (TypeError, ValueError):
+                pass
+    context = {'shelters': Shelter.objects.in_bulk(shelter_ids)}
+
+    pets = []
+    for number, row in chunk:
+        if not isinstance(row, dict):
+            row_errors = {'non_field_errors': [row]}
+        else:
+            serializer = PetImportSerializer(data=_clean(row), context=context)
+            if serializer.is_valid():
+                pets.append(Pet(**serializer.validated_data))
+                continue
+            row_errors = serializer.errors
+
+        stats['failed'] += 1
+        if len(errors) < MAX_REPORTED_ERRORS:
+            errors.append({'row': number, 'errors': row_errors})
+    return pets
+
+def import_pets(rows):
+    """
+    Validate and insert pets in chunks.
+
+    Args:
+        rows (iterable): (row number, row) pairs, as produced by read_rows.
+
+    Returns:
+        dict: The import report with the number of created and failed rows, the per-row errors
+            and the ids of the shelters that received pets.
+    """
+    size = chunk_size()
+    errors = []
+    stats = {'created': 0, 'failed': 0}
+    shelter_ids = set()
+
+    def flush(chunk):
+        pets = _validate_chunk(chunk, errors, stats)
+        Pet.objects.bulk_create(pets, batch_size=size)
+        record_pets_added(pets)  # Dashboard counters, one update per shelter and status
+        stats['created'] += len(pets)
+        shelter_ids.update(pet.shelter_id_id for pet in pets)
+
+    with transaction.atomic():
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= size:
+                flush(chunk)
+                chunk = []
+        if chunk:
+            flush(chunk)
+
+    return {
+        'created': stats['created'],
+        'failed': stats['failed'],
+        'errors': errors,
+        'shelter_ids': shelter_ids,
+    }
+
+# --------------------------------------- Export -------------------------------------------
+
+class Echo:
+    """A file-like object that returns what is written, so csv.writer can produce lines for streaming."""
+
+    def write(self, value):
+        return value
+
+def _iter_pets(queryset):
+    """
+    Yield export rows in pet_id order, one chunk at a time.
+
+    Rows are fetched with keyset batches (pet_id > last seen) on top of .iterator(chunk_size=...), because
+    the MySQL driver buffers a whole result set client-side; each batch is its own bounded query.
+    """
+    size = chunk_size()
+    queryset = queryset.order_by('pet_id').values_list(
+        'pet_id', 'name', 'age', 'gender', 'domesticated', 'adoption_status', 'pet_type', 'shelter_id', 'shelter_id__name', 'image',
+    )
+    last_id = None
+    while True:
+        batch = queryset if last_id is None else queryset.filter(pet_id__gt=last_id)
+        count = 0
+        for row in batch[:size].iterator(chunk_size=size):
+            count += 1
+            last_id = row[0]
+            yield row
+        if count < size:
+            return
+
+def export_pets(queryset, file_format):
+    """Return a generator of CSV or NDJSON lines for a Pet queryset."""
+    if file_format == CSV:
+        writer = csv.writer(Echo())
+        yield writer.writerow(EXPORT_FIELDS)
+        for row in _iter_pets(queryset):
+            yield writer.writerow(row)
+    else:
+        for row in _iter_pets(queryset):
+            yield json.dumps(dict(zip(EXPORT_FIELDS, row))) + '\n'
@@ -0,0 +1,146 @@
+"""
+This module implements the versioned read-through cache for the public pet listings.
+
+It includes:
+- pet_list_cache_key: Builds the cache key for a PetListView request (apet_list_cache_key for the async views).
+- get_pet_list_version: Returns the current listing version for a shelter (or the whole catalogue), with an
+  async variant (aget_pet_list_version).
+- bump_pet_list_version: Invalidates cached listings after a write.
+- pet_row_cache / pet_row_cache_key: The cache of serialized pet rows that pages are assembled from
+  (see CachedPetListSerializer in api/serializers.py).
+
+Cached pages are never deleted. Instead, every key embeds a version counter: the catalogue-wide
+counter for unscoped listings and a per-shelter counter for shelter-scoped listings. Writes bump the
+counter(s) of the affected shelter(s) so that readers immediately move on to fresh keys, and stale
+pages simply expire. This works with any Django cache backend (locmem, Redis or memcached).
+
+Row keys work the same way, with the row itself as the version: a key embeds the pet's updated_at and
+its shelter's (the shelter name is part of a serialized pet), so saving either moves the row to a new
+key. A page rebuilt after a write therefore only serializes the rows that changed.
+"""
+
+import hashlib
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache, caches
+
+from .replicas import mark_catalogue_written
+
+# --------------------------------------- Cache Keys -------------------------------------------
+
+CATALOGUE_VERSION_KEY = 'pets:version:all'
+SHELTER_VERSION_KEY = 'pets:version:shelter:{shelter_id}'
+PET_LIST_KEY = 'pets:list:{scope}:v{version}:{digest}'
+
+def _version_key(shelter_id=None):
+    """Return the cache key holding the version counter for a shelter or the whole catalogue."""
+    if shelter_id is None:
+        return CATALOGUE_VERSION_KEY
+    return SHELTER_VERSION_KEY.format(shelter_id=shelter_id)
+
+def get_pet_list_version(shelter_id=None):
+    """Return the current listing version for a shelter, or for the whole catalogue if shelter_id is None."""
+    key = _version_key(shelter_id)
+    version = cache.get(key)
+    if version is None:
+        # First reader initialises the counter; add() keeps a concurrent bump from being overwritten
+        cache.add(key, 1, timeout=None)
+        version = cache.get(key, 1)
+    return version
+
+async def aget_pet_list_version(shelter_id=None):
+    """Same as get_pet_list_version, with the async cache API (no blocking cache I/O on the event loop)."""
+    key = _version_key(shelter_id)
+    version = await cache.aget(key)
+    if version is None:
+        await cache.aadd(key, 1, timeout=None)
+        version = await cache.aget(key, 1)
+    return version
+
+def _pet_list_key(request, shelter_id, version):
+    params = sorted((name, value) for name in request.query_params for value in request.query_params.getlist(name))
+    raw = f"{request.get_host()}?{urlencode(params)}"
+    digest = hashlib.md5(raw.encode('utf-8')).hexdigest()
+    scope = 'all' if shelter_id is None else f'shelter{shelter_id}'
+    return PET_LIST_KEY.format(scope=scope, version=version, digest=digest)
+
+def pet_list_cache_key(request, shelter_id=None):
+    """
+    Build the cache key for a pet listing request.
+
+    Args:
+        request (Request): The listing request; its query parameters (filters, cursor, page size)
+            and host (used in the next/previous links) are part of the key.
+        shelter_id (int, optional): The shelter the listing is scoped to.
+
+    Returns:
+        str: The cache key.
+    """
+    return _pet_list_key(request, shelter_id, get_pet_list_version(shelter_id))
+
+async def apet_list_cache_key(request, shelter_id=None):
+    """Same as pet_list_cache_key, reading the version counter with the async cache API."""
+    return _pet_list_key(request, shelter_id, await aget_pet_list_version(shelter_id))
+
+# --------------------------------------- Invalidation -------------------------------------------
+
+def _incr(key):
+    """Increment a version counter, creating it if it has been evicted."""
+    try:
+        cache.incr(key)
+    except ValueError:
+        # The counter was evicted (or never read); start above the implicit initial version
+        if not cache.add(key, 2, timeout=None):
+            cache.incr(key)
+
+def bump_pet_list_version(*shelter_ids):
+    """
+    Invalidate the cached listings affected by a write.
+
+    Args:
+        *shelter_ids (int): The shelter(s) whose pets changed. The catalogue-wide version is always bumped.
+    """
+    for shelter_id in {shelter_id for shelter_id in shelter_ids if shelter_id is not None}:
+        _incr(_version_key(shelter_id))
+    _incr(CATALOGUE_VERSION_KEY)
+    mark_catalogue_written()  # Rebuild the fresh pages from the primary while the replicas catch up
+
+def pet_list_cache_timeout():
+    """Return how long (in seconds) a cached listing page is kept."""
+    return getattr(settings, 'PET_LIST_CACHE_TIMEOUT', 300)
+
+# --------------------------------------- Row Cache -------------------------------------------
+
+PET_ROW_FORMAT = 1  # Bump when PetSerializer's output changes, so shared caches drop the old rows
+PET_ROW_KEY = 'pets:row:f{format}:{pet_id}:{updated}:{shelter_updated}'
+
+def pet_row_cache():
+    """Return the cache holding serialized pet rows, or None if PET_ROW_CACHE_ALIAS disables it."""
+    alias = getattr(settings, 'PET_ROW_CACHE_ALIAS', 'pet_rows')
+    return caches[alias] if alias else None
+
+def _stamp(instance):
+    # updated_at in microseconds; a deferred field is missing from __dict__ (reading it would cost a query)
+    updated_at = instance.__dict__.get('updated_at')
+    return None if updated_at is None else round(updated_at.timestamp() * 1_000_000)
+
+def pet_row_cache_key(pet):
+    """
+    Build the cache key of a serialized pet.
+
+    Returns:
+        str: The key, or None when the pet cannot be cached (unsaved, or loaded without its shelter or
+            either updated_at).
+    """
+    shelter = pet._meta.get_field('shelter_id').get_cached_value(pet, None)  # Loaded with select_related
+    if pet.pk is None or shelter is None:
+        return None
+    updated, shelter_updated = _stamp(pet), _stamp(shelter)
+    if updated is None or shelter_updated is None:
+        return None
+    return PET_ROW_KEY.format(format=PET_ROW_FORMAT, pet_id=pet.pk, updated=updated, shelter_updated=shelter_updated)
+
+def pet_row_cache_timeout():
+    """Return how long (in seconds) a serialized pet row is kept."""
+    return getattr(settings, 'PET_ROW_CACHE_TIMEOUT', 86400)
@@ -0,0 +1,113 @@
+"""
+This module contains helpers for conditional GET requests (ETag / Last-Modified).
+
+It includes:
+- payload_etag: Returns a strong ETag for a response payload.
+- queryset_validators: Computes an ETag and Last-Modified for a queryset from its row count and
+  MAX(updated_at), in one aggregate query and without loading any rows (aqueryset_validators for async views).
+- not_modified: Checks a request's If-None-Match (or If-Modified-Since) header against the validators.
+- not_modified_response / set_validators: Build the 304 response or add the headers to a full one.
+- conditional_response: Returns a 304 or the full response for an already built payload.
+
+Clients that send back the ETag of their last response receive an empty 304 when nothing changed.
+With queryset_validators this is decided before anything is fetched or serialized.
+"""
+
+import hashlib
+import json
+from collections import namedtuple
+from datetime import datetime
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.cache import patch_vary_headers
+from django.db.models import Count, Max
+from django.utils.http import http_date, parse_etags, parse_http_date_safe, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+Validators = namedtuple('Validators', ['etag', 'last_modified'])
+
+def _etag(text):
+    return quote_etag(hashlib.md5(text.encode(), usedforsecurity=False).hexdigest())
+
+def payload_etag(data):
+    """Return a quoted ETag for JSON-serializable data (stable across key order)."""
+    return _etag(json.dumps(data, cls=DjangoJSONEncoder, sort_keys=True, separators=(',', ':')))
+
+def queryset_validators(queryset, latest=('updated_at',), key=''):
+    """
+    Compute the validators of a response built from a queryset.
+
+    Args:
+        queryset (QuerySet): The rows the response is built from (filtered, but not sliced).
+        latest (tuple): Fields whose MAX changes whenever the payload does: updated_at, related
+            ones (e.g. 'shelter_id__updated_at' when the shelter name is serialized) or an
+            auto-increment id for models without timestamps.
+        key (str): Anything else the payload depends on (e.g. the query string or the user).
+
+    Returns:
+        Validators: The ETag and the Last-Modified datetime (None for an empty queryset).
+    """
+    return _validators(queryset, queryset.order_by().aggregate(**_aggregates(latest)), latest, key)
+
+async def aqueryset_validators(queryset, latest=('updated_at',), key=''):
+    """Async version of queryset_validators."""
+    return _validators(queryset, await queryset.order_by().aaggregate(**_aggregates(latest)), latest, key)
+
+def _aggregates(latest):
+    aggregates = {'count': Count('pk')}
+    aggregates.update((f'latest_{index}', Max(field)) for index, field in enumerate(latest))
+    return aggregates
+
+def _validators(queryset, row, latest, key):
+    values = [row[f'latest_{index}'] for index in range(len(latest))]
+    parts = [queryset.model._meta.label, key, str(row['count'])] + [str(value) for value in values]
+    timestamps = [value for value in values if isinstance(value, datetime)]
+    return Validators(_etag('|'.join(parts)), max(timestamps, default=None))
+
+def not_modified(request, etag, last_modified=None):
+    """
+    Return True if the client's copy is still current.
+
+    If-None-Match is checked first; If-Modified-Since is only used when no ETag was sent.
+    """
+    header = request.headers.get('If-None-Match')
+    if header:
+        etags = parse_etags(header)
+        return '*' in etags or etag in etags or etag in (tag.removeprefix('W/') for tag in etags)
+
+    since = parse_http_date_safe(request.headers.get('If-Modified-Since', ''))
+    return bool(since and last_modified and int(last_modified.timestamp()) <= since)
+
+def set_validators(response, etag, last_modified=None, private=True):
+    """Add the ETag, Last-Modified and revalidation headers to a response."""
+    response['ETag'] = etag
+    if last_modified:
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+    # Let clients keep the payload but revalidate it on every use
+    response['Cache-Control'] = 'private, no-cache' if private else 'no-cache'
+    if private:
+        patch_vary_headers(response, ['Authorization'])
+    return response
+
+def not_modified_response(etag, last_modified=None, private=True):
+    """Return an empty 304 response with the validators set."""
+    return set_validators(Response(status=status.HTTP_304_NOT_MODIFIED), etag, last_modified, private)
+
+def conditional_response(request, data, etag=None, private=True):
+    """
+    Return a 304 if the client already has this payload, otherwise a 200 with the payload.
+
+    Args:
+        request (Request): The current request.
+        data: The response payload.
+        etag (str, optional): A precomputed ETag; computed from the payload if omitted.
+        private (bool): Whether the response depends on the authenticated user.
+
+    Returns:
+        Response: The response, with ETag and Cache-Control headers set.
+    """
+    etag = etag or payload_etag(data)
+    if not_modified(request, etag):
+        return not_modified_response(etag, private=private)
+    return set_validators(Response(data), etag, private=private)
@@ -0,0 +1,111 @@
+"""
+This module defines the server-side query filters for the Adoptify Pet Finder API.
+
+It includes:
+- filter_pets: Applies the pet catalogue filters (type, status, gender, domestication, age range and shelter)
+  from the request query parameters to a Pet queryset.
+
+Every filter is validated before it reaches the database so that bad input returns a 400 instead of a
+full table scan. The filter combinations used by the frontend are backed by the composite indexes
+declared in `Pet.Meta.indexes`.
+"""
+
+from rest_framework.exceptions import ValidationError
+
+from .models import Pet
+
+# --------------------------------------- Helpers -------------------------------------------
+
+TRUE_VALUES = {'true', '1', 'yes'}
+FALSE_VALUES = {'false', '0', 'no'}
+
+def _parse_choice(params, name, choices, errors):
+    """Return the query parameter value if it is one of the allowed choices."""
+    value = params.get(name)
+    if value in (None, ''):
+        return None
+    if value not in dict(choices):
+        errors[name] = f"Invalid value '{value}'."
+        return None
+    return value
+
+def _parse_int(params, name, errors):
+    """Return the query parameter as a non-negative integer."""
+    value = params.get(name)
+    if value in (None, ''):
+        return None
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        errors[name] = "Must be an integer."
+        return None
+    if number < 0:
+        errors[name] = "Must be zero or greater."
+        return None
+    return number
+
+def _parse_bool(params, name, errors):
+    """Return the query parameter as a boolean."""
+    value = params.get(name)
+    if value in (None, ''):
+        return None
+    value = value.lower()
+    if value in TRUE_VALUES:
+        return True
+    if value in FALSE_VALUES:
+        return False
+    errors[name] = "Must be true or false."
+    return None
+
+# --------------------------------------- Pet Filters -------------------------------------------
+
+def filter_pets(queryset, params):
+    """
+    Filter a Pet queryset using the catalogue query parameters.
+
+    Args:
+        queryset (QuerySet): The Pet queryset to filter.
+        params (QueryDict): The request query parameters.
+
+    Supported parameters:
+        pet_type, adoption_status, gender, domesticated, min_age, max_age, shelter_id
+
+    Returns:
+        QuerySet: The filtered queryset.
+
+    Raises:
+        ValidationError: If any parameter has an invalid value.
+    """
+    errors = {}
+
+    pet_type = _parse_choice(params, 'pet_type', Pet.PET_CHOICES, errors)
+    adoption_status = _parse_choice(params, 'adoption_status', Pet.ADOPTION_STATUS_CHOICES, errors)
+    gender = _parse_choice(params, 'gender', Pet.GENDER_CHOICES, errors)
+    domesticated = _parse_bool(params, 'domesticated', errors)
+    min_age = _parse_int(params, 'min_age', errors)
+    max_age = _parse_int(params, 'max_age', errors)
+    shelter_id = _parse_int(params, 'shelter_id', errors)
+
+    if min_age is not None and max_age is not None and min_age > max_age:
+        errors['min_age'] = "min_age cannot be greater than max_age."
+
+    if errors:
+        raise ValidationError(errors)
+
+    filters = {}
+    if pet_type is not None:
+        filters['pet_type'] = pet_type
+    if adoption_status is not None:
+        filters['adoption_status'] = adoption_status
+    if gender is not None:
+        filters['gender'] = gender
+    if domesticated is not None:
+        filters['domesticated'] = domesticated
+    if min_age is not None:
+        filters['age__gte'] = min_age
+    if max_age is not None:
+        filters['age__lte'] = max_age
+    if shelter_id is not None:
+        filters['shelter_id'] = shelter_id
+
+    return queryset.filter(**filters)
@@ -0,0 +1,261 @@
+"""
+This module implements the offline geocoding and the shelter location index behind /api/pets/nearby/.
+
+It includes:
+- haversine_km: Great-circle distance between two points.
+- geocode: Looks up the coordinates of a free-text address in a local table (GEOCODE_TABLE, by
+  default api/data/geocodes.csv): postal code areas (the first three characters of a Canadian
+  postal code) first, then place names. No network requests are made.
+- ShelterLocationIndex: An in-memory grid over the shelters' coordinates that returns the shelters
+  within a radius, nearest first.
+- shelter_location_index: The process-wide index instance used by the view and the signal handlers.
+
+Like the search index (api/search.py), the location index is built from the database on first use,
+kept up to date by the Shelter post_save/post_delete handlers in api/signals.py, and rebuilt in the
+background once it is older than GEO_INDEX_REFRESH_SECONDS to pick up other workers' writes. Shelter
+changes signalled while a build reads the database are queued and replayed on the new index.
+"""
+
+import csv
+import math
+import re
+import threading
+import time
+from collections import defaultdict
+from functools import lru_cache
+from pathlib import Path
+
+from django.conf import settings
+
+from .search import tokenize
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180  # Length of one degree of latitude
+
+DEFAULT_GEOCODE_TABLE = Path(__file__).resolve().parent / 'data' / 'geocodes.csv'
+POSTAL_CODE_RE = re.compile(r'\b([A-Z]\d[A-Z])\s?\d[A-Z]\d\b')
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Return the great-circle distance between two points, in kilometres."""
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+# --------------------------------------- Geocoding -------------------------------------------
+
+@lru_cache(maxsize=1)
+def _load_table(path):
+    """Return ({postal area: (lat, lon)}, {place name tokens: (lat, lon)}) from the lookup table."""
+    areas, places = {}, {}
+    with open(path, newline='', encoding='utf-8') as table:
+        for row in csv.DictReader(table):
+            location = (float(row['latitude']), float(row['longitude']))
+            key = row['key'].strip()
+            if re.fullmatch(r'[A-Za-z]\d[A-Za-z]', key):
+                areas[key.upper()] = location
+            else:
+                places[tuple(tokenize(key))] = location
+    return areas, places
+
+def geocode(address):
+    """
+    Return the approximate (latitude, longitude) of an address, or None if it cannot be located.
+
+    A postal code is the most precise match; otherwise the longest place name found in the address
+    is used (e.g. "red deer" before "deer").
+    """
+    if not address:
+        return None
+    areas, places = _load_table(str(getattr(settings, 'GEOCODE_TABLE', '') or DEFAULT_GEOCODE_TABLE))
+
+    for area in POSTAL_CODE_RE.findall(address.upper()):
+        if area in areas:
+            return areas[area]
+
+    tokens = tokenize(address)
+    longest = max((len(name) for name in places), default=0)
+    for length in range(min(longest, len(tokens)), 0, -1):
+        # Prefer the last occurrence: the city usually follows the street
+        for start in range(len(tokens) - length, -1, -1):
+            location = places.get(tuple(tokens[start:start + length]))
+            if location:
+                return location
+    return None
+
+# --------------------------------------- Location Index -------------------------------------------
+
+class ShelterLocationIndex:
+    """
+    Grid index of shelter coordinates.
+
+    Shelters are bucketed into CELL_DEGREES x CELL_DEGREES cells. A radius query only visits the cells
+    overlapping the circle's bounding box (or, if fewer, the non-empty cells) and computes exact
+    distances for the shelters in them.
+    """
+
+    CELL_DEGREES = 0.25  # About 28 km of latitude per cell
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._build_lock = threading.Lock()  # Held for the whole first build, so queries wait for it
+        self._built = False
+        self._rebuilding = False
+        self._built_at = 0.0
+        self._pending = None  # Changes made while a build reads the database (None when no build is running)
+        self._clear()
+
+    def _clear(self):
+        self._cells = defaultdict(dict)  # (row, column) -> {shelter_id: (lat, lon)}
+        self._shelter_cells = {}  # shelter_id -> (row, column)
+
+    def _cell(self, lat, lon):
+        columns = round(360 / self.CELL_DEGREES)
+        return math.floor((lat + 90) / self.CELL_DEGREES), math.floor((lon + 180) / self.CELL_DEGREES) % columns
+
+    # ------------------------------ Building ------------------------------
+
+    @staticmethod
+    def _read():
+        """Return the (shelter_id, latitude, longitude) rows of the located shelters."""
+        from .models import Shelter  # Imported here so the module can load before the app registry
+
+        return list(Shelter.objects.filter(latitude__isnull=False, longitude__isnull=False)
+                    .values_list('shelter_id', 'latitude', 'longitude'))
+
+    def _load(self, shelters):
+        self._clear()
+        for shelter_id, lat, lon in shelters:
+            self._add(shelter_id, lat, lon)
+        self._built = True
+        self._built_at = time.monotonic()
+
+    def _replay_pending(self):
+        # The rows may have been read before these changes, so apply them again, in order
+        for change, args in self._pending:
+            change(*args)
+
+    def build(self):
+        """Rebuild the whole index from the database."""
+        with self._lock:
+            self._pending = []  # Start recording changes before reading the database
+        try:
+            shelters = self._read()
+            with self._lock:
+                self._load(shelters)
+                self._replay_pending()
+        finally:
+            with self._lock:
+                self._pending = None
+
+    def ensure_built(self):
+        """Build the index on first use and refresh it in the background once it gets old."""
+        if not self._built:
+            with self._build_lock:
+                if not self._built:
+                    self.build()
+            return
+
+        refresh_seconds = getattr(settings, 'GEO_INDEX_REFRESH_SECONDS', 300)
+        if refresh_seconds and not self._rebuilding and time.monotonic() - self._built_at > refresh_seconds:
+            with self._lock:
+                if self._rebuilding:
+                    return  # Another thread started it
+                self._rebuilding = True
+                self._pending = []  # Start recording changes before the rebuild reads the database
+            threading.Thread(target=self._background_rebuild, daemon=True).start()
+
+    def _background_rebuild(self):
+        try:
+            # Fill a separate instance, so queries keep using the old grid meanwhile
+            fresh = ShelterLocationIndex()
+            fresh._load(self._read())
+            with self._lock:
+                self._cells, self._shelter_cells = fresh._cells, fresh._shelter_cells
+                self._built_at = fresh._built_at
+                self._replay_pending()
+        finally:
+            with self._lock:
+                self._pending = None
+                self._rebuilding = False
+
+    def reset(self):
+        """Drop the index; it is rebuilt from the database on the next query."""
+        with self._lock:
+            self._clear()
+            self._built = False
+
+    # ------------------------------ Incremental updates ------------------------------
+
+    def _add(self, shelter_id, lat, lon):
+        cell = self._cell(lat, lon)
+        self._cells[cell][shelter_id] = (lat, lon)
+        self._shelter_cells[shelter_id] = cell
+
+    def _remove(self, shelter_id):
+        cell = self._shelter_cells.pop(shelter_id, None)
+        if cell is not None:
+            self._cells[cell].pop(shelter_id, None)
+            if not self._cells[cell]:
+                del self._cells[cell]
+
+    def _move(self, shelter_id, lat, lon):
+        self._remove(shelter_id)
+        if lat is not None and lon is not None:
+            self._add(shelter_id, lat, lon)
+
+    def _apply(self, change, *args):
+        """Apply an incremental change, recording it if a build is running."""
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append((change, args))  # Replayed on the index being built
+            if not self._built:
+                return  # Nothing to keep up to date; the first query builds from the database
+            change(*args)
+
+    def update_shelter(self, shelter):
+        """Add, move or drop a shelter (called from the Shelter post_save signal)."""
+        self._apply(self._move, shelter.pk, shelter.latitude, shelter.longitude)
+
+    def remove_shelter(self, shelter_id):
+        """Remove a shelter (called from the Shelter post_delete signal)."""
+        self._apply(self._remove, shelter_id)
+
+    # ------------------------------ Queries ------------------------------
+
+    def _candidate_cells(self, lat, lon, radius_km):
+        lat_span = radius_km / KM_PER_DEGREE
+        cos_lat = math.cos(math.radians(min(90.0, abs(lat) + lat_span)))
+        lon_span = 180.0 if cos_lat < 1e-6 else min(180.0, lat_span / cos_lat)
+
+        south_row, west_column = self._cell(max(-90.0, lat - lat_span), lon - lon_span)
+        north_row, east_column = self._cell(min(90.0, lat + lat_span), lon + lon_span)
+        columns = round(360 / self.CELL_DEGREES)
+        width = columns if lon_span >= 180 else (east_column - west_column) % columns + 1
+        rows = range(south_row, north_row + 1)
+
+        if len(rows) * width > len(self._cells):
+            # A wide radius: checking every non-empty cell is cheaper than walking the bounding box
+            return list(self._cells.values())
+        cells = ((row, (west_column + offset) % columns) for row in rows for offset in range(width))
+        return [self._cells[cell] for cell in cells if cell in self._cells]
+
+    def nearby(self, lat, lon, radius_km):
+        """
+        Return the shelters within radius_km of a point.
+
+        Returns:
+            list: (distance in km, shelter_id) pairs, nearest first (ties by ascending shelter_id).
+        """
+        self.ensure_built()
+        with self._lock:
+            cells = self._candidate_cells(lat, lon, radius_km)
+            found = []
+            for shelters in cells:
+                for shelter_id, (shelter_lat, shelter_lon) in shelters.items():
+                    distance = haversine_km(lat, lon, shelter_lat, shelter_lon)
+                    if distance <= radius_km:
+                        found.append((distance, shelter_id))
+        found.sort()
+        return found
+
+shelter_location_index = ShelterLocationIndex()
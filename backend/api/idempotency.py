@@ -0,0 +1,150 @@
+"""
+This module implements Idempotency-Key support for the write endpoints of the Adoptify Pet Finder API.
+
+It includes:
+- IdempotencyMiddleware: Stores the response of an authenticated POST/PUT/PATCH/DELETE request sent with
+  an "Idempotency-Key" header and replays it when the same user retries with the same key, so a retried
+  donation, application or favourite does not run twice.
+- request_fingerprint: Identifies a request's method, path, query string and body.
+
+Responses are kept in the cache (bounded by IDEMPOTENCY_KEY_TTL and the cache's own eviction; use the
+shared Redis cache when running several workers) under the user id and a hash of the key:
+- A retry with the same key and the same request gets the stored response, marked with an
+  "Idempotent-Replayed: true" header, without running the view again.
+- A retry while the first request is still running gets 409, and reusing a key for a different request
+  (e.g. another amount) gets 422.
+- Server errors (5xx) are not stored, so the client can retry them with the same key.
+
+Requests without the header, anonymous requests and GET/HEAD/OPTIONS requests are not affected.
+"""
+
+import hashlib
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import RequestDataTooBig
+from django.http import HttpResponse, JsonResponse
+
+from .replicas import SAFE_METHODS, token_user_id
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+REPLAYED_HEADER = 'Idempotent-Replayed'
+MAX_KEY_LENGTH = 255
+RESPONSE_KEY = 'idempotency:{user_id}:{key_hash}'
+LOCK_KEY = 'idempotency:{user_id}:{key_hash}:lock'  # Held while the first request with a key runs
+LOCK_SECONDS = 60
+STORED_HEADERS = ('Content-Type', 'Location')
+
+def key_ttl():
+    return getattr(settings, 'IDEMPOTENCY_KEY_TTL', 24 * 60 * 60)
+
+def request_fingerprint(request):
+    """Return a hash of the request's method, path, query string and body."""
+    digest = hashlib.sha256(f"{request.method} {request.get_full_path()}".encode())
+    try:
+        digest.update(request.body)
+    except RequestDataTooBig:
+        # Large uploads are not read into memory just to be compared; their length stands in for the body
+        digest.update(request.META.get('CONTENT_LENGTH', '').encode())
+    return digest.hexdigest()
+
+# Replays the stored response of a retried write
+class IdempotencyMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        keys = self.cache_keys(request)
+        if keys is None:
+            return self.get_response(request)
+        if isinstance(keys, HttpResponse):
+            return keys
+
+        response_key, lock_key = keys
+        fingerprint = request_fingerprint(request)
+        stored = cache.get(response_key)
+        if stored is not None:
+            return self.replay(stored, fingerprint)
+        if not cache.add(lock_key, True, LOCK_SECONDS):
+            return self.in_progress()
+
+        try:
+            response = self.get_response(request)
+            if self.is_storable(response):
+                cache.set(response_key, self.store(response, fingerprint), key_ttl())
+        finally:
+            cache.delete(lock_key)
+        return response
+
+    async def __acall__(self, request):
+        keys = self.cache_keys(request)
+        if keys is None:
+            return await self.get_response(request)
+        if isinstance(keys, HttpResponse):
+            return keys
+
+        response_key, lock_key = keys
+        fingerprint = request_fingerprint(request)
+        stored = await cache.aget(response_key)
+        if stored is not None:
+            return self.replay(stored, fingerprint)
+        if not await cache.aadd(lock_key, True, LOCK_SECONDS):
+            return self.in_progress()
+
+        try:
+            response = await self.get_response(request)
+            if self.is_storable(response):
+                await cache.aset(response_key, self.store(response, fingerprint), key_ttl())
+        finally:
+            await cache.adelete(lock_key)
+        return response
+
+    @staticmethod
+    def cache_keys(request):
+        """Return the (response, lock) cache keys of the request, None to pass it through, or an error response."""
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if not key or request.method in SAFE_METHODS:
+            return None
+        user_id = token_user_id(request)
+        if user_id is None:
+            return None  # Anonymous (or invalid token): authentication rejects or handles it as usual
+        if len(key) > MAX_KEY_LENGTH:
+            return JsonResponse({"error": f"{IDEMPOTENCY_HEADER} must be at most {MAX_KEY_LENGTH} characters."}, status=400)
+
+        key_hash = hashlib.sha256(key.encode()).hexdigest()
+        return RESPONSE_KEY.format(user_id=user_id, key_hash=key_hash), LOCK_KEY.format(user_id=user_id, key_hash=key_hash)
+
+    @staticmethod
+    def is_storable(response):
+        return not response.streaming and response.status_code < 500
+
+    @staticmethod
+    def store(response, fingerprint):
+        return {
+            'fingerprint': fingerprint,
+            'status': response.status_code,
+            'content': response.content,
+            'headers': {header: response[header] for header in STORED_HEADERS if response.has_header(header)},
+        }
+
+    @staticmethod
+    def replay(stored, fingerprint):
+        if stored['fingerprint'] != fingerprint:
+            return JsonResponse({"error": f"This {IDEMPOTENCY_HEADER} was already used for a different request."}, status=422)
+        response = HttpResponse(stored['content'], status=stored['status'])
+        for header, value in stored['headers'].items():
+            response[header] = value
+        response[REPLAYED_HEADER] = 'true'
+        return response
+
+    @staticmethod
+    def in_progress():
+        return JsonResponse({"error": f"A request with this {IDEMPOTENCY_HEADER} is still being processed."}, status=409)
@@ -0,0 +1,134 @@
+"""
+This module implements the background image processing pipeline for pet photos.
+
+It includes:
+- IMAGE_VARIANTS: The resized variants generated for every uploaded Pet.image.
+- variant_name: Returns the storage name of a variant for an original image (content-hashed originals,
+  see api/media.py, have content-hashed variants: pet_images/variants/<sha256>_thumb.webp).
+- variant_url: Returns the URL of a pet's variant if it has been generated.
+- generate_pet_image_variants: Resizes an original image into WebP variants (runs on a worker thread).
+- schedule_pet_image_variants: Queues variant generation once the upload has been committed.
+
+Uploads are stored at full size by the request as before; resizing runs on a small in-process
+thread pool (no external broker), so the request returns as soon as the original is saved.
+Until a variant exists, variant_url returns None and clients fall back to the original image. Once the
+variants are written, the pet records which image they belong to (Pet.variants_image), so building their
+URLs never probes the storage (a file stat per URL, or a network round trip on remote storage), and a
+newly uploaded image has no variants until its own are generated.
+"""
+
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from .cache import bump_pet_list_version
+from .media import is_content_hashed
+from .models import Pet
+
+logger = logging.getLogger(__name__)
+
+# --------------------------------------- Variants -------------------------------------------
+
+# Variant name -> longest side in pixels
+IMAGE_VARIANTS = {
+    'thumb': 320,
+    'medium': 960,
+}
+VARIANT_DIRECTORY = 'variants'
+VARIANT_FORMAT = 'WEBP'
+VARIANT_QUALITY = 80
+
+def variant_name(image_name, variant):
+    """Return the storage name of a variant, e.g. pet_images/variants/dog1_thumb.webp."""
+    directory, filename = os.path.split(image_name)
+    stem = os.path.splitext(filename)[0]
+    return os.path.join(directory, VARIANT_DIRECTORY, f"{stem}_{variant}.webp")
+
+def variant_url(pet, variant):
+    """Return the URL of a variant of a pet's image, or None if it has not been generated (yet)."""
+    if not pet.image or pet.variants_image != pet.image.name:
+        return None
+    return default_storage.url(variant_name(pet.image.name, variant))
+
+def generate_pet_image_variants(image_name):
+    """
+    Generate the resized WebP variants of an uploaded pet image.
+
+    Variants that already exist for a content-hashed original are kept: a repeated upload of the
+    same photo is not resized again.
+
+    Args:
+        image_name (str): The storage name of the original image (Pet.image.name).
+    """
+    variants = {variant: size for variant, size in IMAGE_VARIANTS.items()
+                if not (is_content_hashed(image_name) and default_storage.exists(variant_name(image_name, variant)))}
+    if not variants:
+        return  # Made from the same photo when it was first uploaded
+
+    from PIL import Image, ImageOps  # Imported on first use: Pillow is a slow import on the startup path
+
+    with default_storage.open(image_name, 'rb') as original:
+        image = Image.open(original)
+        image = ImageOps.exif_transpose(image)  # Respect the camera orientation before resizing
+        image.load()
+
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if 'transparency' in image.info else 'RGB')
+
+    for variant, size in variants.items():
+        resized = image.copy()
+        resized.thumbnail((size, size), Image.LANCZOS)  # Keeps the aspect ratio and never upscales
+
+        buffer = BytesIO()
+        resized.save(buffer, VARIANT_FORMAT, quality=VARIANT_QUALITY, method=4)
+
+        name = variant_name(image_name, variant)
+        if default_storage.exists(name):
+            default_storage.delete(name)  # Overwrite instead of letting the storage pick a new name
+        default_storage.save(name, ContentFile(buffer.getvalue()))
+
+# --------------------------------------- Worker Pool -------------------------------------------
+
+_executor = None
+_executor_lock = threading.Lock()
+
+def get_image_executor():
+    """Return the process-wide thread pool used for image processing."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, 'IMAGE_PROCESSING_WORKERS', 2),
+                    thread_name_prefix='pet-images',
+                )
+    return _executor
+
+def _process(image_name, shelter_id):
+    # Django only drops expired (CONN_MAX_AGE) or broken connections when a request starts or finishes,
+    # and these threads outlive any request, so do it around every job
+    close_old_connections()
+    try:
+        generate_pet_image_variants(image_name)
+        # Record the variants for the pets showing this image; cached listings and ETags were computed without them
+        Pet.objects.filter(image=image_name).update(variants_image=image_name, updated_at=timezone.now())
+        bump_pet_list_version(shelter_id)
+    except Exception:
+        logger.exception("Failed to generate image variants for %s", image_name)
+    finally:
+        close_old_connections()
+
+def schedule_pet_image_variants(pet):
+    """Queue variant generation for a pet's image once the current transaction commits."""
+    if not pet.image:
+        return
+    image_name, shelter_id = pet.image.name, pet.shelter_id_id
+    transaction.on_commit(lambda: get_image_executor().submit(_process, image_name, shelter_id))
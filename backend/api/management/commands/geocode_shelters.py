@@ -0,0 +1,41 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from api.geo import geocode
+from api.models import Shelter
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill in shelter coordinates from their addresses using the local lookup table (GEOCODE_TABLE). "
+        "Running servers keep their own location index, so /api/pets/nearby/ uses the new coordinates "
+        "after each worker's next rebuild (within GEO_INDEX_REFRESH_SECONDS)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help="Geocode every shelter, replacing existing coordinates.")
+
+    def handle(self, *args, **options):
+        shelters = Shelter.objects.only('shelter_id', 'address', 'latitude', 'longitude')
+        if not options['all']:
+            shelters = shelters.filter(latitude__isnull=True, longitude__isnull=True)
+
+        located, missing, now = [], 0, timezone.now()
+        for shelter in shelters.iterator():
+            location = geocode(shelter.address)
+            if location is None:
+                missing += 1
+                continue
+            shelter.latitude, shelter.longitude = location
+            shelter.updated_at = now  # bulk_update does not apply auto_now
+            located.append(shelter)
+
+        # bulk_update skips post_save, and each server process has its own index anyway: workers pick the
+        # coordinates up on their next background rebuild
+        Shelter.objects.bulk_update(located, ['latitude', 'longitude', 'updated_at'], batch_size=500)
+        self.stdout.write(self.style.SUCCESS(f"Geocoded {len(located)} shelter(s); {missing} address(es) could not be located."))
+        refresh_seconds = getattr(settings, 'GEO_INDEX_REFRESH_SECONDS', 300)
+        if located:
+            when = f"after their next index rebuild (within {refresh_seconds} seconds)" if refresh_seconds else "after a restart"
+            self.stdout.write(f"Running servers use the new coordinates for nearby searches {when}.")
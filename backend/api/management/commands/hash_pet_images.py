@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from api.cache import bump_pet_list_version
+from api.images import generate_pet_image_variants
+from api.media import is_content_hashed, pet_image_storage
+from api.models import Pet
+
+
+class Command(BaseCommand):
+    help = "Copy pet images uploaded before content hashing to content-hash names (the old files are kept)."
+
+    def handle(self, *args, **options):
+        pets = Pet.objects.exclude(image='').exclude(image__isnull=True).only('pet_id', 'image', 'variants_image', 'shelter_id')
+
+        renamed, missing, hashed_names, now = [], 0, {}, timezone.now()
+        for pet in pets.iterator():
+            name = pet.image.name
+            if is_content_hashed(name):
+                continue
+            if name not in hashed_names:
+                if not pet_image_storage.exists(name):
+                    missing += 1
+                    continue
+                with pet_image_storage.open(name, 'rb') as original:
+                    hashed_names[name] = pet_image_storage.save(name, original)
+                generate_pet_image_variants(hashed_names[name])
+            pet.image.name = pet.variants_image = hashed_names[name]
+            pet.updated_at = now  # bulk_update does not apply auto_now
+            renamed.append(pet)
+
+        Pet.objects.bulk_update(renamed, ['image', 'variants_image', 'updated_at'], batch_size=500)
+        if renamed:
+            bump_pet_list_version(*{pet.shelter_id_id for pet in renamed})
+        self.stdout.write(self.style.SUCCESS(
+            f"Renamed {len(renamed)} pet image(s) to {len(set(hashed_names.values()))} content-hashed file(s); "
+            f"{missing} file(s) are missing."
+        ))
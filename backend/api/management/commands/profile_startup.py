@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+
+from api.startup import STAGES, profile_startup
+
+
+class Command(BaseCommand):
+    help = "Report the cold-start cost of the backend: stage durations and the slowest imports (python -X importtime)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=3, help="Fresh interpreters to time (median reported).")
+        parser.add_argument('--top', type=int, default=15, help="Slowest modules and packages to list.")
+
+    def handle(self, *args, **options):
+        profile = profile_startup(runs=options['runs'])
+        top = options['top']
+
+        self.stdout.write(f"Startup stages (median of {profile.runs} runs):")
+        for stage in STAGES:
+            self.stdout.write(f"  {stage:<14}{profile.stages[stage]:>9.1f} ms")
+        self.stdout.write(f"  {'total':<14}{sum(profile.stages.values()):>9.1f} ms")
+
+        self.stdout.write("\nSlowest packages (import self time, ms):")
+        for stage in STAGES:
+            packages = ", ".join(f"{package} {ms:.1f}" for package, ms in profile.by_package(stage)[:5])
+            self.stdout.write(f"  {stage:<14}{packages}")
+
+        self.stdout.write("\nSlowest modules (self time, ms):")
+        for stage, module, self_ms, cumulative_ms in sorted(profile.modules, key=lambda row: row[2], reverse=True)[:top]:
+            self.stdout.write(f"  {self_ms:>7.1f}  (cumulative {cumulative_ms:>6.1f})  {module}  [{stage}]")
+
+        api_modules = sorted((row for row in profile.modules if row[1].split('.')[0] == 'api'), key=lambda row: row[2], reverse=True)
+        self.stdout.write("\napi modules (self time, ms):")
+        for stage, module, self_ms, cumulative_ms in api_modules[:top]:
+            self.stdout.write(f"  {self_ms:>7.1f}  (cumulative {cumulative_ms:>6.1f})  {module}  [{stage}]")
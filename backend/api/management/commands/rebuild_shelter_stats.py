@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from api.stats import rebuild_shelter_stats
+
+
+class Command(BaseCommand):
+    help = "Recompute the per-shelter dashboard counters (ShelterStats) from the source tables."
+
+    def handle(self, *args, **options):
+        count = rebuild_shelter_stats()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt stats for {count} shelter(s)."))
@@ -0,0 +1,130 @@
+"""
+This module implements the storage and delivery of uploaded media (pet photos) for the Adoptify Pet Finder API.
+
+It includes:
+- ContentHashStorage: A file system storage that names every upload after the SHA-256 of its content,
+  e.g. pet_images/<sha256>.jpg. Uploading the same photo twice reuses the stored file.
+- pet_image_storage: The storage instance used by Pet.image.
+- is_content_hashed: Whether a stored name is content-addressed (and so never changes).
+- media_cache_control: The Cache-Control header for a media file.
+- media_response: Builds the response for a /media/ request according to settings.MEDIA_SERVING:
+    - "django": Python streams the file (with Last-Modified and If-Modified-Since support).
+    - "x-accel-redirect": An empty response whose X-Accel-Redirect header tells nginx to send the file
+      from the internal location MEDIA_ACCEL_REDIRECT_PREFIX.
+    - "x-sendfile": An empty response whose X-Sendfile header tells Apache (mod_xsendfile) or lighttpd
+      to send the file from its path on disk.
+    - "off": /media/ is not routed to Django at all; the front web server serves MEDIA_ROOT itself.
+
+Content-hashed files (and their resized variants, see api/images.py) are served with a year-long
+"immutable" Cache-Control: a changed photo gets a new name, so a cached copy never goes stale. Files
+stored under their upload names before content hashing are cached for MEDIA_CACHE_SECONDS and
+revalidated with Last-Modified.
+"""
+
+import hashlib
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured, SuspiciousFileOperation
+from django.core.files.storage import FileSystemStorage
+from django.http import Http404, HttpResponse
+from django.utils._os import safe_join
+from django.utils.http import http_date
+from django.views import static
+
+MEDIA_SERVING_MODES = ('django', 'x-accel-redirect', 'x-sendfile', 'off')
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'  # One year
+HASH_CHUNK_SIZE = 64 * 1024
+
+# <sha256>.<ext> for originals and <sha256>_<variant>.<ext> for their resized variants
+CONTENT_HASHED_NAME_RE = re.compile(r'^[0-9a-f]{64}(_[a-z]+)?\.[a-z0-9]+$')
+
+def is_content_hashed(name):
+    """Return True if a stored file name is derived from the file's content."""
+    return bool(name) and CONTENT_HASHED_NAME_RE.match(os.path.basename(name)) is not None
+
+def media_cache_control(name):
+    if is_content_hashed(name):
+        return IMMUTABLE_CACHE_CONTROL
+    return f"public, max-age={getattr(settings, 'MEDIA_CACHE_SECONDS', 3600)}"
+
+# --------------------------------------- Storage -------------------------------------------
+
+# Stores each upload under the hash of its content, so identical uploads share one file
+class ContentHashStorage(FileSystemStorage):
+    def content_hash(self, content):
+        digest = hashlib.sha256()
+        if hasattr(content, 'seek'):
+            content.seek(0)
+        for chunk in content.chunks(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+        return digest.hexdigest()
+
+    def hashed_name(self, name, content):
+        """Return the content-addressed name for an upload, keeping its directory and extension."""
+        directory, filename = os.path.split(name)
+        extension = os.path.splitext(filename)[1].lower()
+        return os.path.join(directory, f"{self.content_hash(content)}{extension}")
+
+    def _save(self, name, content):
+        name = self.hashed_name(name, content)
+        if self.exists(name):
+            return name  # The same photo was uploaded before; share the stored file
+        return super()._save(name, content)
+
+pet_image_storage = ContentHashStorage()
+
+# --------------------------------------- Delivery -------------------------------------------
+
+def media_serving_mode():
+    mode = getattr(settings, 'MEDIA_SERVING', 'django')
+    if mode not in MEDIA_SERVING_MODES:
+        raise ImproperlyConfigured(f"MEDIA_SERVING must be one of {', '.join(MEDIA_SERVING_MODES)} (got {mode!r})")
+    return mode
+
+def _media_file(path):
+    """Return the absolute path of a media file, raising Http404 for anything that is not a file under MEDIA_ROOT."""
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404("Media file not found")
+    if not os.path.isfile(full_path):
+        raise Http404("Media file not found")
+    return full_path
+
+def _offloaded_response(full_path, header, value):
+    # The front web server replaces the empty body with the file and keeps these headers
+    content_type, encoding = mimetypes.guess_type(full_path)
+    response = HttpResponse(content_type=content_type or 'application/octet-stream')
+    response[header] = value
+    response['Last-Modified'] = http_date(os.stat(full_path).st_mtime)
+    if encoding:
+        response['Content-Encoding'] = encoding
+    return response
+
+def media_response(request, path):
+    """
+    Return the response delivering a media file.
+
+    Args:
+        request (HttpRequest): The GET/HEAD request.
+        path (str): The file's name relative to MEDIA_ROOT (e.g. pet_images/<sha256>.jpg).
+    """
+    mode = media_serving_mode()
+    if mode == 'off':
+        raise Http404("Media files are served by the front web server")
+
+    full_path = _media_file(path)
+    if mode == 'django':
+        response = static.serve(request, path, document_root=settings.MEDIA_ROOT)
+    elif mode == 'x-accel-redirect':
+        prefix = getattr(settings, 'MEDIA_ACCEL_REDIRECT_PREFIX', '/protected-media/')
+        response = _offloaded_response(full_path, 'X-Accel-Redirect', quote(prefix.rstrip('/') + '/' + path))
+    else:
+        response = _offloaded_response(full_path, 'X-Sendfile', full_path)
+
+    response['Cache-Control'] = media_cache_control(path)
+    return response
@@ -0,0 +1,214 @@
+"""
+This module collects per-endpoint performance metrics for the Adoptify Pet Finder API.
+
+It includes:
+- RequestStats: The measurements of the request being handled (DB queries, DB time, serialization time).
+- current_stats / serialization_timer: Let the database wrapper, serializers and renderers add to the current request.
+- count_query: A database execute wrapper, installed on every connection, that adds each query to the current request.
+- MetricsRegistry: Thread-safe, in-process aggregation keyed by URL name, HTTP method and status code.
+- render_prometheus: Exports the registry in the Prometheus text exposition format (served at /metrics).
+- JsonFormatter: A logging formatter that writes each record and its extra fields as one JSON line.
+
+The registry lives in each worker process; Prometheus should scrape every worker (or the numbers
+should be read per process). Requests are recorded by api.middleware.RequestMetricsMiddleware.
+"""
+
+import json
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Upper bounds (in seconds) of the request latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+UNMATCHED_ENDPOINT = 'unmatched'  # Label for requests that did not resolve to a named URL
+
+# --------------------------------------- Current Request -------------------------------------------
+
+# Measurements of the request being handled (a context variable, so it also follows async views)
+class RequestStats:
+    __slots__ = ('db_queries', 'db_seconds', 'serialization_seconds', '_serialization_depth')
+
+    def __init__(self):
+        self.db_queries = 0
+        self.db_seconds = 0.0
+        self.serialization_seconds = 0.0
+        self._serialization_depth = 0  # Nested serializers are only timed once
+
+    def __call__(self, execute, sql, params, many, context):
+        """Count and time a query run for this request."""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_seconds += time.perf_counter() - start
+            self.db_queries += 1
+
+_current_stats = ContextVar('adoptify_request_stats', default=None)
+
+def current_stats():
+    """Return the RequestStats of the request being handled, or None outside a request."""
+    return _current_stats.get()
+
+def start_request():
+    """Start measuring a request; returns (stats, token) where the token is passed to end_request."""
+    stats = RequestStats()
+    return stats, _current_stats.set(stats)
+
+def end_request(token):
+    _current_stats.reset(token)
+
+def count_query(execute, sql, params, many, context):
+    """
+    Execute wrapper added to every database connection (see install_query_counter).
+
+    It finds the request through the context variable, which also reaches the threads the async
+    ORM runs queries on, so no per-request wrapper has to be installed on each thread's connections.
+    """
+    stats = _current_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)  # Not part of a request (commands, background threads)
+    return stats(execute, sql, params, many, context)
+
+def install_query_counter(sender, connection, **kwargs):
+    """connection_created receiver: add count_query to a new connection (once, as connections can reconnect)."""
+    if count_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(count_query)
+
+@contextmanager
+def serialization_timer():
+    """Add the time spent in the block to the current request's serialization time."""
+    stats = _current_stats.get()
+    if stats is None:
+        yield
+        return
+    stats._serialization_depth += 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats._serialization_depth -= 1
+        if not stats._serialization_depth:
+            stats.serialization_seconds += time.perf_counter() - start
+
+# --------------------------------------- Registry -------------------------------------------
+
+# Aggregated measurements of one (endpoint, method, status) combination
+class EndpointMetrics:
+    __slots__ = ('count', 'latency_buckets', 'latency_sum', 'db_queries', 'db_seconds', 'serialization_seconds', 'response_bytes')
+
+    def __init__(self):
+        self.count = 0
+        self.latency_buckets = [0] * (len(LATENCY_BUCKETS) + 1)  # Last slot is +Inf
+        self.latency_sum = 0.0
+        self.db_queries = 0
+        self.db_seconds = 0.0
+        self.serialization_seconds = 0.0
+        self.response_bytes = 0
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints = {}
+
+    def record(self, endpoint, method, status_code, latency, stats, response_bytes):
+        """Add one finished request to the registry."""
+        key = (endpoint, method, str(status_code))
+        bucket = bisect_left(LATENCY_BUCKETS, latency)
+        with self._lock:
+            metrics = self._endpoints.get(key)
+            if metrics is None:
+                metrics = self._endpoints[key] = EndpointMetrics()
+            metrics.count += 1
+            metrics.latency_buckets[bucket] += 1
+            metrics.latency_sum += latency
+            metrics.db_queries += stats.db_queries
+            metrics.db_seconds += stats.db_seconds
+            metrics.serialization_seconds += stats.serialization_seconds
+            metrics.response_bytes += response_bytes
+
+    def snapshot(self):
+        """Return a copy of the aggregated metrics as {(endpoint, method, status): EndpointMetrics}."""
+        with self._lock:
+            copies = {}
+            for key, metrics in self._endpoints.items():
+                copy = EndpointMetrics()
+                for field in EndpointMetrics.__slots__:
+                    value = getattr(metrics, field)
+                    setattr(copy, field, list(value) if isinstance(value, list) else value)
+                copies[key] = copy
+            return copies
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+
+registry = MetricsRegistry()
+
+# --------------------------------------- Export -------------------------------------------
+
+# Counter metrics exported per endpoint: (metric name, EndpointMetrics field, help text)
+COUNTERS = (
+    ('adoptify_http_db_queries_total', 'db_queries', 'Database queries run while handling requests.'),
+    ('adoptify_http_db_seconds_total', 'db_seconds', 'Time spent in database queries.'),
+    ('adoptify_http_serialization_seconds_total', 'serialization_seconds', 'Time spent serializing and rendering responses.'),
+    ('adoptify_http_response_bytes_total', 'response_bytes', 'Bytes sent in response bodies.'),
+)
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _labels(key, **extra):
+    endpoint, method, status_code = key
+    pairs = [('endpoint', endpoint), ('method', method), ('status', status_code), *extra.items()]
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+def render_prometheus(snapshot=None):
+    """Return the metrics in the Prometheus text exposition format (version 0.0.4)."""
+    snapshot = registry.snapshot() if snapshot is None else snapshot
+    keys = sorted(snapshot)
+    lines = [
+        '# HELP adoptify_http_request_duration_seconds Request latency.',
+        '# TYPE adoptify_http_request_duration_seconds histogram',
+    ]
+    for key in keys:
+        metrics = snapshot[key]
+        cumulative = 0
+        for bound, count in zip((*LATENCY_BUCKETS, '+Inf'), metrics.latency_buckets):
+            cumulative += count
+            lines.append(f'adoptify_http_request_duration_seconds_bucket{_labels(key, le=bound)} {cumulative}')
+        lines.append(f'adoptify_http_request_duration_seconds_sum{_labels(key)} {_number(metrics.latency_sum)}')
+        lines.append(f'adoptify_http_request_duration_seconds_count{_labels(key)} {metrics.count}')
+
+    for name, field, help_text in COUNTERS:
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} counter')
+        for key in keys:
+            lines.append(f'{name}{_labels(key)} {_number(getattr(snapshot[key], field))}')
+    return '\n'.join(lines) + '\n'
+
+# --------------------------------------- Logging -------------------------------------------
+
+# Standard LogRecord attributes; anything else on a record came from `extra=` and is logged as a field
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+class JsonFormatter(logging.Formatter):
+    """Formats a log record and its `extra` fields as a single JSON object per line."""
+
+    def format(self, record):
+        entry = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        entry.update((key, value) for key, value in vars(record).items() if key not in _RECORD_ATTRIBUTES)
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
@@ -0,0 +1,72 @@
+"""
+This module contains the middleware of the Adoptify Pet Finder API.
+
+It includes:
+- RequestMetricsMiddleware: Measures every request (latency, DB queries and time, serialization time,
+  response size) per URL name and records it in api.metrics.registry and the "api.requests" log.
+  It supports both sync and async requests, so async views are not pushed back onto a thread.
+  Queries are counted by api.metrics.count_query, which is installed on every database connection.
+"""
+
+import logging
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from . import metrics
+
+logger = logging.getLogger('api.requests')
+
+# Request instrumentation (exported at /metrics, see api/metrics.py)
+class RequestMetricsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        stats, token = metrics.start_request()
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            metrics.end_request(token)
+        self.record(request, response, stats, time.perf_counter() - start)
+        return response
+
+    async def __acall__(self, request):
+        stats, token = metrics.start_request()
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            metrics.end_request(token)
+        self.record(request, response, stats, time.perf_counter() - start)
+        return response
+
+    @staticmethod
+    def record(request, response, stats, latency):
+        match = getattr(request, 'resolver_match', None)
+        endpoint = (match.url_name or match.view_name) if match else metrics.UNMATCHED_ENDPOINT
+        # Streaming bodies are produced after this returns, so only their time to first byte is measured
+        response_bytes = 0 if response.streaming else len(response.content)
+
+        metrics.registry.record(endpoint, request.method, response.status_code, latency, stats, response_bytes)
+        logger.info(
+            "%s %s %s", request.method, endpoint, response.status_code,
+            extra={
+                'endpoint': endpoint,
+                'method': request.method,
+                'status': response.status_code,
+                'duration_ms': round(latency * 1000, 2),
+                'db_queries': stats.db_queries,
+                'db_ms': round(stats.db_seconds * 1000, 2),
+                'serialization_ms': round(stats.serialization_seconds * 1000, 2),
+                'response_bytes': response_bytes,
+            },
+        )
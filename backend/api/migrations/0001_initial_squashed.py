@@ -0,0 +1,112 @@
+# Generated by Django 5.1.7 on 2026-10-18 10:39
+
+import api.models
+import django.core.validators
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # 0001-0010 collapsed into one CreateModel per model (with the fields as 0010 left them). New
+    # databases run this instead of the chain; databases that applied 0001-0010 just record it.
+
+    replaces = [('api', '0001_initial'), ('api', '0002_pet_shelter_adminuser_adoptionapplication_adopter_and_more'), ('api', '0003_delete_pettest_pet_image_shelter_phone_number_and_more'), ('api', '0004_remove_sheltermanagement_address_and_more'), ('api', '0005_alter_sheltermanagement_admin_user'), ('api', '0006_sheltermanagement_end_date_and_more'), ('api', '0007_alter_pet_adoption_status_alter_pet_gender_and_more'), ('api', '0008_favourite'), ('api', '0009_rename_pet_id_adoptionapplication_pet_and_more'), ('api', '0010_adoptionapplication_message')]
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Shelter',
+            fields=[
+                ('shelter_id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('address', models.CharField(max_length=200)),
+                ('website_url', models.URLField(blank=True, null=True)),
+                ('phone_number', models.CharField(blank=True, max_length=15, null=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Pet',
+            fields=[
+                ('pet_id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('age', models.IntegerField(validators=[django.core.validators.MinValueValidator(0.01), django.core.validators.MaxValueValidator(99)])),
+                ('gender', models.CharField(choices=[('Male', 'Male'), ('Female', 'Female')], default=None, max_length=10)),
+                ('domesticated', models.BooleanField()),
+                ('name', models.CharField(max_length=100)),
+                ('adoption_status', models.CharField(choices=[('Available', 'Available'), ('Pending', 'Pending'), ('Adopted', 'Adopted')], default='Available', max_length=10)),
+                ('pet_type', models.CharField(choices=[('Dog', 'Dog'), ('Cat', 'Cat'), ('Bird', 'Bird'), ('Rabbit', 'Rabbit')], default='Dog', max_length=10)),
+                ('shelter_id', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='pets', to='api.shelter')),
+                ('image', models.ImageField(blank=True, null=True, upload_to='pet_images/')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='AdminUser',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('phone_number', models.CharField(blank=True, max_length=15)),
+                ('address', models.TextField(blank=True)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='admin_profile', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Adopter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('adoption_date', models.DateTimeField(auto_now_add=True)),
+                ('adoption_status', models.BooleanField(default=False)),
+                ('adopter_user_id', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+                ('pet_id', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='api.pet')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Donation',
+            fields=[
+                ('fundId', models.BigAutoField(primary_key=True, serialize=False)),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('donation_date', models.DateTimeField(auto_now_add=True)),
+                ('adopter_user_id', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+                ('shelter_id', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='api.shelter')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='UserProfile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('phone_number', models.CharField(blank=True, max_length=15)),
+                ('address', models.TextField(blank=True)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='profile', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ShelterManagement',
+            fields=[
+                ('manage_id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('admin_user', models.ForeignKey(default=api.models.get_root_admin_user, on_delete=django.db.models.deletion.CASCADE, related_name='managed_shelters', to=settings.AUTH_USER_MODEL)),
+                ('shelter_id', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='management', to='api.shelter')),
+                ('end_date', models.DateField(blank=True, null=True)),
+                ('start_date', models.DateField(blank=True, null=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Favourite',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('adopter_user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='favourites', to=settings.AUTH_USER_MODEL)),
+                ('pet', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='favourites', to='api.pet')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='AdoptionApplication',
+            fields=[
+                ('application_status', models.CharField(choices=[('Pending', 'Pending'), ('Approved', 'Approved'), ('Rejected', 'Rejected')], default='Pending', max_length=20)),
+                ('application_id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('submission_date', models.DateTimeField(auto_now_add=True)),
+                ('adopter_user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+                ('pet', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='api.pet')),
+                ('message', models.TextField(blank=True, null=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.1.7 on 2026-10-18 09:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0010_adoptionapplication_message'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='pet',
+            index=models.Index(fields=['adoption_status', 'pet_type', 'gender', 'pet_id'], name='pet_status_type_gender_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pet',
+            index=models.Index(fields=['pet_type', 'gender', 'pet_id'], name='pet_type_gender_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pet',
+            index=models.Index(fields=['gender', 'adoption_status', 'pet_id'], name='pet_gender_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pet',
+            index=models.Index(fields=['shelter_id', 'adoption_status', 'pet_id'], name='pet_shelter_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pet',
+            index=models.Index(fields=['adoption_status', 'age'], name='pet_status_age_idx'),
+        ),
+    ]
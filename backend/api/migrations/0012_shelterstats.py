@@ -0,0 +1,51 @@
+# Generated by Django 5.1.7 on 2026-10-18 09:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def populate_shelter_stats(apps, schema_editor):
+    # Seed the counters from the existing rows (same logic as api.stats.rebuild_shelter_stats)
+    Shelter = apps.get_model('api', 'Shelter')
+    ShelterStats = apps.get_model('api', 'ShelterStats')
+    Pet = apps.get_model('api', 'Pet')
+    AdoptionApplication = apps.get_model('api', 'AdoptionApplication')
+    Favourite = apps.get_model('api', 'Favourite')
+    Donation = apps.get_model('api', 'Donation')
+
+    fields = {'Available': 'available_pets', 'Pending': 'pending_pets', 'Adopted': 'adopted_pets'}
+    stats = {shelter_id: ShelterStats(shelter_id=shelter_id) for shelter_id in Shelter.objects.values_list('shelter_id', flat=True)}
+    for row in Pet.objects.values('shelter_id', 'adoption_status').annotate(total=Count('pet_id')).order_by():
+        if row['adoption_status'] in fields:
+            setattr(stats[row['shelter_id']], fields[row['adoption_status']], row['total'])
+    for row in AdoptionApplication.objects.filter(application_status='Pending').values('pet__shelter_id').annotate(total=Count('application_id')).order_by():
+        stats[row['pet__shelter_id']].open_applications = row['total']
+    for row in Favourite.objects.values('pet__shelter_id').annotate(total=Count('id')).order_by():
+        stats[row['pet__shelter_id']].favourites = row['total']
+    for row in Donation.objects.values('shelter_id').annotate(total=Sum('amount')).order_by():
+        stats[row['shelter_id']].donation_total = row['total'] or 0
+    ShelterStats.objects.bulk_create(stats.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0011_pet_catalogue_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ShelterStats',
+            fields=[
+                ('shelter', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='api.shelter')),
+                ('available_pets', models.IntegerField(default=0)),
+                ('pending_pets', models.IntegerField(default=0)),
+                ('adopted_pets', models.IntegerField(default=0)),
+                ('open_applications', models.IntegerField(default=0)),
+                ('favourites', models.IntegerField(default=0)),
+                ('donation_total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+            ],
+        ),
+        migrations.RunPython(populate_shelter_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.7 on 2026-10-18 10:21
+
+import api.media
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0015_shelter_location'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='pet',
+            name='image',
+            field=models.ImageField(blank=True, null=True, storage=api.media.ContentHashStorage(), upload_to='pet_images/'),
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.1.7 on 2026-10-18 10:25
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, F, Min
+from django.utils import timezone
+
+
+def remove_duplicates(apps, schema_editor):
+    # Keep the first favourite and the first open application of each (pet, user) pair; later duplicates
+    # are deleted (favourites) or rejected (applications), and the dashboard counters follow
+    Favourite = apps.get_model('api', 'Favourite')
+    AdoptionApplication = apps.get_model('api', 'AdoptionApplication')
+    ShelterStats = apps.get_model('api', 'ShelterStats')
+
+    duplicates = Favourite.objects.values('pet', 'adopter_user').annotate(first=Min('id'), total=Count('id')).filter(total__gt=1).order_by()
+    for row in duplicates:
+        extra = Favourite.objects.filter(pet=row['pet'], adopter_user=row['adopter_user']).exclude(id=row['first'])
+        shelter_id = extra[0].pet.shelter_id_id
+        removed, _ = extra.delete()
+        ShelterStats.objects.filter(shelter_id=shelter_id).update(favourites=F('favourites') - removed)
+
+    open_applications = AdoptionApplication.objects.filter(application_status__in=('Pending', 'Approved'))
+    duplicates = open_applications.values('pet', 'adopter_user').annotate(first=Min('application_id'), total=Count('application_id')).filter(total__gt=1).order_by()
+    for row in duplicates:
+        extra = open_applications.filter(pet=row['pet'], adopter_user=row['adopter_user']).exclude(application_id=row['first'])
+        shelter_id = extra[0].pet.shelter_id_id
+        pending = extra.filter(application_status='Pending').count()
+        extra.update(application_status='Rejected', updated_at=timezone.now())  # update() skips auto_now
+        ShelterStats.objects.filter(shelter_id=shelter_id).update(open_applications=F('open_applications') - pending)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0016_pet_image_content_hash_storage'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicates, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='adoptionapplication',
+            constraint=models.UniqueConstraint(models.F('adopter_user'), models.Case(models.When(application_status__in=('Pending', 'Approved'), then='pet'), default=None), name='unique_open_application'),
+        ),
+        migrations.AddConstraint(
+            model_name='favourite',
+            constraint=models.UniqueConstraint(fields=('pet', 'adopter_user'), name='unique_favourite'),
+        ),
+    ]
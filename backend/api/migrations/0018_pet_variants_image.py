@@ -0,0 +1,41 @@
+# Generated by Django 5.1.7 on 2026-10-18 11:21
+
+import os
+
+from django.core.files.storage import default_storage
+from django.db import migrations, models
+from django.utils import timezone
+
+# The variants and their naming as of this migration (copied from api/images.py, which may change later)
+IMAGE_VARIANTS = ('thumb', 'medium')
+
+
+def variant_name(image_name, variant):
+    directory, filename = os.path.split(image_name)
+    stem = os.path.splitext(filename)[0]
+    return os.path.join(directory, 'variants', f"{stem}_{variant}.webp")
+
+
+def record_existing_variants(apps, schema_editor):
+    # Variants generated before this field existed were found by probing the storage; do that once here
+    Pet = apps.get_model('api', 'Pet')
+    image_names = Pet.objects.exclude(image='').exclude(image__isnull=True).values_list('image', flat=True).distinct()
+    for image_name in image_names.iterator():
+        if all(default_storage.exists(variant_name(image_name, variant)) for variant in IMAGE_VARIANTS):
+            Pet.objects.filter(image=image_name).update(variants_image=image_name, updated_at=timezone.now())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0017_unique_favourite_and_open_application'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pet',
+            name='variants_image',
+            field=models.CharField(blank=True, default='', max_length=100),
+        ),
+        migrations.RunPython(record_existing_variants, migrations.RunPython.noop),
+    ]
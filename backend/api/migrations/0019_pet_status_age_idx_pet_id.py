@@ -0,0 +1,21 @@
+# Generated by Django 5.1.7 on 2026-10-18 11:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0018_pet_variants_image'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='pet',
+            name='pet_status_age_idx',
+        ),
+        migrations.AddIndex(
+            model_name='pet',
+            index=models.Index(fields=['adoption_status', 'age', 'pet_id'], name='pet_status_age_idx'),
+        ),
+    ]
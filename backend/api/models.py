@@ -4,21 +4,29 @@ This module defines the database models for the Adoptify Pet Finder application.
 It includes models for:
 - UserProfile: Extends the default User model with additional fields like phone number and address.
 - AdminUser: Represents admin users with additional fields.
-- Shelter: Represents shelters, including their name, address, phone number, and website URL.
+- Shelter: Represents shelters, including their name, address (and its coordinates), phone number, and website URL.
 - ShelterManagement: Represents the management of shelters by admin users.
-- Pet: Represents pets, including their details like age, gender, type, and adoption status.
+- Pet: Represents pets, including their details like age, gender, type, and adoption status (and a content-hashed photo).
 - AdoptionApplication: Represents adoption applications submitted by users for pets.
 - Donation: Represents donations made by users to shelters.
 - Adopter: Represents the adoption of pets by users.
 - Favourite: Represents the favourite pets of users.
+- ShelterStats: Denormalized per-shelter counters for the admin dashboard.
 
 Each model includes methods for specific operations and string representations for better readability.
 """
 
+from decimal import Decimal
+
 from django.db import models
+from django.db.models import Case, F, When
 from django.contrib.auth.models import User
 from django.core.validators import MinValueValidator, MaxValueValidator, URLValidator
 
+from .media import pet_image_storage
+
+OPEN_APPLICATION_STATUSES = ('Pending', 'Approved')  # Applications still holding their pet
+
 def get_root_admin_user():
     return User.objects.filter(is_superuser=True).first()
 
@@ -53,6 +61,10 @@ class Shelter(models.Model):
     address = models.CharField(max_length=200)  # Shelter address
     phone_number = models.CharField(max_length=15, blank=True, null=True)  # Optional phone number
     website_url = models.URLField(blank=True, null=True)  # Optional website URL
+    # Coordinates for distance search; geocoded from the address when not given (see api/geo.py)
+    latitude = models.FloatField(blank=True, null=True, validators=[MinValueValidator(-90), MaxValueValidator(90)])
+    longitude = models.FloatField(blank=True, null=True, validators=[MinValueValidator(-180), MaxValueValidator(180)])
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)  # Last change, for ETag/Last-Modified (see api/conditional.py)
 
     def __str__(self):
         return self.name  # Return the shelter name as the string representation
@@ -126,6 +138,7 @@ class Pet(models.Model):
         ("Pending", "Pending"),
         ("Adopted", "Adopted"),
     ]
+    GENDER_CHOICES = (("Male", "Male"), ("Female", "Female"))
 
     pet_id = models.BigAutoField(primary_key=True, null=False)  # Auto-incrementing ID
     age = models.IntegerField(
@@ -134,7 +147,7 @@ class Pet(models.Model):
     )
     gender = models.CharField(
         max_length=10,
-        choices=(("Male", "Male"), ("Female", "Female")),  # Gender choices
+        choices=GENDER_CHOICES,  # Gender choices
         default=None,
         blank=False  # Ensure gender is required
     )
@@ -161,9 +174,23 @@ class Pet(models.Model):
     )
     image = models.ImageField(
         upload_to='pet_images/',  # Directory for storing pet images
+        storage=pet_image_storage,  # Stored as pet_images/<sha256>.<ext> (see api/media.py)
         blank=True,
         null=True  # Image is optional
     )
+    variants_image = models.CharField(max_length=100, blank=True, default='')  # The image whose resized variants exist (see api/images.py)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)  # Last change, for ETag/Last-Modified (see api/conditional.py)
+
+    class Meta:
+        # Composite indexes for the catalogue filters in api/filters.py. Each one ends in pet_id so the
+        # cursor pagination (ORDER BY pet_id) stays an index range scan for every filter combination.
+        indexes = [
+            models.Index(fields=['adoption_status', 'pet_type', 'gender', 'pet_id'], name='pet_status_type_gender_idx'),
+            models.Index(fields=['pet_type', 'gender', 'pet_id'], name='pet_type_gender_idx'),
+            models.Index(fields=['gender', 'adoption_status', 'pet_id'], name='pet_gender_status_idx'),
+            models.Index(fields=['shelter_id', 'adoption_status', 'pet_id'], name='pet_shelter_status_idx'),
+            models.Index(fields=['adoption_status', 'age', 'pet_id'], name='pet_status_age_idx'),
+        ]
 
     def __str__(self):
         return self.name  # Return the pet name as the string representation
@@ -182,6 +209,19 @@ class AdoptionApplication(models.Model):
     pet = models.ForeignKey(Pet, on_delete=models.CASCADE)  # Link to the Pet model
     adopter_user = models.ForeignKey(User, on_delete=models.CASCADE)  # Link to the User model
     message = models.TextField(null=True, blank=True)  # Optional message field
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)  # Last change, for ETag/Last-Modified (see api/conditional.py)
+
+    class Meta:
+        constraints = [
+            # At most one open application per user and pet, so a retried submission cannot add a second one.
+            # An expression rather than a condition, as MySQL has no partial indexes: closed applications
+            # index NULL, which never collides.
+            models.UniqueConstraint(
+                'adopter_user',
+                Case(When(application_status__in=OPEN_APPLICATION_STATUSES, then='pet'), default=None),
+                name='unique_open_application',
+            ),
+        ]
 
     def __str__(self):
         return f"Application {self.application_id} - {self.application_status}"  # String representation
@@ -195,6 +235,15 @@ class Donation(models.Model):
     shelter_id = models.ForeignKey(Shelter, on_delete=models.CASCADE)
     amount = models.DecimalField(max_digits=10, decimal_places=2)
     donation_date = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)  # Last change, for ETag/Last-Modified (see api/conditional.py)
+
+    class Meta:
+        # Date-range indexes for the donation report (api/reports.py): per shelter, per donor and overall
+        indexes = [
+            models.Index(fields=['shelter_id', 'donation_date'], name='donation_shelter_date_idx'),
+            models.Index(fields=['adopter_user_id', 'donation_date'], name='donation_donor_date_idx'),
+            models.Index(fields=['donation_date'], name='donation_date_idx'),
+        ]
 
     def __str__(self):
         return f"Donation {self.fundId} - ${self.amount}"
@@ -204,6 +253,7 @@ class Donation(models.Model):
         self.shelter_id = shelter
         self.amount = amount
         self.save()
+        ShelterStats.adjust(shelter.pk, donation_total=Decimal(str(self.amount)))  # Keep the dashboard total up to date
     def getDonationDetails(self):
         return {self.fundId, self.adopter_user_id.username, self.shelter_id.name, self.amount, self.donation_date}
 
@@ -227,10 +277,16 @@ class Favourite(models.Model):
     pet = models.ForeignKey(Pet, on_delete=models.CASCADE, related_name='favourites')  # Renamed from pet_id to pet
     adopter_user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='favourites')  # Fixed related_name typo
 
+    class Meta:
+        # One row per user and pet, so concurrent or retried adds cannot duplicate it (get_or_create relies on this)
+        constraints = [models.UniqueConstraint(fields=['pet', 'adopter_user'], name='unique_favourite')]
+
     def addPetToFavourites(self, pet, adopter):
         """Add a pet to the user's favourites."""
         # Create a new Favourite entry if it doesn't already exist
         favourite, created = Favourite.objects.get_or_create(pet=pet, adopter_user=adopter)
+        if created:
+            ShelterStats.adjust(pet.shelter_id_id, favourites=1)  # Keep the dashboard count up to date
         return favourite
 
     def removePetFromFavourites(self, pet, adopter):
@@ -239,8 +295,37 @@ class Favourite(models.Model):
         favourite = Favourite.objects.filter(pet=pet, adopter_user=adopter).first()
         if favourite:
             favourite.delete()
+            ShelterStats.adjust(pet.shelter_id_id, favourites=-1)  # Keep the dashboard count up to date
             return True
         return False
 
     def __str__(self):
-        return f"{self.adopter_user.username} - {self.pet.name}"
\ No newline at end of file
+        return f"{self.adopter_user.username} - {self.pet.name}"
+
+# --------------------------------------- Shelter Stats Model -------------------------------------------
+
+# This model holds denormalized per-shelter counters for the admin dashboard.
+# The counters are adjusted with F() expressions by the write paths (see api/stats.py) and can be
+# rebuilt from scratch with `python manage.py rebuild_shelter_stats`.
+class ShelterStats(models.Model):
+    shelter = models.OneToOneField(Shelter, on_delete=models.CASCADE, primary_key=True, related_name='stats')  # Link to the Shelter model
+    available_pets = models.IntegerField(default=0)  # Pets with adoption_status "Available"
+    pending_pets = models.IntegerField(default=0)  # Pets with adoption_status "Pending"
+    adopted_pets = models.IntegerField(default=0)  # Pets with adoption_status "Adopted"
+    open_applications = models.IntegerField(default=0)  # Applications with application_status "Pending"
+    favourites = models.IntegerField(default=0)  # Favourites on the shelter's pets
+    donation_total = models.DecimalField(max_digits=14, decimal_places=2, default=0)  # Sum of donations
+
+    def __str__(self):
+        return f"Stats for {self.shelter_id}"
+
+    @classmethod
+    def adjust(cls, shelter_id, **deltas):
+        """Atomically add the given deltas to a shelter's counters, creating the row if needed."""
+        deltas = {field: delta for field, delta in deltas.items() if delta}
+        if shelter_id is None or not deltas:
+            return
+        changes = {field: F(field) + delta for field, delta in deltas.items()}
+        if not cls.objects.filter(shelter_id=shelter_id).update(**changes):
+            cls.objects.get_or_create(shelter_id=shelter_id)
+            cls.objects.filter(shelter_id=shelter_id).update(**changes)
@@ -0,0 +1,77 @@
+"""
+This module defines the pagination classes for the Adoptify Pet Finder API.
+
+It includes:
+- PetCursorPagination: Keyset (cursor) pagination for the pet catalogue, ordered by pet_id, with an
+  async variant (apaginate_queryset) for the async catalogue views.
+
+Cursor pagination keeps every page a `pet_id > <last seen>` range scan, so the cost of a page
+does not grow with how deep into the catalogue the client has scrolled.
+"""
+
+from rest_framework.pagination import CursorPagination, _reverse_ordering
+
+# --------------------------------------- Pet Pagination -------------------------------------------
+
+class PetCursorPagination(CursorPagination):
+    ordering = 'pet_id'  # Keyset on the primary key (unique and never changes)
+    page_size = 50  # Default number of pets per page
+    page_size_query_param = 'page_size'  # Allow clients to request a smaller or larger page
+    max_page_size = 200  # Upper bound so a single request cannot pull the whole table
+
+    # DRF's paginate_queryset, split around the one query so the async views can run it with the async ORM
+    def paginate_queryset(self, queryset, request, view=None):
+        return self._set_page(list(self._page_queryset(queryset, request, view)))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """Same as paginate_queryset, fetching the page with the async ORM."""
+        return self._set_page([pet async for pet in self._page_queryset(queryset, request, view)])
+
+    def _page_queryset(self, queryset, request, view):
+        # The ordered, cursor-filtered slice holding the page plus one row (to detect a next page)
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+
+        self.cursor = self.decode_cursor(request)
+        offset, reverse, current_position = self.cursor or (0, False, None)
+        queryset = queryset.order_by(*(_reverse_ordering(self.ordering) if reverse else self.ordering))
+
+        if current_position is not None:
+            order = self.ordering[0]
+            lookup = 'lt' if self.cursor.reverse != order.startswith('-') else 'gt'
+            queryset = queryset.filter(**{f"{order.lstrip('-')}__{lookup}": current_position})
+        return queryset[offset:offset + self.page_size + 1]
+
+    def _set_page(self, results):
+        # Set the page and the next/previous positions from the fetched rows
+        offset, reverse, current_position = self.cursor or (0, False, None)
+        self.page = results[:self.page_size]
+
+        if len(results) > len(self.page):
+            has_following_position = True
+            following_position = self._get_position_from_instance(results[-1], self.ordering)
+        else:
+            has_following_position, following_position = False, None
+
+        if reverse:
+            # The query ran in reverse order, so put the page back in the requested order
+            self.page = list(reversed(self.page))
+            self.has_next = (current_position is not None) or (offset > 0)
+            self.has_previous = has_following_position
+            if self.has_next:
+                self.next_position = current_position
+            if self.has_previous:
+                self.previous_position = following_position
+        else:
+            self.has_next = has_following_position
+            self.has_previous = (current_position is not None) or (offset > 0)
+            if self.has_next:
+                self.next_position = following_position
+            if self.has_previous:
+                self.previous_position = current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
@@ -0,0 +1,148 @@
+"""
+This module routes database reads to read replicas for the Adoptify Pet Finder API.
+
+It includes:
+- PrimaryReplicaRouter: A database router sending writes (and migrations) to the primary ('default')
+  database and the reads of GET/HEAD requests to one of settings.DATABASE_REPLICAS.
+- ReplicaRoutingMiddleware: Decides per request whether its reads may use a replica.
+- use_primary: Sends the remaining reads of the current request to the primary.
+- pin_user / user_is_pinned: Read-your-writes stickiness. After a successful write, the user's reads
+  go to the primary for REPLICA_STICKY_SECONDS, so what they just submitted shows up in their lists
+  even while the replicas are catching up.
+- mark_catalogue_written / catalogue_recently_written: The same for the shared pet listing cache,
+  whose pages are built from the primary for a while after any catalogue write.
+
+Reads only use a replica inside a GET/HEAD request; POST/PUT/PATCH/DELETE requests, management
+commands and background threads always use the primary. A request reads from a single replica, so
+its queries (e.g. a page and its count) see the same snapshot. Without replicas configured,
+everything uses the primary and the middleware does nothing.
+"""
+
+import random
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import TokenError, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+PINNED_USER_KEY = 'db:primary:user:{user_id}'  # Set for REPLICA_STICKY_SECONDS after a user's write
+CATALOGUE_WRITE_KEY = 'db:primary:catalogue'  # Set for REPLICA_STICKY_SECONDS after a pet catalogue write
+
+def replica_aliases():
+    return getattr(settings, 'DATABASE_REPLICAS', [])
+
+def sticky_seconds():
+    return getattr(settings, 'REPLICA_STICKY_SECONDS', 10)
+
+# --------------------------------------- Request State -------------------------------------------
+
+# The replica chosen for the current request (None: use the primary)
+_replica = ContextVar('adoptify_db_replica', default=None)
+
+def use_primary():
+    """Send the remaining reads of the current request to the primary."""
+    _replica.set(None)
+
+def user_is_pinned(user_id):
+    return user_id is not None and cache.get(PINNED_USER_KEY.format(user_id=user_id)) is not None
+
+def pin_user(user_id):
+    """Read from the primary for this user's next requests (for REPLICA_STICKY_SECONDS)."""
+    cache.set(PINNED_USER_KEY.format(user_id=user_id), True, sticky_seconds())
+
+def mark_catalogue_written():
+    """Build shared pet listing pages from the primary for a while (see PetListView)."""
+    if replica_aliases():
+        cache.set(CATALOGUE_WRITE_KEY, True, sticky_seconds())
+
+def catalogue_recently_written():
+    return bool(replica_aliases()) and cache.get(CATALOGUE_WRITE_KEY) is not None
+
+async def acatalogue_recently_written():
+    return bool(replica_aliases()) and await cache.aget(CATALOGUE_WRITE_KEY) is not None
+
+# --------------------------------------- Router -------------------------------------------
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        return _replica.get() or DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True  # Every alias holds the same data
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in replica_aliases()  # Replicas receive the schema through replication
+
+# --------------------------------------- Middleware -------------------------------------------
+
+_authentication = JWTAuthentication()
+
+def token_user_id(request):
+    """Return the user id of the request's access token without a database query (None if there is none)."""
+    header = _authentication.get_header(request)
+    raw_token = _authentication.get_raw_token(header) if header else None
+    if raw_token is None:
+        return None
+    try:
+        return _authentication.get_validated_token(raw_token).get(api_settings.USER_ID_CLAIM)
+    except (InvalidToken, TokenError):
+        return None  # Authentication will reject the request anyway
+
+# Chooses the database for each request's reads and records writes for stickiness
+class ReplicaRoutingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not replica_aliases():
+            return self.get_response(request)
+
+        user_id = token_user_id(request)
+        token = _replica.set(self.choose_replica(request, user_is_pinned(user_id)))
+        try:
+            response = self.get_response(request)
+        finally:
+            _replica.reset(token)
+        if self.is_write(request, response) and user_id is not None:
+            pin_user(user_id)
+        return response
+
+    async def __acall__(self, request):
+        if not replica_aliases():
+            return await self.get_response(request)
+
+        user_id = token_user_id(request)
+        pinned = user_id is not None and await cache.aget(PINNED_USER_KEY.format(user_id=user_id)) is not None
+        token = _replica.set(self.choose_replica(request, pinned))
+        try:
+            response = await self.get_response(request)
+        finally:
+            _replica.reset(token)
+        if self.is_write(request, response) and user_id is not None:
+            await cache.aset(PINNED_USER_KEY.format(user_id=user_id), True, sticky_seconds())
+        return response
+
+    @staticmethod
+    def choose_replica(request, pinned):
+        if request.method not in SAFE_METHODS or pinned:
+            return None
+        return random.choice(replica_aliases())
+
+    @staticmethod
+    def is_write(request, response):
+        return request.method not in SAFE_METHODS and response.status_code < 400
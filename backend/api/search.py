@@ -0,0 +1,369 @@
+"""
+This module implements the in-process full-text search index behind /api/pets/search/.
+
+It includes:
+- tokenize: Splits text into normalised search terms.
+- PetSearchIndex: An inverted index over Pet.name, pet_type, gender and Shelter.name/address
+  with ranked, prefix and typo-tolerant (edit distance 1) matching.
+- pet_search_index: The process-wide index instance used by the view and the signal handlers.
+
+The index is built from the database on first use and then kept up to date incrementally by the
+post_save/post_delete handlers in api/signals.py. Shelter terms are indexed once per shelter (not once
+per pet), so renaming a shelter only touches that shelter's postings. Signals only reach the process
+that made the write, so each process also rebuilds its index in the background once it is older than
+SEARCH_INDEX_REFRESH_SECONDS to pick up writes made by other workers. Changes signalled while any build
+reads the database (the first one or a background one) are queued and replayed on the new index when it
+is installed, so they are not lost.
+"""
+
+import bisect
+import heapq
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict, defaultdict
+
+from django.conf import settings
+
+# --------------------------------------- Tokenizer -------------------------------------------
+
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+def tokenize(text):
+    """Lowercase, strip accents and split text into alphanumeric terms."""
+    if not text:
+        return []
+    text = unicodedata.normalize('NFKD', str(text)).encode('ascii', 'ignore').decode('ascii')
+    return TOKEN_RE.findall(text.lower())
+
+def _deletes(term):
+    """Return the term and every variant of it with one character removed."""
+    return {term} | {term[:i] + term[i + 1:] for i in range(len(term))}
+
+# --------------------------------------- Search Index -------------------------------------------
+
+class PetSearchIndex:
+    """
+    Inverted index of pets and shelters.
+
+    Field weights rank a match on the pet's name above a match on its type, gender or shelter.
+    Match quality ranks an exact term above a prefix of a term above a one-typo match.
+    """
+
+    PET_FIELD_WEIGHTS = {'name': 3.0, 'pet_type': 2.0, 'gender': 1.0}
+    SHELTER_FIELD_WEIGHTS = {'name': 1.5, 'address': 1.0}
+
+    EXACT, PREFIX, FUZZY = 1.0, 0.8, 0.6
+    MIN_PREFIX_LENGTH = 2  # Shorter query terms only match exactly
+    MIN_FUZZY_LENGTH = 4  # Shorter query terms are not typo-corrected
+    MAX_PREFIX_EXPANSIONS = 50  # Cap on the number of terms a single prefix can expand to
+    TOKEN_CACHE_SIZE = 256  # Number of per-token results kept between searches
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._build_lock = threading.Lock()  # Held for the whole first build, so searches wait for it
+        self._built = False
+        self._rebuilding = False
+        self._built_at = 0.0
+        self._pending = None  # Changes made while a build reads the database (None when no build is running)
+        self._clear()
+
+    def _clear(self):
+        self._pet_postings = defaultdict(lambda: defaultdict(set))  # term -> {weight: set of pet_ids}
+        self._shelter_postings = defaultdict(dict)  # term -> {shelter_id: weight}
+        self._pet_terms = {}  # pet_id -> {term: weight}
+        self._pet_shelter = {}  # pet_id -> shelter_id
+        self._shelter_terms = {}  # shelter_id -> set of terms
+        self._shelter_pets = defaultdict(set)  # shelter_id -> set of pet_ids
+        self._term_refs = defaultdict(int)  # term -> number of documents using it
+        self._vocabulary = []  # Sorted list of terms, for prefix lookups
+        self._variants = defaultdict(set)  # deleted variant -> set of terms, for typo lookups
+        self._token_cache = OrderedDict()  # token -> buckets, emptied on every change to the index
+
+    # ------------------------------ Vocabulary ------------------------------
+
+    def _add_term(self, term):
+        self._term_refs[term] += 1
+        if self._term_refs[term] == 1:
+            bisect.insort(self._vocabulary, term)
+            for variant in _deletes(term):
+                self._variants[variant].add(term)
+
+    def _remove_term(self, term):
+        self._term_refs[term] -= 1
+        if self._term_refs[term] <= 0:
+            del self._term_refs[term]
+            position = bisect.bisect_left(self._vocabulary, term)
+            if position < len(self._vocabulary) and self._vocabulary[position] == term:
+                del self._vocabulary[position]
+            for variant in _deletes(term):
+                self._variants[variant].discard(term)
+                if not self._variants[variant]:
+                    del self._variants[variant]
+
+    @staticmethod
+    def _weighted_terms(fields, weights):
+        """Return {term: weight} for a document, keeping the best weight of each term."""
+        terms = {}
+        for field, weight in weights.items():
+            for term in tokenize(fields.get(field)):
+                terms[term] = max(terms.get(term, 0.0), weight)
+        return terms
+
+    # ------------------------------ Building ------------------------------
+
+    @staticmethod
+    def _read():
+        """Return the (shelters, pets) rows the index is built from."""
+        from .models import Pet, Shelter  # Imported here so the module can load before the app registry
+
+        shelters = list(Shelter.objects.values_list('shelter_id', 'name', 'address'))
+        pets = list(Pet.objects.values_list('pet_id', 'name', 'pet_type', 'gender', 'shelter_id'))
+        return shelters, pets
+
+    def _load(self, shelters, pets):
+        self._clear()
+        for shelter_id, name, address in shelters:
+            self._index_shelter(shelter_id, {'name': name, 'address': address})
+        for pet_id, name, pet_type, gender, shelter_id in pets:
+            self._index_pet(pet_id, shelter_id, {'name': name, 'pet_type': pet_type, 'gender': gender})
+        self._built = True
+        self._built_at = time.monotonic()
+
+    def _replay_pending(self):
+        # The rows may have been read before these changes, so apply them again, in order
+        for change, args in self._pending:
+            change(*args)
+
+    def build(self):
+        """Rebuild the whole index from the database."""
+        with self._lock:
+            self._pending = []  # Start recording changes before reading the database
+        try:
+            shelters, pets = self._read()
+            with self._lock:
+                self._load(shelters, pets)
+                self._replay_pending()
+        finally:
+            with self._lock:
+                self._pending = None
+
+    def ensure_built(self):
+        """Build the index on first use and refresh it in the background once it gets old."""
+        if not self._built:
+            with self._build_lock:
+                if not self._built:
+                    self.build()
+            return
+
+        refresh_seconds = getattr(settings, 'SEARCH_INDEX_REFRESH_SECONDS', 300)
+        if refresh_seconds and not self._rebuilding and time.monotonic() - self._built_at > refresh_seconds:
+            with self._lock:
+                if self._rebuilding:
+                    return  # Another thread started it
+                self._rebuilding = True
+                self._pending = []  # Start recording changes before the rebuild reads the database
+            threading.Thread(target=self._background_rebuild, daemon=True).start()
+
+    def _background_rebuild(self):
+        try:
+            # Index into a separate instance, so searches keep using the old index meanwhile
+            fresh = PetSearchIndex()
+            fresh._load(*self._read())
+            with self._lock:
+                self.__dict__.update({key: value for key, value in fresh.__dict__.items()
+                                      if key not in ('_lock', '_build_lock', '_pending')})
+                self._replay_pending()
+        finally:
+            with self._lock:
+                self._pending = None
+                self._rebuilding = False
+
+    def reset(self):
+        """Drop the index; it is rebuilt from the database on the next search."""
+        with self._lock:
+            self._clear()
+            self._built = False
+
+    # ------------------------------ Incremental updates ------------------------------
+
+    def _index_pet(self, pet_id, shelter_id, fields):
+        terms = self._weighted_terms(fields, self.PET_FIELD_WEIGHTS)
+        for term, weight in terms.items():
+            self._pet_postings[term][weight].add(pet_id)
+            self._add_term(term)
+        self._pet_terms[pet_id] = terms
+        self._pet_shelter[pet_id] = shelter_id
+        self._shelter_pets[shelter_id].add(pet_id)
+
+    def _unindex_pet(self, pet_id):
+        for term, weight in self._pet_terms.pop(pet_id, {}).items():
+            postings = self._pet_postings[term]
+            postings[weight].discard(pet_id)
+            if not postings[weight]:
+                del postings[weight]
+            if not postings:
+                del self._pet_postings[term]
+            self._remove_term(term)
+        shelter_id = self._pet_shelter.pop(pet_id, None)
+        if shelter_id is not None:
+            self._shelter_pets[shelter_id].discard(pet_id)
+
+    def _index_shelter(self, shelter_id, fields):
+        terms = self._weighted_terms(fields, self.SHELTER_FIELD_WEIGHTS)
+        for term, weight in terms.items():
+            self._shelter_postings[term][shelter_id] = weight
+            self._add_term(term)
+        self._shelter_terms[shelter_id] = set(terms)
+
+    def _unindex_shelter(self, shelter_id):
+        for term in self._shelter_terms.pop(shelter_id, ()):
+            self._shelter_postings[term].pop(shelter_id, None)
+            if not self._shelter_postings[term]:
+                del self._shelter_postings[term]
+            self._remove_term(term)
+
+    def _reindex_pet(self, pet_id, shelter_id, fields):
+        self._unindex_pet(pet_id)
+        self._index_pet(pet_id, shelter_id, fields)
+
+    def _reindex_shelter(self, shelter_id, fields):
+        self._unindex_shelter(shelter_id)
+        self._index_shelter(shelter_id, fields)
+
+    def _drop_shelter(self, shelter_id):
+        self._unindex_shelter(shelter_id)
+        self._shelter_pets.pop(shelter_id, None)
+
+    def _apply(self, change, *args):
+        """Apply an incremental change, recording it if a build is running."""
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append((change, args))  # Replayed on the index being built
+            if not self._built:
+                return  # Nothing to keep up to date; the first search builds from the database
+            self._token_cache.clear()
+            change(*args)
+
+    def update_pet(self, pet):
+        """Add or re-index a pet (called from the Pet post_save signal)."""
+        self._apply(self._reindex_pet, pet.pk, pet.shelter_id_id,
+                    {'name': pet.name, 'pet_type': pet.pet_type, 'gender': pet.gender})
+
+    def remove_pet(self, pet_id):
+        """Remove a pet (called from the Pet post_delete signal)."""
+        self._apply(self._unindex_pet, pet_id)
+
+    def update_shelter(self, shelter):
+        """Add or re-index a shelter (called from the Shelter post_save signal)."""
+        self._apply(self._reindex_shelter, shelter.pk, {'name': shelter.name, 'address': shelter.address})
+
+    def remove_shelter(self, shelter_id):
+        """Remove a shelter (called from the Shelter post_delete signal)."""
+        self._apply(self._drop_shelter, shelter_id)
+
+    # ------------------------------ Searching ------------------------------
+
+    def _candidate_terms(self, token):
+        """Return {indexed term: match quality} for a query token."""
+        candidates = {}
+        if len(token) >= self.MIN_FUZZY_LENGTH:
+            for variant in _deletes(token):
+                for term in self._variants.get(variant, ()):
+                    candidates[term] = self.FUZZY
+        if len(token) >= self.MIN_PREFIX_LENGTH:
+            position = bisect.bisect_left(self._vocabulary, token)
+            for term in self._vocabulary[position:position + self.MAX_PREFIX_EXPANSIONS]:
+                if not term.startswith(token):
+                    break
+                candidates[term] = max(candidates.get(term, 0.0), self.PREFIX)
+        if token in self._term_refs:
+            candidates[token] = self.EXACT
+        return candidates
+
+    def _token_buckets(self, token):
+        """
+        Return the pets matching a single query token, grouped by score.
+
+        Returns:
+            dict: {score: set of pet_ids}, where each pet appears only under its best score.
+        """
+        if token in self._token_cache:
+            self._token_cache.move_to_end(token)
+            return self._token_cache[token]
+
+        groups = defaultdict(list)  # score -> list of pet_id sets
+        for term, quality in self._candidate_terms(token).items():
+            for weight, pet_ids in self._pet_postings.get(term, {}).items():
+                groups[weight * quality].append(pet_ids)
+            for shelter_id, weight in self._shelter_postings.get(term, {}).items():
+                groups[weight * quality].append(self._shelter_pets.get(shelter_id, ()))
+
+        # Work on whole sets rather than single pets so a term matching most of the catalogue stays cheap
+        buckets, seen = {}, set()
+        for score in sorted(groups, reverse=True):
+            pet_ids = set().union(*groups[score]) - seen
+            if pet_ids:
+                buckets[score] = pet_ids
+                seen |= pet_ids
+
+        self._token_cache[token] = buckets
+        if len(self._token_cache) > self.TOKEN_CACHE_SIZE:
+            self._token_cache.popitem(last=False)
+        return buckets
+
+    @staticmethod
+    def _combine(left, right):
+        """Intersect two {score: pet_ids} bucket maps, summing the scores of pets present in both."""
+        combined = defaultdict(set)
+        for left_score, left_ids in left.items():
+            for right_score, right_ids in right.items():
+                both = left_ids & right_ids
+                if both:
+                    combined[round(left_score + right_score, 6)] |= both
+        return combined
+
+    @staticmethod
+    def _top(buckets, count):
+        """Return the `count` best (pet_id, score) pairs, ties broken by ascending pet_id."""
+        top = []
+        for score in sorted(buckets, reverse=True):
+            if len(top) >= count:
+                break
+            top.extend((pet_id, score) for pet_id in heapq.nsmallest(count - len(top), buckets[score]))
+        return top
+
+    def search(self, query, limit=20, offset=0):
+        """
+        Search the index.
+
+        Every query term must match (exactly, as a prefix or with one typo) one of the pet's fields
+        or its shelter's fields. Results are ranked by the summed per-term scores.
+
+        Args:
+            query (str): The search text.
+            limit (int): Maximum number of results to return.
+            offset (int): Number of ranked results to skip.
+
+        Returns:
+            tuple: (total number of matches, list of (pet_id, score) for the requested page).
+        """
+        self.ensure_built()
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return 0, []
+
+        with self._lock:
+            per_token = [self._token_buckets(token) for token in tokens]
+
+        # Keep only pets matching every term; the number of distinct scores stays small,
+        # so this is a handful of set intersections rather than a loop over pets
+        buckets = per_token[0]
+        for token_buckets in per_token[1:]:
+            buckets = self._combine(buckets, token_buckets)
+
+        count = sum(len(pet_ids) for pet_ids in buckets.values())
+        return count, self._top(buckets, offset + limit)[offset:]
+
+pet_search_index = PetSearchIndex()
@@ -4,22 +4,139 @@ This module defines the serializers for the Adoptify Pet Finder application.
 It includes serializers for:
 - UserSerializer: Handles user registration and validation.
 - AdminUserSerializer: Handles admin user registration.
+- TokenObtainPairWithClaimsSerializer: Issues JWTs carrying the user's staff status.
 - ApplicationSerializer: Manages adoption applications.
 - PetSerializer: Handles pet-related operations.
 - ShelterSerializer: Manages shelter-related operations.
 - ShelterManagementSerializer: Handles shelter management by admin users.
 - DonationSerializer: Manages donations made by users to shelters.
 - FavouriteSerializer: Handles favorite pets for users.
+- ShelterStatsSerializer: Exposes the per-shelter dashboard counters.
 
 Each serializer ensures data validation and provides methods for creating or updating objects.
+
+Serializers used by list endpoints also declare the relations and columns they read through
+EagerLoadingMixin, so list views can load every row in a constant number of queries. The pet, shelter
+and application serializers accept a sparse fieldset (SparseFieldsMixin, ?fields= on their GET endpoints).
+Lists of pets reuse each row's cached representation (CachedPetListSerializer), so rebuilding a page
+after a write only serializes the rows that changed.
 """
 
 from django.contrib.auth.models import User
 from rest_framework import serializers
-
-from .models import Pet, Shelter, AdoptionApplication, UserProfile, ShelterManagement, Favourite, Donation
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+
+from .models import Pet, Shelter, AdoptionApplication, UserProfile, ShelterManagement, Favourite, Donation, ShelterStats
+from .images import variant_url
+from .metrics import serialization_timer
+from .authentication import STAFF_CLAIM
+from .services import open_application
+from .cache import pet_row_cache, pet_row_cache_key, pet_row_cache_timeout
 from django.db import models
 
+# -------------------------------------- Eager Loading -------------------------------------------
+
+class EagerLoadingMixin:
+    """
+    Lets a serializer declare the relations it reads so list views can avoid N+1 queries.
+
+    Attributes:
+        select_related_fields: Forward relations to join in the same query.
+        prefetch_related_fields: Reverse or many-to-many relations to load in one extra query each.
+        only_fields: Columns to load (including related columns); empty means load all columns.
+    """
+    select_related_fields = ()
+    prefetch_related_fields = ()
+    only_fields = ()
+
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """Apply the declared select_related/prefetch_related/only() to a queryset."""
+        if cls.select_related_fields:
+            queryset = queryset.select_related(*cls.select_related_fields)
+        if cls.prefetch_related_fields:
+            queryset = queryset.prefetch_related(*cls.prefetch_related_fields)
+        if cls.only_fields:
+            queryset = queryset.only(*cls.only_fields)
+        return queryset
+
+    def to_representation(self, instance):
+        with serialization_timer():  # Reported per endpoint at /metrics
+            return super().to_representation(instance)
+
+# -------------------------------------- Sparse Fieldsets -------------------------------------------
+
+class SparseFieldsMixin:
+    """
+    Lets clients of read endpoints ask for a subset of a serializer's fields (?fields=name,pet_type,image_thumb).
+
+    Views pass the requested names as the `fields` argument (see requested_fields); the other fields are
+    dropped before serialization, so they are neither computed (e.g. image URLs) nor sent.
+    """
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+    @classmethod
+    def requested_fields(cls, request):
+        """
+        Return the field names of a request's ?fields= parameter.
+
+        Returns:
+            list: The requested names, or None when the parameter is absent (all fields).
+
+        Raises:
+            ValidationError: If the parameter is empty or names a field the serializer does not have.
+        """
+        raw = request.GET.get('fields')
+        if raw is None:
+            return None
+        requested = [name.strip() for name in raw.split(',') if name.strip()]
+        unknown = [name for name in requested if name not in cls.Meta.fields]
+        if not requested or unknown:
+            raise serializers.ValidationError({
+                'error': f"Unknown field(s) in 'fields': {', '.join(unknown) or raw!r}. Available: {', '.join(cls.Meta.fields)}."
+            })
+        return requested
+
+# -------------------------------------- Row Cache -------------------------------------------
+
+class CachedPetListSerializer(serializers.ListSerializer):
+    """
+    Serializes a list of pets from the cache of serialized rows (see pet_row_cache_key in api/cache.py).
+
+    The rows are looked up with one get_many; only the misses (new or changed pets) are serialized, with
+    every field, and stored. A sparse fieldset is cut from the full rows, so all fieldsets share the
+    entries. Lists serialized for a request (absolute image URLs) are not cached.
+    """
+    def to_representation(self, data):
+        row_cache = pet_row_cache()
+        if row_cache is None or self.context.get('request') is not None:
+            return super().to_representation(data)
+
+        pets = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+        keys = [pet_row_cache_key(pet) for pet in pets]
+        cached = row_cache.get_many([key for key in keys if key])
+        full_serializer = None  # Every field, whatever was requested; built on the first miss
+        rows, missing = [], {}
+        for pet, key in zip(pets, keys):
+            row = cached.get(key)
+            if row is None:
+                full_serializer = full_serializer or type(self.child)(context=self.context)
+                row = full_serializer.to_representation(pet)
+                if key:
+                    missing[key] = row
+            rows.append(row)
+        if missing:
+            row_cache.set_many(missing, pet_row_cache_timeout())
+
+        names = list(self.child.fields)
+        if len(names) == len(self.child.Meta.fields):
+            return rows
+        return [{name: row[name] for name in names} for row in rows]
+
 # -------------------------------------- User Registration -------------------------------------------
 
 class UserSerializer(serializers.ModelSerializer):
@@ -69,6 +186,14 @@ class AdminUserSerializer(serializers.ModelSerializer):
         user = User.objects.create_user(**validated_data, is_staff=True, is_superuser=True)
         return user
 
+# Issues JWTs that also carry the user's staff status (checked by api.authentication.CachedJWTAuthentication)
+class TokenObtainPairWithClaimsSerializer(TokenObtainPairSerializer):
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        token[STAFF_CLAIM] = user.is_staff
+        return token
+
 # --------------------------------------- Adoption Application -------------------------------------------
 
 class AdopterUserSerializer(serializers.ModelSerializer):
@@ -82,11 +207,19 @@ class AdopterUserSerializer(serializers.ModelSerializer):
         user = User.objects.create_user(**validated_data)
         return user
 
-class ApplicationSerializer(serializers.ModelSerializer):
+class ApplicationSerializer(SparseFieldsMixin, EagerLoadingMixin, serializers.ModelSerializer):
     pet_id = serializers.PrimaryKeyRelatedField(queryset=Pet.objects.all())  # Reference the Pet model
     adopter_user = serializers.SerializerMethodField()  # Include adopter user details
     pet_name = serializers.CharField(source='pet.name', read_only=True)  # Include the pet's name
 
+    # Relations read by pet_name and get_adopter_user
+    select_related_fields = ('pet', 'adopter_user')
+    only_fields = (
+        'application_id', 'application_status', 'submission_date', 'message',
+        'pet', 'pet__name',
+        'adopter_user', 'adopter_user__first_name', 'adopter_user__last_name',
+    )
+
     class Meta:
         model = AdoptionApplication
         fields = ["application_id", "application_status", "submission_date", "pet_id", "adopter_user", "pet_name", "message"]
@@ -105,11 +238,17 @@ class ApplicationSerializer(serializers.ModelSerializer):
         return None
 
     def validate_pet_id(self, value):
-        # Ensure the pet is available for adoption
-        if value.adoption_status != "Available":
+        # Ensure the pet is available for adoption. The applicant's own open application holding it is let
+        # through, so a retried submission gets that application back (see submit_application)
+        if value.adoption_status != "Available" and not self._applicant_holds(value):
             raise serializers.ValidationError("This pet is not available for adoption.")
         return value
 
+    def _applicant_holds(self, pet):
+        request = self.context.get('request')
+        user = getattr(request, 'user', None)
+        return bool(user and user.is_authenticated) and open_application(pet, user) is not None
+
     def create(self, validated_data):
         # Extract the Pet object and replace it with its primary key
         pet = validated_data.pop('pet_id')
@@ -121,12 +260,22 @@ class ApplicationSerializer(serializers.ModelSerializer):
 
 # --------------------------------------- Pet Management -------------------------------------------
 
-class PetSerializer(serializers.ModelSerializer):
+class PetSerializer(SparseFieldsMixin, EagerLoadingMixin, serializers.ModelSerializer):
     shelter_name = serializers.CharField(source='shelter_id.name', read_only=True)  # Include the shelter's name
+    image_thumb = serializers.SerializerMethodField()  # Resized WebP thumbnail (None until generated)
+    image_medium = serializers.SerializerMethodField()  # Resized WebP medium image (None until generated)
+
+    # Relation read by shelter_name
+    select_related_fields = ('shelter_id',)
+    only_fields = (
+        'pet_id', 'age', 'gender', 'domesticated', 'name', 'adoption_status', 'pet_type', 'image', 'variants_image', 'updated_at',
+        'shelter_id', 'shelter_id__name', 'shelter_id__updated_at',  # updated_at keys the row cache
+    )
 
     class Meta:
         model = Pet
-        fields = ['pet_id', 'age', 'gender', 'domesticated', 'name', 'adoption_status', 'pet_type', 'shelter_id', 'shelter_name', 'image']
+        list_serializer_class = CachedPetListSerializer  # Lists reuse cached rows
+        fields = ['pet_id', 'age', 'gender', 'domesticated', 'name', 'adoption_status', 'pet_type', 'shelter_id', 'shelter_name', 'image', 'image_thumb', 'image_medium']
         extra_kwargs = {
             'pet_id': {'read_only': True},  # Make pet_id read-only
             'adoption_status': {'required': True},  # Ensure adoption_status is required
@@ -135,6 +284,20 @@ class PetSerializer(serializers.ModelSerializer):
             'image': {'required': False},  # Make image optional
         }
 
+    def get_image_thumb(self, obj):
+        return self._variant_url(obj, 'thumb')
+
+    def get_image_medium(self, obj):
+        return self._variant_url(obj, 'medium')
+
+    def _variant_url(self, obj, variant):
+        # Build the URL the same way the image field does (absolute when a request is available)
+        url = variant_url(obj, variant)
+        request = self.context.get('request')
+        if url and request is not None:
+            return request.build_absolute_uri(url)
+        return url
+
     def validate_shelter_id(self, value):
         # Validate that the shelter exists
         if not Shelter.objects.filter(pk=value.pk).exists():
@@ -176,12 +339,23 @@ class PetSerializer(serializers.ModelSerializer):
 
 # --------------------------------------- Shelter Management -------------------------------------------
 
-class ShelterSerializer(serializers.ModelSerializer):
+class ShelterSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Shelter
-        fields = ['shelter_id', 'name', 'address', 'phone_number', 'website_url']
+        fields = ['shelter_id', 'name', 'address', 'phone_number', 'website_url', 'latitude', 'longitude']
         extra_kwargs = {'shelter_id': {'read_only': True}}  # Make shelter_id read-only
 
+    def validate(self, attrs):
+        if ('latitude' in attrs) != ('longitude' in attrs):
+            raise serializers.ValidationError("Send latitude and longitude together.")
+        return attrs
+
+    def update(self, instance, validated_data):
+        # A new address without new coordinates is geocoded again (see the Shelter pre_save handler)
+        if 'address' in validated_data and 'latitude' not in validated_data:
+            validated_data.update(latitude=None, longitude=None)
+        return super().update(instance, validated_data)
+
     def create(self, validated_data):
         # Create a new Shelter object
         shelter = Shelter.objects.create(**validated_data)
@@ -196,6 +370,14 @@ class ShelterSerializer(serializers.ModelSerializer):
 
         return shelter
 
+class ShelterStatsSerializer(serializers.ModelSerializer):
+    shelter_id = serializers.IntegerField(read_only=True)  # The shelter's primary key
+    shelter_name = serializers.CharField(source='shelter.name', read_only=True)  # Include the shelter's name
+
+    class Meta:
+        model = ShelterStats
+        fields = ['shelter_id', 'shelter_name', 'available_pets', 'pending_pets', 'adopted_pets', 'open_applications', 'favourites', 'donation_total']
+
 class ShelterManagementSerializer(serializers.ModelSerializer):
     admin_user = serializers.HiddenField(default=serializers.CurrentUserDefault())  # Automatically set the current user
     shelter_id = serializers.PrimaryKeyRelatedField(queryset=Shelter.objects.all())  # Reference the Shelter model
@@ -228,9 +410,13 @@ class DonationSerializer(serializers.ModelSerializer):
 
 # --------------------------------------- Favourite Management -------------------------------------------
 
-class FavouriteSerializer(serializers.ModelSerializer):
+class FavouriteSerializer(EagerLoadingMixin, serializers.ModelSerializer):
     pet = PetSerializer(read_only=True)  # Include pet information using PetSerializer
 
+    # The nested PetSerializer reads the pet and its shelter
+    select_related_fields = ('pet',) + tuple(f'pet__{field}' for field in PetSerializer.select_related_fields)
+    only_fields = ('id', 'adopter_user', 'pet') + tuple(f'pet__{field}' for field in PetSerializer.only_fields)
+
     class Meta:
         model = Favourite
         fields = ['id', 'pet', 'adopter_user_id']
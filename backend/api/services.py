@@ -0,0 +1,260 @@
+"""
+This module contains the transactional services behind the Adoptify Pet Finder write paths.
+
+It includes:
+- submit_application: Creates an adoption application and claims the pet, so only one applicant can win.
+  Resubmitting returns the adopter's open application for the pet.
+- open_application: Returns a user's open application for a pet.
+- review_application: Applies an admin decision to an application and updates the pet and
+  competing applications in the same transaction.
+- review_applications: Applies a batch of admin decisions with a few bulk UPDATEs in one transaction.
+
+Both services lock the pet row (SELECT ... FOR UPDATE) before changing its adoption status. The
+pet is claimed with a conditional UPDATE (only if still "Available"), so two concurrent applicants
+cannot both succeed even on databases that ignore row locks (e.g. SQLite).
+
+Policy: a pet has at most one open application. The first applicant claims it ("Pending") and later
+applicants are refused until an admin rejects that application and the pet is "Available" again;
+applicants do not queue. Competing open applications therefore only exist when an admin moves a rejected
+application back to "Pending" (or in data from before this policy), which is what the auto-rejection
+on approval cleans up. Moving an application back to "Pending" puts the pet back to "Pending" too (also
+when it leaves "Approved"), so rejecting it later releases the pet; applications auto-rejected by the
+approval stay rejected.
+"""
+
+from collections import Counter, defaultdict
+
+from django.db import IntegrityError, transaction
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from .models import AdoptionApplication, Pet, OPEN_APPLICATION_STATUSES
+from .stats import OPEN_APPLICATION_STATUS, record_status_change, record_status_changes
+
+APPLICATION_STATUSES = ('Pending', 'Approved', 'Rejected')
+
+# --------------------------------------- Adoption Workflow -------------------------------------------
+
+def submit_application(serializer, adopter):
+    """
+    Create an adoption application and mark the pet as "Pending".
+
+    A retried submission is a no-op: if the adopter already has an open application for the pet, that
+    application is returned instead of an error.
+
+    Args:
+        serializer (ApplicationSerializer): A validated application serializer.
+        adopter (User): The user applying.
+
+    Returns:
+        tuple: (the application, whether it was created).
+
+    Raises:
+        ValidationError: If another application claimed the pet first.
+    """
+    pet = serializer.validated_data['pet_id']
+    with transaction.atomic():
+        # Lock the pet row so competing applications for the same pet queue up behind this one
+        pet = Pet.objects.select_for_update().get(pk=pet.pk)
+
+        # Claim the pet only if it is still available; the losing applicant updates zero rows
+        # (update() skips auto_now, so updated_at is set explicitly)
+        claimed = Pet.objects.filter(pk=pet.pk, adoption_status='Available').update(adoption_status='Pending', updated_at=timezone.now())
+        if not claimed:
+            existing = open_application(pet, adopter)
+            if existing is not None:
+                return existing, False
+            raise ValidationError({'pet_id': ["This pet is not available for adoption."]})
+
+        try:
+            application = serializer.save(adopter_user=adopter)
+        except IntegrityError:
+            # unique_open_application: the pet was made available again while this adopter's application
+            # was still open (raising rolls the claim back)
+            raise ValidationError({'pet_id': ["You already have an open application for this pet."]})
+        record_status_change(pet.shelter_id_id, 'Available', 'Pending', opened=1)  # Dashboard counters
+        return application, True
+
+def open_application(pet, adopter):
+    """Return the adopter's open (Pending or Approved) application for a pet, or None."""
+    return AdoptionApplication.objects.filter(pet=pet, adopter_user=adopter, application_status__in=OPEN_APPLICATION_STATUSES).first()
+
+def review_application(pk, new_status):
+    """
+    Apply an admin decision to an adoption application.
+
+    - Approved: the pet becomes "Adopted" and every other pending application for it is rejected
+      in a single bulk UPDATE.
+    - Rejected: the pet becomes "Available" again unless another open application still holds it.
+    - Pending: the application holds the pet again, so the pet becomes "Pending" (an approval is undone).
+
+    Args:
+        pk (int): The application id.
+        new_status (str): One of "Pending", "Approved" or "Rejected".
+
+    Returns:
+        tuple: (the updated application, the number of competing applications auto-rejected).
+
+    Raises:
+        Http404: If the application does not exist.
+        ValidationError: If the pet was already adopted through another application, or reopening the
+            application would give the adopter two open applications for the pet.
+    """
+    with transaction.atomic():
+        # Lock the application and its pet in one query
+        application = get_object_or_404(
+            AdoptionApplication.objects.select_related('pet').select_for_update(), pk=pk
+        )
+        pet = application.pet
+        old_pet_status, old_application_status = pet.adoption_status, application.application_status
+        siblings = AdoptionApplication.objects.filter(pet=pet).exclude(pk=application.pk)
+        auto_rejected = 0
+
+        if new_status == 'Approved':
+            if pet.adoption_status == 'Adopted' and application.application_status != 'Approved':
+                raise ValidationError({'application_status': ["This pet has already been adopted."]})
+            pet.adoption_status = 'Adopted'
+            auto_rejected = siblings.filter(application_status='Pending').update(application_status='Rejected', updated_at=timezone.now())
+        elif new_status == 'Rejected':
+            if not siblings.filter(application_status__in=OPEN_APPLICATION_STATUSES).exists():
+                pet.adoption_status = 'Available'
+        elif new_status == 'Pending':
+            if pet.adoption_status == 'Adopted' and application.application_status != 'Approved':
+                raise ValidationError({'application_status': ["This pet has already been adopted."]})
+            if (application.application_status not in OPEN_APPLICATION_STATUSES and siblings.filter(
+                    adopter_user=application.adopter_user_id, application_status__in=OPEN_APPLICATION_STATUSES).exists()):
+                # Checked here so unique_open_application does not fail the save
+                raise ValidationError({'application_status': ["This adopter already has an open application for this pet."]})
+            pet.adoption_status = 'Pending'
+
+        application.application_status = new_status
+        # auto_now only writes updated_at when it is listed (ETags and cached pet rows read it)
+        application.save(update_fields=['application_status', 'updated_at'])
+        pet.save(update_fields=['adoption_status', 'updated_at'])
+
+        # Dashboard counters: pet status plus every application that entered or left "Pending"
+        record_status_change(
+            pet.shelter_id_id, old_pet_status, pet.adoption_status,
+            opened=int(new_status == OPEN_APPLICATION_STATUS),
+            closed=int(old_application_status == OPEN_APPLICATION_STATUS) + auto_rejected,
+        )
+
+    return application, auto_rejected
+
+def review_applications(decisions):
+    """
+    Apply many admin decisions at once, with the same rules as review_application.
+
+    Applications are updated with one UPDATE per status and pets with one UPDATE per status. For every
+    approved pet, its other applications still pending after the batch are rejected in one more UPDATE.
+
+    Args:
+        decisions (dict): Application id -> new status ("Pending", "Approved" or "Rejected").
+
+    Returns:
+        tuple: (the ids of the pets whose applications were reviewed, the number of applications
+            auto-rejected, the ids of the shelters affected).
+
+    Raises:
+        ValidationError: If an application does not exist, two applications for the same pet are
+            approved, a pet approved in the batch has another application moved to "Pending", a pet
+            approved or reopened was already adopted through another application, or an adopter would
+            be left with two open applications for one pet.
+    """
+    with transaction.atomic():
+        # Lock the applications, then their pets, in primary key order (same order for every batch)
+        applications = list(
+            AdoptionApplication.objects.select_for_update().filter(pk__in=decisions).order_by('pk')
+            .only('application_id', 'application_status', 'pet', 'adopter_user')
+        )
+        missing = set(decisions) - {application.pk for application in applications}
+        if missing:
+            raise ValidationError({'application_id': [f"Application {pk} does not exist." for pk in sorted(missing)]})
+        pets = Pet.objects.select_for_update().in_bulk({application.pet_id for application in applications})
+
+        approved = {}  # pet id -> approved application id
+        errors = []
+        for application in applications:
+            if decisions[application.pk] != 'Approved':
+                continue
+            pet = pets[application.pet_id]
+            if application.pet_id in approved:
+                errors.append(f"Applications {approved[application.pet_id]} and {application.pk} approve the same pet.")
+            elif pet.adoption_status == 'Adopted' and application.application_status != 'Approved':
+                errors.append(f"Application {application.pk}: this pet has already been adopted.")
+            approved[application.pet_id] = application.pk
+        for application in applications:
+            if decisions[application.pk] != 'Pending':
+                continue
+            if application.pet_id in approved:
+                errors.append(f"Application {application.pk}: its pet is approved by application {approved[application.pet_id]}.")
+            elif pets[application.pet_id].adoption_status == 'Adopted' and application.application_status != 'Approved':
+                errors.append(f"Application {application.pk}: this pet has already been adopted.")
+
+        # Reopened applications must not leave an adopter with two open applications for one pet
+        # (unique_open_application); pending ones of approved pets are auto-rejected first, so they do not count
+        reopened = [application for application in applications
+                    if decisions[application.pk] in OPEN_APPLICATION_STATUSES and application.application_status not in OPEN_APPLICATION_STATUSES]
+        if reopened:
+            holders = Counter((application.pet_id, application.adopter_user_id) for application in applications
+                              if decisions[application.pk] in OPEN_APPLICATION_STATUSES)
+            others = AdoptionApplication.objects.filter(
+                pet_id__in={application.pet_id for application in reopened},
+                adopter_user_id__in={application.adopter_user_id for application in reopened},
+                application_status__in=OPEN_APPLICATION_STATUSES,
+            ).exclude(pk__in=decisions)
+            for pet_id, adopter_id, application_status in others.values_list('pet_id', 'adopter_user_id', 'application_status'):
+                if not (pet_id in approved and application_status == 'Pending'):
+                    holders[(pet_id, adopter_id)] += 1
+            errors += [f"Application {application.pk}: this adopter already has an open application for this pet."
+                       for application in reopened if holders[(application.pet_id, application.adopter_user_id)] > 1]
+        if errors:
+            raise ValidationError({'application_status': errors})
+
+        # Applications that enter or leave "Pending", per pet, for the dashboard counters
+        opened, closed = defaultdict(int), defaultdict(int)
+        by_status = defaultdict(list)
+        for application in applications:
+            new_status = decisions[application.pk]
+            by_status[new_status].append(application.pk)
+            opened[application.pet_id] += int(new_status == OPEN_APPLICATION_STATUS and application.application_status != OPEN_APPLICATION_STATUS)
+            closed[application.pet_id] += int(application.application_status == OPEN_APPLICATION_STATUS and new_status != OPEN_APPLICATION_STATUS)
+
+        now = timezone.now()  # update() skips auto_now, so updated_at is set explicitly
+        auto_rejected = 0
+        if approved:
+            # Before the batch's own updates, so an approval never meets its adopter's other open application
+            competing = AdoptionApplication.objects.filter(pet_id__in=approved, application_status='Pending').exclude(pk__in=decisions)
+            for pet_id in competing.values_list('pet_id', flat=True):
+                closed[pet_id] += 1
+            auto_rejected = competing.update(application_status='Rejected', updated_at=now)
+
+        # Closing statuses first, so an application reopened in the same batch as its adopter's other one is
+        # closed never overlaps it
+        for new_status in sorted(by_status, key=lambda new_status: new_status in OPEN_APPLICATION_STATUSES):
+            AdoptionApplication.objects.filter(pk__in=by_status[new_status]).update(application_status=new_status, updated_at=now)
+
+        # Rejected pets are released unless another application still holds them
+        rejected_pets = {application.pet_id for application in applications if decisions[application.pk] == 'Rejected'} - set(approved)
+        held = set(
+            AdoptionApplication.objects.filter(pet_id__in=rejected_pets, application_status__in=OPEN_APPLICATION_STATUSES)
+            .values_list('pet_id', flat=True)
+        ) if rejected_pets else set()
+        new_pet_statuses = {pet_id: 'Adopted' for pet_id in approved}
+        new_pet_statuses.update((pet_id, 'Available') for pet_id in rejected_pets - held)
+        # Reopened applications hold their pets again (an approval moved back to "Pending" is undone)
+        new_pet_statuses.update((application.pet_id, 'Pending') for application in applications if decisions[application.pk] == 'Pending')
+
+        pets_by_status = defaultdict(list)
+        for pet_id, new_status in new_pet_statuses.items():
+            pets_by_status[new_status].append(pet_id)
+        for new_status, ids in pets_by_status.items():
+            Pet.objects.filter(pk__in=ids).update(adoption_status=new_status, updated_at=now)
+
+        record_status_changes(
+            (pet.shelter_id_id, pet.adoption_status, new_pet_statuses.get(pet.pk, pet.adoption_status), opened[pet.pk], closed[pet.pk])
+            for pet in pets.values()
+        )
+
+    return set(pets), auto_rejected, {pet.shelter_id_id for pet in pets.values()}
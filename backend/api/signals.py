@@ -0,0 +1,66 @@
+"""
+This module contains the model signal handlers for the Adoptify Pet Finder application.
+
+It includes handlers that:
+- Keep the in-process pet search index (api/search.py) up to date whenever a Pet or Shelter is saved or deleted.
+- Drop a User from the authentication cache (api/authentication.py) whenever it is saved or deleted.
+- Geocode shelters saved without coordinates and keep the shelter location index (api/geo.py) up to date.
+- Add the request metrics query counter (api/metrics.py) to every new database connection.
+
+The handlers are connected when the app is ready (see api/apps.py).
+"""
+
+from django.db.backends.signals import connection_created
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.contrib.auth.models import User
+from django.dispatch import receiver
+
+from .models import Pet, Shelter
+from .search import pet_search_index
+from .geo import geocode, shelter_location_index
+from .authentication import user_cache
+from .metrics import install_query_counter
+
+# --------------------------------------- Search Index -------------------------------------------
+
+@receiver(post_save, sender=Pet)
+def index_pet(sender, instance, **kwargs):
+    pet_search_index.update_pet(instance)
+
+@receiver(post_delete, sender=Pet)
+def unindex_pet(sender, instance, **kwargs):
+    pet_search_index.remove_pet(instance.pk)
+
+@receiver(post_save, sender=Shelter)
+def index_shelter(sender, instance, **kwargs):
+    pet_search_index.update_shelter(instance)
+
+@receiver(post_delete, sender=Shelter)
+def unindex_shelter(sender, instance, **kwargs):
+    pet_search_index.remove_shelter(instance.pk)
+
+# --------------------------------------- Shelter Locations -------------------------------------------
+
+@receiver(pre_save, sender=Shelter)
+def geocode_shelter(sender, instance, **kwargs):
+    if instance.latitude is None and instance.longitude is None:
+        instance.latitude, instance.longitude = geocode(instance.address) or (None, None)
+
+@receiver(post_save, sender=Shelter)
+def locate_shelter(sender, instance, **kwargs):
+    shelter_location_index.update_shelter(instance)
+
+@receiver(post_delete, sender=Shelter)
+def unlocate_shelter(sender, instance, **kwargs):
+    shelter_location_index.remove_shelter(instance.pk)
+
+# --------------------------------------- Authentication Cache -------------------------------------------
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    user_cache.invalidate(instance.pk)  # Also covers deactivation and staff changes
+
+# --------------------------------------- Request Metrics -------------------------------------------
+
+connection_created.connect(install_query_counter, dispatch_uid='api.metrics.install_query_counter')
@@ -0,0 +1,110 @@
+"""
+This module measures what a fresh backend process spends before it can serve its first request.
+
+It includes:
+- STAGES: The startup steps timed in order (settings import, django.setup(), URLconf import, WSGI handler).
+- parse_importtime: Parses the `python -X importtime` report into (module, self µs, cumulative µs, depth) rows.
+- profile_startup: Starts fresh interpreters with `-X importtime`, times every stage and attributes each
+  imported module to the stage that imported it.
+
+Every run is a new interpreter (a cold start, like a new gunicorn worker or an autoscaled container),
+using the DJANGO_SETTINGS_MODULE of the calling process. See the profile_startup management command.
+"""
+
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+from dataclasses import dataclass, field
+
+from django.conf import settings
+
+STAGES = ('settings', 'django.setup', 'urlconf', 'wsgi handler')
+
+# Runs in the child interpreter: marks each stage on stderr (interleaved with the importtime lines)
+# and prints the stage durations as JSON on stdout
+_PROBE = """
+import importlib, json, os, sys, time
+durations = {}
+def stage(name, run):
+    sys.stderr.write('stage: ' + name + '\\n'); sys.stderr.flush()
+    started = time.perf_counter()
+    run()
+    durations[name] = (time.perf_counter() - started) * 1000
+def django_setup():
+    import django
+    django.setup()
+def urlconf():
+    from django.conf import settings
+    importlib.import_module(settings.ROOT_URLCONF)
+def wsgi_handler():
+    from django.core.handlers.wsgi import WSGIHandler
+    WSGIHandler()  # Imports and instantiates the middleware
+stage('settings', lambda: importlib.import_module(os.environ['DJANGO_SETTINGS_MODULE']))
+stage('django.setup', django_setup)
+stage('urlconf', urlconf)
+stage('wsgi handler', wsgi_handler)
+print(json.dumps(durations))
+"""
+
+_IMPORT_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+@dataclass
+class StartupProfile:
+    runs: int
+    stages: dict  # Stage -> median duration in ms
+    modules: list = field(default_factory=list)  # (stage, module, self ms, cumulative ms) of the last run
+
+    def by_package(self, stage=None):
+        """Total self time (ms) per top-level package, slowest first."""
+        totals = {}
+        for module_stage, module, self_ms, _ in self.modules:
+            if stage is None or module_stage == stage:
+                package = module.split('.')[0]
+                totals[package] = totals.get(package, 0) + self_ms
+        return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+def parse_importtime(report):
+    """
+    Parse a `python -X importtime` report, keeping the "stage: <name>" markers of the probe.
+
+    Returns:
+        list: (stage, module, self µs, cumulative µs, depth) per imported module, in report order.
+    """
+    rows, stage = [], None
+    for line in report.splitlines():
+        if line.startswith('stage: '):
+            stage = line[len('stage: '):]
+            continue
+        match = _IMPORT_LINE.match(line)
+        if match:  # The header ("self [us] | cumulative | imported package") does not match
+            self_us, cumulative_us, indent, module = match.groups()
+            rows.append((stage, module, int(self_us), int(cumulative_us), len(indent) // 2))
+    return rows
+
+def profile_startup(runs=3):
+    """
+    Time the startup stages of fresh interpreters.
+
+    Args:
+        runs (int): Interpreters to start; stage durations are the median of the runs (the first run
+            also pays for writing .pyc files and a cold OS file cache).
+
+    Returns:
+        StartupProfile: Median stage durations and the imported modules of the last run.
+    """
+    env = {**os.environ, 'DJANGO_SETTINGS_MODULE': os.environ.get('DJANGO_SETTINGS_MODULE', settings.SETTINGS_MODULE)}
+    durations, rows = {name: [] for name in STAGES}, []
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, '-X', 'importtime', '-c', _PROBE], cwd=settings.BASE_DIR, env=env,
+                                capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"The startup probe failed:\n{result.stderr[-2000:]}")
+        for name, duration in json.loads(result.stdout.strip().splitlines()[-1]).items():
+            durations[name].append(duration)
+        rows = parse_importtime(result.stderr)
+
+    modules = [(stage, module, self_us / 1000, cumulative_us / 1000) for stage, module, self_us, cumulative_us, _ in rows if stage]
+    return StartupProfile(runs=runs, stages={name: statistics.median(values) for name, values in durations.items()}, modules=modules)
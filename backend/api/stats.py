@@ -0,0 +1,120 @@
+"""
+This module maintains the denormalized per-shelter counters in ShelterStats.
+
+It includes:
+- record_pet_added / record_pet_changed / record_pet_deleted: Pet counters by adoption status.
+- record_status_change: Pet status and open (pending) application counters in a single update.
+- record_status_changes: Many status changes, aggregated into one update per shelter.
+- rebuild_shelter_stats: Recomputes every shelter's counters from the source tables.
+
+Favourite and donation counters are adjusted by Favourite.addPetToFavourites/removePetFromFavourites
+and Donation.recordDonation. Every adjustment is an F() expression, so concurrent writers never
+lose updates and the dashboard reads one row per shelter.
+"""
+
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Count, Sum
+
+from .models import AdoptionApplication, Donation, Favourite, Pet, Shelter, ShelterStats
+
+# Pet adoption status -> ShelterStats counter
+PET_STATUS_FIELDS = {
+    'Available': 'available_pets',
+    'Pending': 'pending_pets',
+    'Adopted': 'adopted_pets',
+}
+OPEN_APPLICATION_STATUS = 'Pending'
+
+# --------------------------------------- Pets -------------------------------------------
+
+def record_pet_added(shelter_id, adoption_status, count=1):
+    """Count new pet(s) in a shelter."""
+    ShelterStats.adjust(shelter_id, **{PET_STATUS_FIELDS[adoption_status]: count})
+
+def record_pets_added(pets):
+    """Count a batch of new pets (e.g. from a bulk import) with one update per shelter and status."""
+    for (shelter_id, adoption_status), count in Counter((pet.shelter_id_id, pet.adoption_status) for pet in pets).items():
+        record_pet_added(shelter_id, adoption_status, count)
+
+def record_pet_changed(pet, old_shelter_id, old_status):
+    """Move a pet's counts after its adoption status and/or shelter changed."""
+    if old_shelter_id == pet.shelter_id_id:
+        record_status_change(pet.shelter_id_id, old_status, pet.adoption_status)
+        return
+
+    # The pet moved to another shelter; its favourites and open applications move with it
+    favourites = Favourite.objects.filter(pet=pet).count()
+    open_applications = AdoptionApplication.objects.filter(pet=pet, application_status=OPEN_APPLICATION_STATUS).count()
+    ShelterStats.adjust(old_shelter_id, **{PET_STATUS_FIELDS[old_status]: -1}, favourites=-favourites, open_applications=-open_applications)
+    ShelterStats.adjust(pet.shelter_id_id, **{PET_STATUS_FIELDS[pet.adoption_status]: 1}, favourites=favourites, open_applications=open_applications)
+
+def record_pet_deleted(pet):
+    """Remove a pet's counts, including the favourites and open applications deleted with it. Call before deleting."""
+    favourites = Favourite.objects.filter(pet=pet).count()
+    open_applications = AdoptionApplication.objects.filter(pet=pet, application_status=OPEN_APPLICATION_STATUS).count()
+    ShelterStats.adjust(pet.shelter_id_id, **{PET_STATUS_FIELDS[pet.adoption_status]: -1}, favourites=-favourites, open_applications=-open_applications)
+
+# --------------------------------------- Applications -------------------------------------------
+
+def record_status_change(shelter_id, old_pet_status=None, new_pet_status=None, opened=0, closed=0):
+    """
+    Apply a pet status change and/or application changes to a shelter's counters in one update.
+
+    Args:
+        shelter_id (int): The shelter of the pet.
+        old_pet_status (str, optional): The pet's previous adoption status.
+        new_pet_status (str, optional): The pet's new adoption status.
+        opened (int): Applications that became pending.
+        closed (int): Applications that stopped being pending.
+    """
+    ShelterStats.adjust(shelter_id, **_status_deltas(old_pet_status, new_pet_status, opened, closed))
+
+def record_status_changes(changes):
+    """
+    Apply many record_status_change calls with one update per shelter (e.g. after a bulk review).
+
+    Args:
+        changes (iterable): (shelter_id, old_pet_status, new_pet_status, opened, closed) tuples.
+    """
+    per_shelter = {}
+    for shelter_id, *change in changes:
+        per_shelter.setdefault(shelter_id, Counter()).update(_status_deltas(*change))
+    for shelter_id, deltas in per_shelter.items():
+        ShelterStats.adjust(shelter_id, **deltas)
+
+def _status_deltas(old_pet_status, new_pet_status, opened, closed):
+    deltas = Counter()
+    if old_pet_status:
+        deltas[PET_STATUS_FIELDS[old_pet_status]] -= 1
+    if new_pet_status:
+        deltas[PET_STATUS_FIELDS[new_pet_status]] += 1
+    deltas['open_applications'] += opened - closed
+    return deltas
+
+# --------------------------------------- Rebuild -------------------------------------------
+
+def rebuild_shelter_stats():
+    """
+    Recompute every shelter's counters from Pet, AdoptionApplication, Favourite and Donation.
+
+    Returns:
+        int: The number of shelters rebuilt.
+    """
+    stats = {shelter_id: ShelterStats(shelter_id=shelter_id) for shelter_id in Shelter.objects.values_list('shelter_id', flat=True)}
+
+    for row in Pet.objects.values('shelter_id', 'adoption_status').annotate(total=Count('pet_id')).order_by():
+        setattr(stats[row['shelter_id']], PET_STATUS_FIELDS[row['adoption_status']], row['total'])
+    for row in (AdoptionApplication.objects.filter(application_status=OPEN_APPLICATION_STATUS)
+                .values('pet__shelter_id').annotate(total=Count('application_id')).order_by()):
+        stats[row['pet__shelter_id']].open_applications = row['total']
+    for row in Favourite.objects.values('pet__shelter_id').annotate(total=Count('id')).order_by():
+        stats[row['pet__shelter_id']].favourites = row['total']
+    for row in Donation.objects.values('shelter_id').annotate(total=Sum('amount')).order_by():
+        stats[row['shelter_id']].donation_total = row['total'] or 0
+
+    with transaction.atomic():
+        ShelterStats.objects.all().delete()
+        ShelterStats.objects.bulk_create(stats.values(), batch_size=1000)
+    return len(stats)
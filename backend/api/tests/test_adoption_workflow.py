@@ -0,0 +1,358 @@
+import json
+import subprocess
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from django.contrib.auth.models import User
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, TransactionTestCase, skipUnlessDBFeature
+from django.test.utils import CaptureQueriesContext
+from api.models import Pet, Shelter, AdoptionApplication, ShelterStats
+from api.stats import rebuild_shelter_stats
+
+def create_pet(shelter, **kwargs):
+    fields = dict(name="Buddy", age=2, gender="Male", domesticated=True, pet_type="Dog",
+                  adoption_status="Available", shelter_id=shelter)
+    fields.update(kwargs)
+    return Pet.objects.create(**fields)
+
+class TestAdoptionWorkflow(APITestCase):
+    def setUp(self):
+        cache.clear()  # Start every test with an empty pet listing cache
+
+        self.admin_user = User.objects.create_superuser(username="admin", password="admin123")
+        self.shelter = Shelter.objects.create(name="Happy Tails Shelter", address="123 Shelter Ave")
+        self.pet = create_pet(self.shelter, adoption_status="Pending")
+
+    def create_applications(self, count):
+        applications = []
+        for i in range(count):
+            user = User.objects.create(username=f"user{self.pet.pet_id}-{i}")
+            applications.append(AdoptionApplication.objects.create(pet=self.pet, adopter_user=user))
+        return applications
+
+    def update_status(self, application, new_status):
+        self.client.force_authenticate(user=self.admin_user)
+        return self.client.patch(f"/api/adoption-application/{application.application_id}/update-status/",
+                                 {"application_status": new_status}, format="json")
+
+    def test_approval_rejects_competing_applications(self):
+        winner, *others = self.create_applications(3)
+        response = self.update_status(winner, "Approved")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["auto_rejected"], 2)
+        self.pet.refresh_from_db()
+        self.assertEqual(self.pet.adoption_status, "Adopted")
+        self.assertEqual(
+            sorted(AdoptionApplication.objects.values_list("application_status", flat=True)),
+            ["Approved", "Rejected", "Rejected"],
+        )
+
+    def test_approval_query_count_does_not_grow_with_competitors(self):
+        # SELECT ... FOR UPDATE, bulk reject, application update, pet update, stats update (+ savepoint pair),
+        # then the adopter and shelter for the serialized response
+        for count in (2, 20):
+            self.pet = create_pet(self.shelter, adoption_status="Pending")
+            winner = self.create_applications(count)[0]
+            rebuild_shelter_stats()  # Fixtures bypass the write paths, so seed the counters
+            self.client.force_authenticate(user=self.admin_user)
+            with self.assertNumQueries(9):
+                self.update_status(winner, "Approved")
+
+    def test_cannot_approve_second_application_for_adopted_pet(self):
+        first, second = self.create_applications(2)
+        self.update_status(first, "Approved")
+        AdoptionApplication.objects.filter(pk=second.pk).update(application_status="Pending")
+
+        response = self.update_status(second, "Approved")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_second_applicant_loses(self):
+        pet = create_pet(self.shelter, name="Max")
+        responses = []
+        for i in range(2):
+            self.client.force_authenticate(user=User.objects.create(username=f"applicant{i}"))
+            responses.append(self.client.post("/api/adoption-application/", {"pet_id": pet.pet_id}, format="json"))
+
+        self.assertEqual([response.status_code for response in responses], [status.HTTP_201_CREATED, status.HTTP_400_BAD_REQUEST])
+        self.assertEqual(AdoptionApplication.objects.filter(pet=pet).count(), 1)
+
+    def test_rejection_releases_pet_only_without_other_open_applications(self):
+        first, second = self.create_applications(2)
+        self.update_status(first, "Rejected")
+        self.pet.refresh_from_db()
+        self.assertEqual(self.pet.adoption_status, "Pending")
+
+        self.update_status(second, "Rejected")
+        self.pet.refresh_from_db()
+        self.assertEqual(self.pet.adoption_status, "Available")
+
+    def test_status_update_returns_application_and_pet(self):
+        winner, loser = self.create_applications(2)
+        response = self.update_status(winner, "Approved")
+        self.assertEqual(response.data["application"]["application_id"], winner.application_id)
+        self.assertEqual(response.data["application"]["application_status"], "Approved")
+        self.assertEqual(response.data["pet"]["pet_id"], self.pet.pet_id)
+        self.assertEqual(response.data["pet"]["adoption_status"], "Adopted")
+
+    def test_moving_approval_back_to_pending_undoes_adoption(self):
+        winner, loser = self.create_applications(2)
+        self.update_status(winner, "Approved")
+
+        response = self.update_status(winner, "Pending")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.pet.refresh_from_db()
+        self.assertEqual(self.pet.adoption_status, "Pending")
+        loser.refresh_from_db()
+        self.assertEqual(loser.application_status, "Rejected")  # Auto-rejected applications stay rejected
+
+        self.update_status(winner, "Rejected")
+        self.pet.refresh_from_db()
+        self.assertEqual(self.pet.adoption_status, "Available")
+
+    def test_cannot_reopen_application_for_adopted_pet(self):
+        winner, loser = self.create_applications(2)
+        self.update_status(winner, "Approved")
+        self.assertEqual(self.update_status(loser, "Pending").status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_cannot_reopen_second_open_application_of_adopter(self):
+        (first,) = self.create_applications(1)
+        self.update_status(first, "Rejected")
+        second = AdoptionApplication.objects.create(pet=self.pet, adopter_user=first.adopter_user)
+
+        response = self.update_status(first, "Pending")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)  # Not an IntegrityError
+        first.refresh_from_db()
+        self.assertEqual(first.application_status, "Rejected")
+
+class TestBulkReview(APITestCase):
+    def setUp(self):
+        cache.clear()  # Start every test with an empty pet listing cache
+
+        self.admin_user = User.objects.create_superuser(username="admin", password="admin123")
+        self.shelter = Shelter.objects.create(name="Happy Tails Shelter", address="123 Shelter Ave")
+        self.client.force_authenticate(user=self.admin_user)
+
+    def create_applications(self, pet, count):
+        return [
+            AdoptionApplication.objects.create(pet=pet, adopter_user=User.objects.create(username=f"user{pet.pet_id}-{i}"))
+            for i in range(count)
+        ]
+
+    def bulk_review(self, reviews):
+        return self.client.post("/api/adoption-application/bulk-review/", reviews, format="json")
+
+    def test_applies_every_decision(self):
+        adopted, released, held = (create_pet(self.shelter, name=name, adoption_status="Pending") for name in ("Buddy", "Max", "Rocky"))
+        winner, competitor = self.create_applications(adopted, 2)
+        (rejected,) = self.create_applications(released, 1)
+        rejected_held, still_open = self.create_applications(held, 2)
+        rebuild_shelter_stats()
+
+        response = self.bulk_review([
+            {"application_id": winner.application_id, "status": "Approved"},
+            {"application_id": rejected.application_id, "status": "Rejected"},
+            {"application_id": rejected_held.application_id, "status": "Rejected"},
+        ])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["updated"], 3)
+        self.assertEqual(response.data["auto_rejected"], 1)
+
+        statuses = dict(AdoptionApplication.objects.values_list("application_id", "application_status"))
+        self.assertEqual(statuses, {
+            winner.application_id: "Approved", competitor.application_id: "Rejected",
+            rejected.application_id: "Rejected", rejected_held.application_id: "Rejected", still_open.application_id: "Pending",
+        })
+        pet_statuses = dict(Pet.objects.values_list("name", "adoption_status"))
+        self.assertEqual(pet_statuses, {"Buddy": "Adopted", "Max": "Available", "Rocky": "Pending"})
+        self.assertEqual({pet["pet_id"]: pet["adoption_status"] for pet in response.data["pets"]},
+                         {adopted.pet_id: "Adopted", released.pet_id: "Available", held.pet_id: "Pending"})
+        self.assertEqual(len(response.data["applications"]), 5)
+
+        # The dashboard counters follow every change
+        stats = ShelterStats.objects.get(shelter=self.shelter)
+        self.assertEqual((stats.available_pets, stats.pending_pets, stats.adopted_pets, stats.open_applications), (1, 1, 1, 1))
+
+    def test_query_count_does_not_grow_with_batch_size(self):
+        counts = []
+        for size in (2, 20):
+            reviews = []
+            for i in range(size):
+                pet = create_pet(self.shelter, name=f"Pet{size}-{i}", adoption_status="Pending")
+                reviews += [{"application_id": application.application_id, "status": "Rejected"}
+                            for application in self.create_applications(pet, 2)]
+            rebuild_shelter_stats()
+            with CaptureQueriesContext(connection) as queries:
+                response = self.bulk_review(reviews)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            counts.append(len(queries))
+        self.assertEqual(counts[0], counts[1])
+
+    def test_rejects_invalid_batches_without_changes(self):
+        pet = create_pet(self.shelter, adoption_status="Pending")
+        first, second = self.create_applications(pet, 2)
+        for reviews in (
+            [],
+            [{"application_id": first.application_id, "status": "Maybe"}],
+            [{"application_id": first.application_id, "status": "Approved"}, {"application_id": second.application_id, "status": "Approved"}],
+            [{"application_id": first.application_id, "status": "Rejected"}, {"application_id": 999999, "status": "Rejected"}],
+        ):
+            response = self.bulk_review(reviews)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(set(AdoptionApplication.objects.values_list("application_status", flat=True)), {"Pending"})
+
+    def test_reopening_follows_the_single_review_rules(self):
+        adopted, reopened = (create_pet(self.shelter, name=name, adoption_status="Pending") for name in ("Buddy", "Max"))
+        winner, loser = self.create_applications(adopted, 2)
+        (first,) = self.create_applications(reopened, 1)
+        self.bulk_review([{"application_id": winner.application_id, "status": "Approved"},
+                          {"application_id": first.application_id, "status": "Rejected"}])
+        second = AdoptionApplication.objects.create(pet=reopened, adopter_user=first.adopter_user)
+
+        for reviews in (
+            [{"application_id": loser.application_id, "status": "Pending"}],  # Pet adopted through the winner
+            [{"application_id": first.application_id, "status": "Pending"}],  # Adopter already has an open application
+        ):
+            self.assertEqual(self.bulk_review(reviews).status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.bulk_review([{"application_id": winner.application_id, "status": "Pending"},
+                                     {"application_id": first.application_id, "status": "Pending"},
+                                     {"application_id": second.application_id, "status": "Rejected"}])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(dict(Pet.objects.values_list("name", "adoption_status")), {"Buddy": "Pending", "Max": "Pending"})
+
+    def test_requires_admin(self):
+        self.client.force_authenticate(user=User.objects.create(username="user"))
+        self.assertEqual(self.bulk_review([]).status_code, status.HTTP_403_FORBIDDEN)
+
+# Applicants racing for one pet in threads, against a file-backed SQLite database (the in-memory test
+# database cannot take concurrent writers). Run as: python -c RACE_PROBE <database> <applicants> <transaction mode>
+RACE_PROBE = """
+import json
+import sys
+import threading
+
+import django
+from django.conf import settings
+
+settings.DATABASES = {'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': sys.argv[1],
+                                  'OPTIONS': {'timeout': 30, 'transaction_mode': sys.argv[3]}}}
+settings.DATABASE_REPLICAS = []
+django.setup()
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import OperationalError, connection
+from rest_framework.exceptions import ValidationError
+from api.models import AdoptionApplication, Pet, Shelter
+from api.serializers import ApplicationSerializer
+from api.services import submit_application
+
+call_command('migrate', run_syncdb=True, verbosity=0)
+shelter = Shelter.objects.create(name='Happy Tails Shelter', address='123 Shelter Ave')
+pet = Pet.objects.create(name='Buddy', age=2, gender='Male', domesticated=True, pet_type='Dog',
+                         adoption_status='Available', shelter_id=shelter)
+users = [User.objects.create(username=f'user{i}') for i in range(int(sys.argv[2]))]
+connection.close()
+
+barrier = threading.Barrier(len(users))
+outcomes = []
+
+def apply(user):
+    try:
+        serializer = ApplicationSerializer(data={'pet_id': pet.pk})
+        serializer.is_valid(raise_exception=True)
+        barrier.wait()  # Release every applicant at the same moment
+        submit_application(serializer, user)
+        outcomes.append('claimed')
+    except ValidationError:
+        outcomes.append('refused')
+    except OperationalError:
+        outcomes.append('busy')  # "database is locked": SQLite refused the write outright
+    finally:
+        connection.close()
+
+threads = [threading.Thread(target=apply, args=(user,)) for user in users]
+for thread in threads:
+    thread.start()
+for thread in threads:
+    thread.join()
+print(json.dumps({
+    'outcomes': outcomes,
+    'applications': AdoptionApplication.objects.filter(pet=pet).count(),
+    'adoption_status': Pet.objects.get(pk=pet.pk).adoption_status,
+}))
+"""
+
+class TestApplicationRace(SimpleTestCase):
+    """submit_application called from many threads at once claims the pet exactly once."""
+
+    APPLICANTS = 8
+
+    def race(self, transaction_mode):
+        with tempfile.TemporaryDirectory() as directory:
+            database = str(Path(directory) / "race.sqlite3")
+            result = subprocess.run(
+                [sys.executable, "-c", RACE_PROBE, database, str(self.APPLICANTS), transaction_mode],
+                cwd=settings.BASE_DIR, capture_output=True, text=True, check=True,
+            )
+        return json.loads(result.stdout.strip().splitlines()[-1])
+
+    def test_losers_are_refused_while_writers_queue(self):
+        # IMMEDIATE transactions wait for each other like row locks: every loser sees the claimed pet
+        result = self.race("IMMEDIATE")
+        self.assertEqual(sorted(result["outcomes"]), ["claimed"] + ["refused"] * (self.APPLICANTS - 1))
+        self.assertEqual((result["applications"], result["adoption_status"]), (1, "Pending"))
+
+    def test_one_claim_when_the_database_refuses_concurrent_writes(self):
+        # DEFERRED transactions: SQLite fails the competing writers ("database is locked") instead of queueing them
+        result = self.race("DEFERRED")
+        self.assertEqual(result["outcomes"].count("claimed"), 1)
+        self.assertLessEqual(set(result["outcomes"]), {"claimed", "refused", "busy"})
+        self.assertEqual((result["applications"], result["adoption_status"]), (1, "Pending"))
+
+# The same race through the API with real row locks and concurrent writers (e.g. MySQL)
+@skipUnlessDBFeature('has_select_for_update')
+class TestConcurrentApplications(TransactionTestCase):
+    """Many adopters apply for the same pet at once; exactly one application may win."""
+
+    APPLICANTS = 8
+
+    def test_exactly_one_application_wins(self):
+        cache.clear()
+        shelter = Shelter.objects.create(name="Happy Tails Shelter", address="123 Shelter Ave")
+        pet = create_pet(shelter)
+        users = [User.objects.create(username=f"user{i}") for i in range(self.APPLICANTS)]
+
+        barrier = threading.Barrier(self.APPLICANTS)
+        results = []
+
+        def apply(user):
+            client = APIClient()
+            client.force_authenticate(user=user)
+            barrier.wait()  # Release every applicant at the same moment
+            try:
+                response = client.post("/api/adoption-application/", {"pet_id": pet.pet_id}, format="json")
+                results.append(response.status_code)
+            except Exception as error:  # A database lock error still counts as a lost race
+                results.append(error)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=apply, args=(user,)) for user in users]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results.count(status.HTTP_201_CREATED), 1)
+        self.assertEqual(AdoptionApplication.objects.filter(pet=pet).count(), 1)
+        pet.refresh_from_db()
+        self.assertEqual(pet.adoption_status, "Pending")
@@ -0,0 +1,146 @@
+import asyncio
+import json
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from rest_framework.test import APITestCase
+from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import override_settings
+from django.urls import path
+from api import async_views
+from api.authentication import user_cache
+from api.metrics import registry
+from api.models import Pet, Shelter
+
+# The catalogue routes as served with ASYNC_VIEWS enabled (the project URLs use the sync views in tests)
+urlpatterns = [
+    path('', async_views.health_check, name='health_check'),
+    path('ready', async_views.readiness_check, name='readiness_check'),
+    path('api/admin/shelters/', async_views.ShelterListView.as_view(), name='shelter_list'),
+    path('api/pets/', async_views.PetListView.as_view(), name='pet_list'),
+    path('api/pets/<int:pk>/', async_views.PetDetailView.as_view(), name='pet_detail'),
+]
+
+@override_settings(ROOT_URLCONF=__name__)
+class TestAsyncViews(APITestCase):
+    def setUp(self):
+        cache.clear()  # Start every test with an empty pet listing cache
+        user_cache.clear()
+
+        self.user = User.objects.create(username="user")
+        self.auth = {"Authorization": f"Bearer {AccessToken.for_user(self.user)}"}
+        self.shelter = Shelter.objects.create(name="Happy Tails Shelter", address="123 Shelter Ave")
+        for i in range(7):
+            Pet.objects.create(name=f"Pet {i}", age=i + 1, gender="Male", domesticated=True, adoption_status="Available",
+                               pet_type="Dog" if i % 2 else "Cat", shelter_id=self.shelter)
+        self.pet = Pet.objects.first()
+
+    def sync_get(self, url, headers=None):
+        # The same request through the sync views in the project URLs
+        with override_settings(ROOT_URLCONF='adoptify_backend.urls'):
+            cache.clear()
+            return self.client.get(url, headers=headers)
+
+    async def async_get(self, url, headers=None):
+        await cache.aclear()  # Build the response instead of reading what the sync view cached
+        return await self.async_client.get(url, headers=headers)
+
+    async def get_counting_queries(self, url, headers=None):
+        # Database queries are counted by the metrics middleware (assertNumQueries is sync only)
+        registry.reset()
+        response = await self.async_client.get(url, headers=headers)
+        endpoint = response.resolver_match.url_name
+        return response, registry.snapshot()[(endpoint, "GET", str(response.status_code))].db_queries
+
+    async def assert_same_response(self, url, headers=None):
+        expected = await sync_to_async(self.sync_get)(url, headers)
+        response = await self.async_get(url, headers)
+        self.assertEqual(response.status_code, expected.status_code)
+        self.assertEqual(json.loads(response.content), json.loads(expected.content))
+        for header in ("ETag", "Last-Modified", "Cache-Control", "WWW-Authenticate"):
+            self.assertEqual(response.get(header), expected.get(header), header)
+        return response
+
+    async def test_pet_list_pages_match_sync_view(self):
+        # Walk forwards through every page, then back one page with the previous cursor
+        url = "/api/pets/?page_size=2&pet_type=Dog"
+        seen = []
+        while url:
+            response = await self.assert_same_response(url)
+            data = json.loads(response.content)
+            seen += [pet["pet_id"] for pet in data["results"]]
+            url, previous_url = data["next"], data["previous"]
+        await self.assert_same_response(previous_url)
+        self.assertEqual(len(seen), 3)
+
+    async def test_pet_list_is_cached_and_revalidated(self):
+        response, queries = await self.get_counting_queries("/api/pets/")
+        self.assertEqual(queries, 2)  # Validators aggregate and the page
+        cached, queries = await self.get_counting_queries("/api/pets/")
+        self.assertEqual((cached.content, queries), (response.content, 0))
+
+        response, queries = await self.get_counting_queries("/api/pets/", {"If-None-Match": response["ETag"]})
+        self.assertEqual((response.status_code, queries), (status.HTTP_304_NOT_MODIFIED, 0))
+
+    async def test_pet_list_does_no_blocking_cache_io(self):
+        def forbid_on_event_loop(method):
+            def wrapper(*args, **kwargs):
+                try:
+                    asyncio.get_running_loop()
+                except RuntimeError:
+                    return method(*args, **kwargs)  # In a worker thread (sync_to_async), e.g. LocMemCache.aget
+                raise AssertionError(f"Blocking cache.{method.__name__}() on the event loop")
+            return wrapper
+
+        patches = [mock.patch.object(LocMemCache, name, forbid_on_event_loop(getattr(LocMemCache, name)))
+                   for name in ("get", "add", "set", "get_many")]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        for _ in range(2):  # Built, then served from the cache
+            response = await self.async_client.get(f"/api/pets/?shelter_id={self.shelter.shelter_id}")
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    async def test_pet_list_errors_match_sync_view(self):
+        await self.assert_same_response("/api/pets/?min_age=old")  # Invalid filter
+        await self.assert_same_response("/api/pets/?cursor=bogus")  # Invalid cursor
+        await self.assert_same_response("/api/pets/", {"Authorization": "Bearer invalid"})  # 401 even though anonymous users are allowed
+        await self.assert_same_response("/api/pets/", self.auth)
+
+    async def test_pet_detail_matches_sync_view(self):
+        await self.assert_same_response(f"/api/pets/{self.pet.pet_id}/")  # Not authenticated
+        await self.assert_same_response(f"/api/pets/{self.pet.pet_id}/", {"Authorization": "Bearer invalid"})
+        await self.assert_same_response("/api/pets/999999/", self.auth)
+
+        response = await self.assert_same_response(f"/api/pets/{self.pet.pet_id}/", self.auth)
+        headers = {**self.auth, "If-None-Match": response["ETag"]}
+        response, queries = await self.get_counting_queries(f"/api/pets/{self.pet.pet_id}/", headers)
+        self.assertEqual((response.status_code, queries), (status.HTTP_304_NOT_MODIFIED, 1))  # Cached user; only the aggregate
+
+    async def test_pet_detail_writes_use_sync_view(self):
+        response = await self.async_client.patch(f"/api/pets/{self.pet.pet_id}/", {"name": "Buddy"},
+                                                 content_type="application/json", headers=self.auth)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(json.loads(response.content)["name"], "Buddy")
+        self.assertEqual((await Pet.objects.aget(pk=self.pet.pet_id)).name, "Buddy")
+
+    async def test_shelter_list_matches_sync_view(self):
+        await Shelter.objects.acreate(name="Paws Place", address="456 Paws Rd")
+        await self.assert_same_response("/api/admin/shelters/")
+        await self.assert_same_response("/api/admin/shelters/", self.auth)
+
+    async def test_sparse_fields_match_sync_view(self):
+        await self.assert_same_response("/api/pets/?fields=name,pet_type,image_thumb")
+        await self.assert_same_response(f"/api/pets/{self.pet.pet_id}/?fields=pet_id,name", self.auth)
+        await self.assert_same_response("/api/admin/shelters/?fields=name", self.auth)
+        await self.assert_same_response("/api/pets/?fields=password")  # 400 from both
+
+    async def test_health_checks(self):
+        for url in ("/", "/ready"):
+            response = await self.async_client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(json.loads(response.content)["status"], "OK")
@@ -0,0 +1,70 @@
+from rest_framework.test import APITestCase
+from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from api.authentication import user_cache
+from api.serializers import TokenObtainPairWithClaimsSerializer
+
+class TestCachedJWTAuthentication(APITestCase):
+    def setUp(self):
+        user_cache.clear()
+        self.user = User.objects.create_user(username="user", password="user12345")
+        self.admin_user = User.objects.create_superuser(username="admin", password="admin123")
+
+    def authenticate(self, user):
+        token = TokenObtainPairWithClaimsSerializer.get_token(user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def user_queries(self, path):
+        # Return the response and the number of queries against the auth_user table
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(path)
+        return response, sum('"auth_user"' in query["sql"] for query in queries.captured_queries)
+
+    def test_token_obtain_adds_staff_claim(self):
+        response = self.client.post("/api/token/", {"username": "admin", "password": "admin123"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIs(AccessToken(response.data["access"])["is_staff"], True)
+
+    def test_user_is_resolved_from_cache(self):
+        self.authenticate(self.user)
+
+        response, queries = self.user_queries("/api/favourite/list/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(queries, 1)  # First request loads the user
+
+        response, queries = self.user_queries("/api/favourite/list/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(queries, 0)
+
+    def test_save_invalidates_cache(self):
+        self.authenticate(self.user)
+        self.client.get("/api/favourite/list/")
+
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.get("/api/favourite/list/")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_staff_claim_must_match(self):
+        self.authenticate(self.admin_user)
+        self.assertEqual(self.client.get("/api/admin/shelters/stats/").status_code, status.HTTP_200_OK)
+
+        # A demoted admin's existing token stops working
+        self.admin_user.is_staff = False
+        self.admin_user.save()
+        self.assertEqual(self.client.get("/api/admin/shelters/stats/").status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_cache_is_bounded(self):
+        with self.settings(AUTH_USER_CACHE_SIZE=1):
+            user_cache.get(self.user.pk)
+            user_cache.get(self.admin_user.pk)
+            self.assertEqual(list(user_cache._entries), [self.admin_user.pk])
+
+    def test_cached_user_is_not_shared(self):
+        first, second = user_cache.get(self.user.pk), user_cache.get(self.user.pk)
+        self.assertIsNot(first, second)
+        self.assertEqual(first.username, "user")
+        self.assertTrue(first.check_password("user12345"))  # The password is loaded on demand
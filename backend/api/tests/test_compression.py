@@ -0,0 +1,78 @@
+import gzip
+from unittest import mock, skipUnless
+
+from rest_framework.test import APITestCase
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from django.core.cache import cache
+from django.test import SimpleTestCase
+from django.utils import timezone
+from api.compression import negotiate
+from api.models import Pet, Shelter
+from api.renderers import FastJSONRenderer
+
+try:
+    import brotli
+except ImportError:  # Optional dependency (see api/compression.py)
+    brotli = None
+
+class TestNegotiate(SimpleTestCase):
+    def test_prefers_brotli_then_gzip(self):
+        self.assertEqual(negotiate("gzip, deflate, br", ("br", "gzip")), "br")
+        self.assertEqual(negotiate("gzip, deflate, br", ("gzip",)), "gzip")
+        self.assertEqual(negotiate("br;q=0.5, gzip", ("br", "gzip")), "gzip")
+        self.assertEqual(negotiate("*", ("br", "gzip")), "br")
+
+    def test_refused_or_missing_codings(self):
+        self.assertIsNone(negotiate("", ("br", "gzip")))
+        self.assertIsNone(negotiate("identity", ("br", "gzip")))
+        self.assertIsNone(negotiate("br;q=0, gzip;q=0", ("br", "gzip")))
+
+class TestResponseCompression(APITestCase):
+    def setUp(self):
+        cache.clear()  # Start every test with an empty pet listing cache
+        shelter = Shelter.objects.create(name="Happy Tails Shelter", address="123 Shelter Ave")
+        for i in range(10):
+            Pet.objects.create(name=f"Dog {i}", age=i + 1, gender="Male", domesticated=True,
+                               pet_type="Dog", adoption_status="Available", shelter_id=shelter)
+
+    @skipUnless(brotli, "brotli is not installed")
+    def test_brotli_when_accepted(self):
+        plain = self.client.get("/api/pets/")
+        response = self.client.get("/api/pets/", HTTP_ACCEPT_ENCODING="gzip, br")
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertEqual(brotli.decompress(response.content), plain.content)
+        self.assertEqual(response["ETag"], "W/" + plain["ETag"])
+
+    def test_gzip_without_brotli(self):
+        plain = self.client.get("/api/pets/")
+        response = self.client.get("/api/pets/", HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+
+        with mock.patch("api.compression.brotli", None):  # The optional package is not installed
+            response = self.client.get("/api/pets/", HTTP_ACCEPT_ENCODING="br, gzip")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+
+    def test_uncompressed_without_accept_encoding(self):
+        response = self.client.get("/api/pets/")
+        self.assertNotIn("Content-Encoding", response)
+
+    def test_weak_etag_still_revalidates(self):
+        etag = self.client.get("/api/pets/", HTTP_ACCEPT_ENCODING="gzip")["ETag"]
+        self.assertTrue(etag.startswith("W/"))
+        response = self.client.get("/api/pets/", HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+class TestFastJSONRenderer(SimpleTestCase):
+    def test_same_output_as_json_renderer(self):
+        data = {"name": "Café", "separator": "a\u2028b", "when": timezone.now(), "count": 3, "ratio": 0.5,
+                "missing": None, "flags": [True, False], 1: "int key", "nested": {"items": (1, 2)}}
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_indented_output_falls_back_to_json_renderer(self):
+        data = {"name": "Buddy"}
+        rendered = FastJSONRenderer().render(data, "application/json; indent=4")
+        self.assertEqual(rendered, JSONRenderer().render(data, "application/json; indent=4"))
+        self.assertEqual(FastJSONRenderer().render(None), b"")
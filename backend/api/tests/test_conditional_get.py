@@ -0,0 +1,118 @@
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.utils.http import http_date
+from api.models import AdoptionApplication, Pet, Shelter, Favourite, Donation
+
+class TestConditionalGet(APITestCase):
+    def setUp(self):
+        cache.clear()  # Start every test with an empty pet listing cache
+
+        self.user = User.objects.create(username="user")
+        self.admin_user = User.objects.create_superuser(username="admin", password="admin123")
+        self.shelter = Shelter.objects.create(name="Happy Tails Shelter", address="123 Shelter Ave")
+        self.pet = Pet.objects.create(name="Buddy", age=2, gender="Male", domesticated=True, adoption_status="Available",
+                                      pet_type="Dog", shelter_id=self.shelter)
+
+    def revalidate(self, url, etag, expected_status, num_queries=None):
+        if num_queries is None:
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        else:
+            with self.assertNumQueries(num_queries):
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, expected_status)
+        return response
+
+    def test_pet_list_304_until_a_pet_changes(self):
+        response = self.client.get("/api/pets/")
+        etag = response["ETag"]
+        self.assertIn("Last-Modified", response)
+        self.assertEqual(response["Cache-Control"], "no-cache")
+
+        response = self.revalidate("/api/pets/", etag, status.HTTP_304_NOT_MODIFIED, num_queries=0)  # Cached validators
+        self.assertEqual(response.content, b"")
+
+        cache.clear()
+        self.revalidate("/api/pets/", etag, status.HTTP_304_NOT_MODIFIED, num_queries=1)  # Only the aggregate
+
+        self.pet.name = "Buddy II"
+        self.pet.save()
+        cache.clear()
+        self.revalidate("/api/pets/", etag, status.HTTP_200_OK)
+
+    def test_pet_list_etag_depends_on_query(self):
+        etag = self.client.get("/api/pets/")["ETag"]
+        self.assertNotEqual(self.client.get("/api/pets/", {"pet_type": "Dog"})["ETag"], etag)
+
+    def test_shelter_rename_changes_pet_etags(self):
+        self.client.force_authenticate(user=self.user)
+        url = f"/api/pets/{self.pet.pet_id}/"
+        etag = self.client.get(url)["ETag"]
+        self.revalidate(url, etag, status.HTTP_304_NOT_MODIFIED, num_queries=1)
+
+        self.shelter.name = "Paws Place"
+        self.shelter.save()
+        response = self.revalidate(url, etag, status.HTTP_200_OK)
+        self.assertEqual(response.data["shelter_name"], "Paws Place")
+
+    def test_if_modified_since(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get("/api/admin/shelters/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.get("/api/admin/shelters/", HTTP_IF_MODIFIED_SINCE=response["Last-Modified"])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        response = self.client.get("/api/admin/shelters/", HTTP_IF_MODIFIED_SINCE=http_date(0))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_status_change_through_services_updates_etag(self):
+        # Bulk UPDATEs skip auto_now; the adoption services set updated_at themselves
+        self.client.force_authenticate(user=self.user)
+        url = f"/api/pets/{self.pet.pet_id}/"
+        etag = self.client.get(url)["ETag"]
+        self.client.post("/api/adoption-application/", {"pet_id": self.pet.pet_id}, format="json")
+        self.revalidate(url, etag, status.HTTP_200_OK)
+
+    def test_approval_updates_pet_etag(self):
+        # save(update_fields=...) only writes auto_now fields that are listed
+        self.client.force_authenticate(user=self.user)
+        self.client.post("/api/adoption-application/", {"pet_id": self.pet.pet_id}, format="json")
+        application = AdoptionApplication.objects.get()
+        url = f"/api/pets/{self.pet.pet_id}/"
+        etag = self.client.get(url)["ETag"]
+
+        self.client.force_authenticate(user=self.admin_user)
+        self.client.patch(f"/api/adoption-application/{application.application_id}/update-status/",
+                          {"application_status": "Approved"}, format="json")
+        self.client.force_authenticate(user=self.user)
+        self.assertEqual(self.revalidate(url, etag, status.HTTP_200_OK).data["adoption_status"], "Adopted")
+        self.assertGreater(AdoptionApplication.objects.get().updated_at, application.updated_at)
+
+    def test_favourites_are_per_user(self):
+        Favourite.objects.create(adopter_user=self.user, pet=self.pet)
+        other = User.objects.create(username="other")
+        Favourite.objects.create(adopter_user=other, pet=self.pet)
+
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get("/api/favourite/list/")
+        etag = response["ETag"]
+        self.assertIn("Authorization", response["Vary"])
+        self.revalidate("/api/favourite/list/", etag, status.HTTP_304_NOT_MODIFIED)
+
+        self.client.force_authenticate(user=other)
+        self.revalidate("/api/favourite/list/", etag, status.HTTP_200_OK)
+
+        # Removing one favourite and adding another keeps the count but changes the ETag
+        self.client.force_authenticate(user=self.user)
+        second_pet = Pet.objects.create(name="Max", age=3, gender="Male", domesticated=True, adoption_status="Available",
+                                        pet_type="Dog", shelter_id=self.shelter)
+        Favourite.objects.filter(adopter_user=self.user).delete()
+        Favourite.objects.create(adopter_user=self.user, pet=second_pet)
+        self.revalidate("/api/favourite/list/", etag, status.HTTP_200_OK)
+
+    def test_donation_detail(self):
+        donation = Donation.objects.create(adopter_user_id=self.user, shelter_id=self.shelter, amount="10.00")
+        self.client.force_authenticate(user=self.user)
+        url = f"/api/donations/{donation.fundId}/"
+        etag = self.client.get(url)["ETag"]
+        self.revalidate(url, etag, status.HTTP_304_NOT_MODIFIED, num_queries=1)
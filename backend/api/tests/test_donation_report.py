@@ -0,0 +1,82 @@
+from datetime import datetime, timezone as dt_timezone
+from decimal import Decimal
+
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.contrib.auth.models import User
+from api.models import Shelter, Donation
+
+class TestDonationReport(APITestCase):
+    def setUp(self):
+        self.admin_user = User.objects.create_superuser(username="admin", password="admin123")
+        self.alice = User.objects.create(username="alice")
+        self.bob = User.objects.create(username="bob")
+        self.shelter = Shelter.objects.create(name="Happy Tails Shelter", address="123 Shelter Ave")
+        self.other_shelter = Shelter.objects.create(name="Paws Place", address="456 Paws Rd")
+
+        for donor, shelter, amount, day in (
+            (self.alice, self.shelter, "10.00", datetime(2025, 1, 6, 9, tzinfo=dt_timezone.utc)),
+            (self.alice, self.shelter, "15.50", datetime(2025, 1, 6, 23, tzinfo=dt_timezone.utc)),
+            (self.bob, self.other_shelter, "20.00", datetime(2025, 1, 8, 12, tzinfo=dt_timezone.utc)),
+            (self.bob, self.shelter, "5.00", datetime(2025, 2, 3, 12, tzinfo=dt_timezone.utc)),
+        ):
+            donation = Donation.objects.create(adopter_user_id=donor, shelter_id=shelter, amount=amount)
+            Donation.objects.filter(pk=donation.pk).update(donation_date=day)  # auto_now_add ignores passed values
+
+        self.client.force_authenticate(user=self.admin_user)
+
+    def get_report(self, **params):
+        response = self.client.get("/api/donations/report/", params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data["results"]
+
+    def test_group_by_shelter(self):
+        results = self.get_report()
+        self.assertEqual([(row["shelter_name"], row["total"], row["count"]) for row in results], [
+            ("Happy Tails Shelter", Decimal("30.50"), 3),
+            ("Paws Place", Decimal("20.00"), 1),
+        ])
+
+    def test_group_by_donor(self):
+        results = self.get_report(group_by="donor")
+        self.assertEqual({row["donor_username"]: row["total"] for row in results}, {
+            "alice": Decimal("25.50"), "bob": Decimal("25.00"),
+        })
+
+    def test_group_by_period(self):
+        days = self.get_report(group_by="day")
+        self.assertEqual([(str(row["period"]), row["count"]) for row in days], [
+            ("2025-01-06", 2), ("2025-01-08", 1), ("2025-02-03", 1),
+        ])
+        weeks = self.get_report(group_by="week")
+        self.assertEqual([(str(row["period"]), row["count"]) for row in weeks], [("2025-01-06", 3), ("2025-02-03", 1)])
+        months = self.get_report(group_by="month")
+        self.assertEqual([(str(row["period"]), row["total"]) for row in months], [
+            ("2025-01-01", Decimal("45.50")), ("2025-02-01", Decimal("5.00")),
+        ])
+
+    def test_date_range_and_shelter_filter(self):
+        # The end date is inclusive (the 23:00 donation on the 6th is counted)
+        results = self.get_report(start="2025-01-06", end="2025-01-06")
+        self.assertEqual([(row["shelter_name"], row["count"]) for row in results], [("Happy Tails Shelter", 2)])
+
+        results = self.get_report(group_by="month", shelter_id=self.shelter.shelter_id)
+        self.assertEqual([row["total"] for row in results], [Decimal("25.50"), Decimal("5.00")])
+
+    def test_csv_export_streams(self):
+        response = self.client.get("/api/donations/report/", {"group_by": "donor", "file_format": "csv"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0], "donor_id,donor_username,total,count")
+        self.assertEqual(lines[1], f"{self.alice.pk},alice,25.50,2")
+
+    def test_invalid_parameters(self):
+        for params in ({"group_by": "year"}, {"start": "01/06/2025"}, {"start": "2025-02-01", "end": "2025-01-01"}):
+            response = self.client.get("/api/donations/report/", params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_requires_admin(self):
+        self.client.force_authenticate(user=self.alice)
+        response = self.client.get("/api/donations/report/")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,16 @@
+from unittest import mock
+
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.db import OperationalError
+
+class TestReadiness(APITestCase):
+    def test_ready_when_database_answers(self):
+        response = self.client.get("/ready")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["status"], "OK")
+
+    def test_not_ready_when_database_fails(self):
+        with mock.patch("api.views.connection.cursor", side_effect=OperationalError("down")):
+            response = self.client.get("/ready")
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
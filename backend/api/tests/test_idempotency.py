@@ -0,0 +1,118 @@
+import hashlib
+
+from rest_framework.test import APITestCase
+from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from api.idempotency import LOCK_KEY, REPLAYED_HEADER
+from api.models import AdoptionApplication, Donation, Favourite, Pet, Shelter, ShelterStats
+
+class TestIdempotencyKeys(APITestCase):
+    def setUp(self):
+        cache.clear()  # Forget stored responses between tests
+
+        self.user = User.objects.create(username="user")
+        self.shelter = Shelter.objects.create(name="Happy Tails Shelter", address="123 Shelter Ave")
+        self.login(self.user)
+
+    def login(self, user):
+        # The key is scoped to the token's user, so these tests send real bearer tokens
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+
+    def donate(self, amount="25.00", key="donation-1"):
+        headers = {"Idempotency-Key": key} if key else {}
+        return self.client.post("/api/donate/", {"shelter_id": self.shelter.pk, "amount": amount}, format="json", headers=headers)
+
+    def test_retry_replays_the_response(self):
+        first = self.donate()
+        retry = self.donate()
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual((retry.status_code, retry.content), (first.status_code, first.content))
+        self.assertEqual(retry[REPLAYED_HEADER], "true")
+        self.assertEqual(Donation.objects.count(), 1)
+        self.assertEqual(ShelterStats.objects.get(shelter=self.shelter).donation_total, 25)
+
+        self.donate(key="donation-2")  # A new key is a new donation
+        self.donate(key=None)  # And so is a request without one
+        self.assertEqual(Donation.objects.count(), 3)
+
+    def test_keys_are_per_user(self):
+        self.donate()
+        self.login(User.objects.create(username="other"))
+        response = self.donate()
+        self.assertFalse(response.has_header(REPLAYED_HEADER))
+        self.assertEqual(Donation.objects.count(), 2)
+
+    def test_reusing_a_key_for_another_request(self):
+        self.donate()
+        response = self.donate(amount="50.00")
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertEqual(Donation.objects.count(), 1)
+
+    def test_concurrent_retry_while_in_progress(self):
+        cache.set(LOCK_KEY.format(user_id=self.user.pk, key_hash=hashlib.sha256(b"donation-1").hexdigest()), True)
+        response = self.donate()
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(Donation.objects.count(), 0)
+
+    def test_client_errors_are_replayed_and_anonymous_requests_pass_through(self):
+        Shelter.objects.filter(pk=self.shelter.pk).delete()
+        self.assertEqual(self.donate().status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.donate()[REPLAYED_HEADER], "true")
+
+        self.client.credentials()
+        response = self.donate()
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertFalse(response.has_header(REPLAYED_HEADER))
+
+    def test_key_length_is_limited(self):
+        self.assertEqual(self.donate(key="k" * 256).status_code, status.HTTP_400_BAD_REQUEST)
+
+class TestDuplicateWrites(APITestCase):
+    def setUp(self):
+        cache.clear()
+
+        self.user = User.objects.create(username="user")
+        self.shelter = Shelter.objects.create(name="Happy Tails Shelter", address="123 Shelter Ave")
+        self.pet = Pet.objects.create(name="Buddy", age=2, gender="Male", domesticated=True, adoption_status="Available",
+                                      pet_type="Dog", shelter_id=self.shelter)
+        self.client.force_authenticate(user=self.user)
+
+    def apply(self):
+        return self.client.post("/api/adoption-application/", {"pet_id": self.pet.pet_id, "message": "Hi"}, format="json")
+
+    def test_resubmitted_application_returns_the_open_one(self):
+        first = self.apply()
+        retry = self.apply()
+        self.assertEqual((first.status_code, retry.status_code), (status.HTTP_201_CREATED, status.HTTP_200_OK))
+        self.assertEqual(retry.data["application_id"], first.data["application_id"])
+        self.assertEqual(AdoptionApplication.objects.count(), 1)
+        self.assertEqual(ShelterStats.objects.get(shelter=self.shelter).open_applications, 1)
+
+        # Another user still cannot apply for the claimed pet
+        self.client.force_authenticate(user=User.objects.create(username="other"))
+        self.assertEqual(self.apply().status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_one_open_application_per_user_and_pet(self):
+        AdoptionApplication.objects.create(pet=self.pet, adopter_user=self.user, application_status="Rejected")
+        AdoptionApplication.objects.create(pet=self.pet, adopter_user=self.user, application_status="Rejected")
+        AdoptionApplication.objects.create(pet=self.pet, adopter_user=self.user)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            AdoptionApplication.objects.create(pet=self.pet, adopter_user=self.user, application_status="Approved")
+
+        # The pet was made available again while the application was open: no second application, no claim
+        response = self.apply()
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(AdoptionApplication.objects.filter(application_status="Pending").count(), 1)
+        self.pet.refresh_from_db()
+        self.assertEqual(self.pet.adoption_status, "Available")
+
+    def test_favourites_are_unique(self):
+        for _ in range(2):
+            self.client.post(f"/api/favourite/{self.pet.pet_id}/add/")
+        self.assertEqual(Favourite.objects.count(), 1)
+        self.assertEqual(ShelterStats.objects.get(shelter=self.shelter).favourites, 1)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Favourite.objects.create(pet=self.pet, adopter_user=self.user)
@@ -0,0 +1,114 @@
+import os
+import shutil
+import tempfile
+from io import BytesIO, StringIO
+
+from PIL import Image
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import override_settings
+from api.images import generate_pet_image_variants, variant_name
+from api.media import IMMUTABLE_CACHE_CONTROL, is_content_hashed
+from api.models import Pet, Shelter
+
+def make_image(name="buddy.jpg", color=(200, 120, 40)):
+    buffer = BytesIO()
+    Image.new("RGB", (64, 48), color=color).save(buffer, "JPEG")
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type="image/jpeg")
+
+class TestPetMedia(APITestCase):
+    def setUp(self):
+        # Store uploads in a throwaway media directory
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root, MEDIA_SERVING="django")
+        self.settings_override.enable()
+
+        self.shelter = Shelter.objects.create(name="Happy Tails Shelter", address="123 Shelter Ave")
+        self.pet = self.create_pet("Buddy", make_image())
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def create_pet(self, name, image):
+        return Pet.objects.create(name=name, age=2, gender="Male", domesticated=True, pet_type="Dog",
+                                  adoption_status="Available", shelter_id=self.shelter, image=image)
+
+    def test_uploads_are_stored_under_their_content_hash(self):
+        self.assertRegex(self.pet.image.name, r"^pet_images/[0-9a-f]{64}\.jpg$")
+
+        # The same photo under another file name shares the stored file; a different photo does not
+        same = self.create_pet("Max", make_image("IMG_0001.JPG"))
+        other = self.create_pet("Rex", make_image(color=(10, 20, 30)))
+        self.assertEqual(same.image.name, self.pet.image.name)
+        self.assertNotEqual(other.image.name, self.pet.image.name)
+        self.assertEqual(len(os.listdir(f"{self.media_root}/pet_images")), 2)
+
+    def test_served_with_immutable_cache_headers(self):
+        response = self.client.get(f"/media/{self.pet.image.name}")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "image/jpeg")
+        self.assertEqual(response["Cache-Control"], IMMUTABLE_CACHE_CONTROL)
+        with self.pet.image.open("rb") as image:
+            self.assertEqual(b"".join(response.streaming_content), image.read())
+
+        response = self.client.get(f"/media/{self.pet.image.name}", headers={"If-Modified-Since": response["Last-Modified"]})
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_variants_are_immutable_and_not_regenerated(self):
+        generate_pet_image_variants(self.pet.image.name)
+        thumb = variant_name(self.pet.image.name, "thumb")
+        self.assertTrue(is_content_hashed(thumb))
+        self.assertEqual(self.client.get(f"/media/{thumb}")["Cache-Control"], IMMUTABLE_CACHE_CONTROL)
+
+        modified = os.path.getmtime(f"{self.media_root}/{thumb}")
+        generate_pet_image_variants(self.create_pet("Max", make_image()).image.name)  # The same photo again
+        self.assertEqual(os.path.getmtime(f"{self.media_root}/{thumb}"), modified)
+
+    @override_settings(MEDIA_SERVING="x-accel-redirect", MEDIA_ACCEL_REDIRECT_PREFIX="/protected-media/")
+    def test_x_accel_redirect(self):
+        response = self.client.get(f"/media/{self.pet.image.name}")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["X-Accel-Redirect"], f"/protected-media/{self.pet.image.name}")
+        self.assertEqual(response["Content-Type"], "image/jpeg")
+        self.assertEqual(response["Cache-Control"], IMMUTABLE_CACHE_CONTROL)
+        self.assertEqual(response.content, b"")  # nginx sends the file
+
+    @override_settings(MEDIA_SERVING="x-sendfile")
+    def test_x_sendfile(self):
+        response = self.client.head(f"/media/{self.pet.image.name}")
+        self.assertEqual(response["X-Sendfile"], os.path.join(self.media_root, self.pet.image.name))
+        self.assertEqual(response.content, b"")
+
+    def test_files_without_a_content_hash_are_revalidated(self):
+        os.makedirs(f"{self.media_root}/pet_images", exist_ok=True)
+        with open(f"{self.media_root}/pet_images/dog1.jpg", "wb") as legacy:
+            legacy.write(make_image().read())
+        response = self.client.get("/media/pet_images/dog1.jpg")
+        self.assertEqual(response["Cache-Control"], "public, max-age=3600")
+
+    def test_missing_files_and_paths_outside_media_root(self):
+        for mode in ("django", "x-accel-redirect", "x-sendfile"):
+            with self.settings(MEDIA_SERVING=mode):
+                for url in ("/media/pet_images/missing.jpg", "/media/pet_images/", "/media/../settings.py"):
+                    self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND, (mode, url))
+        self.assertEqual(self.client.post(f"/media/{self.pet.image.name}").status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+
+    def test_hash_existing_images_command(self):
+        os.makedirs(f"{self.media_root}/pet_images", exist_ok=True)
+        with open(f"{self.media_root}/pet_images/dog1.jpg", "wb") as legacy:
+            legacy.write(make_image().read())
+        for name in ("Max", "Rex"):
+            Pet.objects.filter(pk=self.create_pet(name, None).pk).update(image="pet_images/dog1.jpg")
+        Pet.objects.filter(pk=self.create_pet("Ghost", None).pk).update(image="pet_images/gone.jpg")
+
+        out = StringIO()
+        call_command("hash_pet_images", stdout=out)
+        self.assertIn("Renamed 2 pet image(s) to 1 content-hashed file(s); 1 file(s) are missing.", out.getvalue())
+        # The photo matches Buddy's upload, so all three share one file (and its variants)
+        names = set(Pet.objects.filter(name__in=["Buddy", "Max", "Rex"]).values_list("image", flat=True))
+        self.assertEqual(names, {self.pet.image.name})
+        self.assertTrue(os.path.exists(f"{self.media_root}/{variant_name(self.pet.image.name, 'thumb')}"))
+        self.assertTrue(os.path.exists(f"{self.media_root}/pet_images/dog1.jpg"))  # Old URLs keep working
@@ -0,0 +1,68 @@
+import json
+import logging
+
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.core.cache import cache
+from django.test import override_settings
+from api.metrics import registry, JsonFormatter
+from api.models import Pet, Shelter
+
+@override_settings(METRICS_TOKEN="scrape-token")
+class TestRequestMetrics(APITestCase):
+    def setUp(self):
+        cache.clear()  # Make sure the pet listing is built (and queries the database)
+        registry.reset()
+
+        shelter = Shelter.objects.create(name="Happy Tails Shelter", address="123 Shelter Ave")
+        for name in ("Buddy", "Max"):
+            Pet.objects.create(name=name, age=2, gender="Male", domesticated=True, adoption_status="Available",
+                               pet_type="Dog", shelter_id=shelter)
+
+    def get_endpoint(self, endpoint, method="GET", status_code=200):
+        return registry.snapshot()[(endpoint, method, str(status_code))]
+
+    def test_records_per_url_name(self):
+        response = self.client.get("/api/pets/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.client.get("/api/pets/")  # Second request is served from the cache
+
+        metrics = self.get_endpoint("pet_list")
+        self.assertEqual(metrics.count, 2)
+        self.assertEqual(sum(metrics.latency_buckets), 2)
+        self.assertGreater(metrics.db_queries, 0)
+        self.assertGreater(metrics.db_seconds, 0)
+        self.assertGreater(metrics.serialization_seconds, 0)
+        self.assertEqual(metrics.response_bytes, 2 * len(response.content))
+
+    def test_unmatched_and_error_statuses(self):
+        self.client.get("/api/does-not-exist/")
+        self.client.get("/api/pets/", {"pet_type": "Dragon"})
+        self.assertEqual(self.get_endpoint("unmatched", status_code=404).count, 1)
+        self.assertEqual(self.get_endpoint("pet_list", status_code=400).count, 1)
+
+    def test_prometheus_endpoint(self):
+        self.client.get("/api/pets/")
+
+        response = self.client.get("/metrics")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        response = self.client.get("/metrics", HTTP_AUTHORIZATION="Bearer scrape-token")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        body = response.content.decode()
+        labels = 'endpoint="pet_list",method="GET",status="200"'
+        self.assertIn(f'adoptify_http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 1', body)
+        self.assertIn(f'adoptify_http_request_duration_seconds_count{{{labels}}} 1', body)
+        self.assertIn(f'adoptify_http_db_queries_total{{{labels}}}', body)
+        self.assertIn("# TYPE adoptify_http_response_bytes_total counter", body)
+
+    def test_request_log_is_structured(self):
+        with self.assertLogs("api.requests", level="INFO") as logs:
+            self.client.get("/api/pets/")
+        entry = json.loads(JsonFormatter().format(logs.records[0]))
+        self.assertEqual(entry["endpoint"], "pet_list")
+        self.assertEqual(entry["status"], 200)
+        self.assertEqual(entry["logger"], "api.requests")
+        self.assertIn("db_queries", entry)
+        self.assertIn("serialization_ms", entry)
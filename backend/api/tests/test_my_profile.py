@@ -0,0 +1,57 @@
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.contrib.auth.models import User
+from api.models import Pet, Shelter, Favourite, AdoptionApplication, Donation, UserProfile
+
+class TestMyProfileView(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create(username="user")
+        UserProfile.objects.create(user=self.user, phone_number="5551234", address="1 Main St")
+        self.other_user = User.objects.create(username="other")
+        self.shelter = Shelter.objects.create(name="Happy Tails Shelter", address="123 Shelter Ave")
+
+        pets = [
+            Pet.objects.create(name=name, age=2, gender="Male", domesticated=True, adoption_status="Available",
+                               pet_type="Dog", shelter_id=self.shelter)
+            for name in ("Buddy", "Max", "Rocky")
+        ]
+        for pet in pets:
+            Favourite.objects.create(adopter_user=self.user, pet=pet)
+            AdoptionApplication.objects.create(adopter_user=self.user, pet=pet)
+        Favourite.objects.create(adopter_user=self.other_user, pet=pets[0])
+        Donation.objects.create(adopter_user_id=self.user, shelter_id=self.shelter, amount="25.00")
+
+        self.client.force_authenticate(user=User.objects.get(pk=self.user.pk))  # Without the cached profile
+
+    def test_returns_every_section(self):
+        response = self.client.get("/api/me/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["user"]["username"], "user")
+        self.assertEqual(response.data["user"]["phone_number"], "5551234")
+        self.assertEqual(response.data["user"]["role"], "user")
+        self.assertEqual(len(response.data["favourites"]), 3)
+        self.assertEqual(len(response.data["applications"]), 3)
+        self.assertEqual([donation["amount"] for donation in response.data["donations"]], ["25.00"])
+
+    def test_fixed_number_of_queries(self):
+        # Profile, favourites, applications and donations: one query each, whatever the row counts
+        with self.assertNumQueries(4):
+            self.client.get("/api/me/")
+
+    def test_etag_returns_304_until_data_changes(self):
+        response = self.client.get("/api/me/")
+        etag = response["ETag"]
+        self.assertEqual(response["Cache-Control"], "private, no-cache")
+
+        response = self.client.get("/api/me/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b"")
+
+        Donation.objects.create(adopter_user_id=self.user, shelter_id=self.shelter, amount="5.00")
+        response = self.client.get("/api/me/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_requires_authentication(self):
+        self.client.force_authenticate(user=None)
+        self.assertEqual(self.client.get("/api/me/").status_code, status.HTTP_401_UNAUTHORIZED)
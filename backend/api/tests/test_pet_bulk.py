@@ -0,0 +1,77 @@
+import json
+
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import override_settings
+from api.models import Pet, Shelter
+
+class TestPetBulkView(APITestCase):
+    def setUp(self):
+        cache.clear()  # Start every test with an empty pet listing cache
+
+        self.admin_user = User.objects.create_superuser(username="admin", password="admin123")
+        self.client.force_authenticate(user=self.admin_user)
+        self.shelter = Shelter.objects.create(name="Happy Tails Shelter", address="123 Shelter Ave")
+
+    def post_body(self, body, content_type):
+        return self.client.generic("POST", "/api/pets/bulk/", body, content_type=content_type)
+
+    @override_settings(BULK_CHUNK_SIZE=2)
+    def test_import_csv_reports_row_errors(self):
+        shelter_id = self.shelter.shelter_id
+        body = (
+            "name,age,gender,domesticated,pet_type,shelter_id\n"
+            f"Buddy,2,Male,true,Dog,{shelter_id}\n"
+            f"Whiskers,3,Female,true,Cat,{shelter_id}\n"
+            f"Nobody,-1,Male,true,Dog,{shelter_id}\n"
+            "Lost,1,Female,false,Bird,999\n"
+            f"Tweety,1,Female,false,Bird,{shelter_id}\n"
+        )
+        response = self.post_body(body, "text/csv")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["created"], 3)
+        self.assertEqual(response.data["failed"], 2)
+        self.assertEqual([error["row"] for error in response.data["errors"]], [3, 4])
+        self.assertIn("shelter_id", response.data["errors"][1]["errors"])
+        self.assertEqual(sorted(Pet.objects.values_list("name", flat=True)), ["Buddy", "Tweety", "Whiskers"])
+
+    def test_import_ndjson(self):
+        lines = [
+            {"name": "Buddy", "age": 2, "gender": "Male", "domesticated": True, "shelter_id": self.shelter.shelter_id},
+            {"name": "Max", "age": 4, "gender": "Male", "domesticated": True, "shelter_id": self.shelter.shelter_id},
+        ]
+        body = "\n".join(json.dumps(line) for line in lines) + "\nnot json\n"
+        response = self.post_body(body, "application/x-ndjson")
+
+        self.assertEqual(response.data["created"], 2)
+        self.assertEqual(response.data["errors"][0]["row"], 3)
+        self.assertEqual(Pet.objects.filter(pet_type="Dog", adoption_status="Available").count(), 2)
+
+    def test_import_rejects_unknown_format_and_non_admins(self):
+        response = self.post_body("name\nBuddy\n", "text/plain")
+        self.assertEqual(response.status_code, status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
+
+        self.client.force_authenticate(user=User.objects.create_user(username="user", password="user123"))
+        response = self.post_body("name\nBuddy\n", "text/csv")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    @override_settings(BULK_CHUNK_SIZE=2)
+    def test_export_streams_every_pet_in_batches(self):
+        for i in range(5):
+            Pet.objects.create(name=f"Pet {i}", age=i + 1, gender="Male", domesticated=True,
+                               pet_type="Dog", adoption_status="Available", shelter_id=self.shelter)
+
+        response = self.client.get("/api/pets/bulk/", {"file_format": "ndjson"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        rows = [json.loads(line) for line in b"".join(response.streaming_content).decode().splitlines()]
+        self.assertEqual([row["name"] for row in rows], [f"Pet {i}" for i in range(5)])
+        self.assertEqual(rows[0]["shelter_name"], "Happy Tails Shelter")
+
+        response = self.client.get("/api/pets/bulk/", {"file_format": "csv", "min_age": 4})
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0].split(",")[:2], ["pet_id", "name"])
+        self.assertEqual(len(lines), 3)
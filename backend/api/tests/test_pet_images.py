@@ -0,0 +1,76 @@
+import shutil
+from unittest import mock
+import tempfile
+from io import BytesIO
+
+from PIL import Image
+from rest_framework.test import APITestCase
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from api.images import _process, generate_pet_image_variants, variant_name, IMAGE_VARIANTS
+from api.models import Pet, Shelter
+from api.serializers import PetSerializer
+
+def make_image(size=(2000, 1000)):
+    buffer = BytesIO()
+    Image.new("RGB", size, color=(200, 120, 40)).save(buffer, "JPEG")
+    return SimpleUploadedFile("buddy.jpg", buffer.getvalue(), content_type="image/jpeg")
+
+class TestPetImageVariants(APITestCase):
+    def setUp(self):
+        # Store uploads in a throwaway media directory
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+
+        shelter = Shelter.objects.create(name="Happy Tails Shelter", address="123 Shelter Ave")
+        self.pet = Pet.objects.create(name="Buddy", age=2, gender="Male", domesticated=True, pet_type="Dog",
+                                      adoption_status="Available", shelter_id=shelter, image=make_image())
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def process(self):
+        # Run the worker job here; closing connections would end the test's transaction, so only count the calls
+        with mock.patch("api.images.close_old_connections") as close_old_connections:
+            _process(self.pet.image.name, self.pet.shelter_id_id)
+        return close_old_connections
+
+    def test_variants_fall_back_to_none_until_generated(self):
+        data = PetSerializer(self.pet).data
+        self.assertIsNotNone(data["image"])
+        self.assertIsNone(data["image_thumb"])
+        self.assertIsNone(data["image_medium"])
+
+    def test_generate_resized_webp_variants(self):
+        generate_pet_image_variants(self.pet.image.name)
+
+        for variant, size in IMAGE_VARIANTS.items():
+            with Image.open(f"{self.media_root}/{variant_name(self.pet.image.name, variant)}") as image:
+                self.assertEqual(image.format, "WEBP")
+                self.assertEqual(image.size, (size, size // 2))  # Longest side resized, aspect ratio kept
+
+        self.assertIsNone(PetSerializer(self.pet).data["image_thumb"])  # Not recorded on the pet yet
+
+    def test_processed_variants_are_served_without_probing_storage(self):
+        self.process()
+        self.pet.refresh_from_db()
+        self.assertEqual(self.pet.variants_image, self.pet.image.name)
+
+        with mock.patch("django.core.files.storage.FileSystemStorage.exists", side_effect=AssertionError("storage probed")):
+            data = PetSerializer(self.pet).data
+        self.assertTrue(data["image_thumb"].endswith("_thumb.webp"))
+        self.assertTrue(data["image_medium"].endswith("_medium.webp"))
+
+    def test_new_upload_has_no_variants_until_processed(self):
+        self.process()
+        self.pet.refresh_from_db()
+        self.pet.image = make_image(size=(800, 600))
+        self.pet.save()
+        self.assertIsNone(PetSerializer(self.pet).data["image_thumb"])
+
+    def test_worker_connections_are_checked_around_each_job(self):
+        self.assertEqual(self.process().call_count, 2)
+        with mock.patch("api.images.generate_pet_image_variants", side_effect=OSError("disk full")):
+            self.assertEqual(self.process().call_count, 2)  # Also after a failed job
@@ -0,0 +1,58 @@
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.core.cache import cache
+from api.models import Pet, Shelter
+
+class TestPetListView(APITestCase):
+    def setUp(self):
+        cache.clear()  # Start every test with an empty pet listing cache
+
+        # Create two shelters with a mix of pets
+        self.shelter = Shelter.objects.create(name="Happy Tails Shelter", address="123 Shelter Ave")
+        self.other_shelter = Shelter.objects.create(name="Paws Place", address="456 Paws Rd")
+
+        for i in range(5):
+            Pet.objects.create(name=f"Dog {i}", age=i + 1, gender="Male", domesticated=True,
+                               pet_type="Dog", adoption_status="Available", shelter_id=self.shelter)
+        Pet.objects.create(name="Whiskers", age=3, gender="Female", domesticated=True,
+                           pet_type="Cat", adoption_status="Pending", shelter_id=self.other_shelter)
+        Pet.objects.create(name="Tweety", age=1, gender="Female", domesticated=False,
+                           pet_type="Bird", adoption_status="Adopted", shelter_id=self.other_shelter)
+
+    def test_list_is_paginated_by_cursor(self):
+        response = self.client.get("/api/pets/", {"page_size": 3})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 3)
+        self.assertIsNotNone(response.data["next"])
+
+        # Follow the cursors until the last page and make sure no pet is repeated or skipped
+        seen = [pet["pet_id"] for pet in response.data["results"]]
+        next_url = response.data["next"]
+        while next_url:
+            response = self.client.get(next_url)
+            seen += [pet["pet_id"] for pet in response.data["results"]]
+            next_url = response.data["next"]
+        self.assertEqual(seen, list(Pet.objects.order_by("pet_id").values_list("pet_id", flat=True)))
+
+    def test_filter_by_type_and_status(self):
+        response = self.client.get("/api/pets/", {"pet_type": "Dog", "adoption_status": "Available"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 5)
+
+    def test_filter_by_gender_domesticated_and_shelter(self):
+        response = self.client.get("/api/pets/", {
+            "gender": "Female",
+            "domesticated": "false",
+            "shelter_id": self.other_shelter.shelter_id,
+        })
+        self.assertEqual([pet["name"] for pet in response.data["results"]], ["Tweety"])
+
+    def test_filter_by_age_range(self):
+        response = self.client.get("/api/pets/", {"min_age": 2, "max_age": 3})
+        self.assertEqual(sorted(pet["name"] for pet in response.data["results"]), ["Dog 1", "Dog 2", "Whiskers"])
+
+    def test_invalid_filter_returns_400(self):
+        response = self.client.get("/api/pets/", {"pet_type": "Dragon", "min_age": "old"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("pet_type", response.data)
+        self.assertIn("min_age", response.data)
@@ -0,0 +1,64 @@
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from api.models import Pet, Shelter, AdoptionApplication
+
+class TestPetListCache(APITestCase):
+    def setUp(self):
+        cache.clear()  # Start every test with an empty pet listing cache
+
+        self.admin_user = User.objects.create_superuser(username="admin", password="admin123")
+        self.user = User.objects.create_user(username="user", password="user123")
+        self.shelter = Shelter.objects.create(name="Happy Tails Shelter", address="123 Shelter Ave")
+        self.other_shelter = Shelter.objects.create(name="Paws Place", address="456 Paws Rd")
+        self.pet = Pet.objects.create(name="Buddy", age=2, gender="Male", domesticated=True,
+                                      pet_type="Dog", adoption_status="Available", shelter_id=self.shelter)
+
+    def get_statuses(self, params=None):
+        response = self.client.get("/api/pets/", params or {})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return {pet["name"]: pet["adoption_status"] for pet in response.data["results"]}
+
+    def test_repeat_request_is_served_from_cache(self):
+        with self.assertNumQueries(2):  # Validators aggregate and the page
+            self.get_statuses()
+        with self.assertNumQueries(0):
+            self.get_statuses()
+
+    def test_filters_are_part_of_the_key(self):
+        self.assertEqual(self.get_statuses(), {"Buddy": "Available"})
+        self.assertEqual(self.get_statuses({"pet_type": "Cat"}), {})
+
+    def test_pet_update_invalidates_listing(self):
+        self.get_statuses()
+        self.client.force_authenticate(user=self.admin_user)
+        self.client.patch(f"/api/pets/{self.pet.pet_id}/", {"adoption_status": "Adopted"}, format="json")
+        self.assertEqual(self.get_statuses(), {"Buddy": "Adopted"})
+
+    def test_application_workflow_invalidates_listing(self):
+        self.get_statuses()
+
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post("/api/adoption-application/", {"pet_id": self.pet.pet_id}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.get_statuses(), {"Buddy": "Pending"})
+
+        application = AdoptionApplication.objects.get()
+        self.client.force_authenticate(user=self.admin_user)
+        self.client.patch(f"/api/adoption-application/{application.application_id}/update-status/",
+                          {"application_status": "Approved"}, format="json")
+        self.assertEqual(self.get_statuses(), {"Buddy": "Adopted"})
+
+    def test_write_to_other_shelter_keeps_scoped_listing_cached(self):
+        self.get_statuses({"shelter_id": self.shelter.shelter_id})
+
+        self.client.force_authenticate(user=self.admin_user)
+        self.client.post("/api/register-pet/", {
+            "name": "Whiskers", "age": 3, "gender": "Female", "domesticated": True,
+            "pet_type": "Cat", "adoption_status": "Available", "shelter_id": self.other_shelter.shelter_id,
+        }, format="json")
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get_statuses({"shelter_id": self.shelter.shelter_id}), {"Buddy": "Available"})
+        self.assertEqual(self.get_statuses(), {"Buddy": "Available", "Whiskers": "Available"})
@@ -0,0 +1,141 @@
+from io import StringIO
+from unittest import mock
+
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from api.geo import ShelterLocationIndex, geocode, haversine_km, shelter_location_index
+from api.models import Pet, Shelter
+
+DOWNTOWN = (51.0478, -114.0700)  # Calgary, T2P
+
+class TestPetNearbyView(APITestCase):
+    def setUp(self):
+        shelter_location_index.reset()  # Rebuild from this test's database on the first query
+
+        # Geocoded from the local table: a Calgary postal code area, a city name, and no match
+        self.downtown = Shelter.objects.create(name="Downtown Shelter", address="100 7 Ave SW, Calgary, AB T2P 1A1")
+        self.airdrie = Shelter.objects.create(name="Airdrie Shelter", address="5 Main St, Airdrie, AB")
+        self.unknown = Shelter.objects.create(name="Unknown Shelter", address="1 Nowhere Lane")
+
+        for shelter, names in ((self.downtown, ["Buddy", "Max", "Rex"]), (self.airdrie, ["Whiskers"]), (self.unknown, ["Ghost"])):
+            for name in names:
+                Pet.objects.create(name=name, age=2, gender="Male", domesticated=True, pet_type="Dog",
+                                   adoption_status="Available", shelter_id=shelter)
+        Pet.objects.create(name="Adopted", age=2, gender="Male", domesticated=True, pet_type="Dog",
+                           adoption_status="Adopted", shelter_id=self.downtown)
+
+    def nearby(self, **params):
+        params = {"lat": DOWNTOWN[0], "lon": DOWNTOWN[1], **params}
+        response = self.client.get("/api/pets/nearby/", params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_geocoding_from_the_local_table(self):
+        self.assertEqual((self.downtown.latitude, self.downtown.longitude), DOWNTOWN)
+        self.assertAlmostEqual(self.airdrie.latitude, 51.2917)
+        self.assertIsNone(self.unknown.latitude)
+        self.assertEqual(geocode("12 Gaetz Ave, Red Deer"), (52.2681, -113.8112))
+
+    def test_available_pets_sorted_by_distance(self):
+        data = self.nearby(radius=50)
+        self.assertEqual(data["count"], 4)
+        self.assertEqual([pet["name"] for pet in data["results"]], ["Buddy", "Max", "Rex", "Whiskers"])
+        self.assertEqual(data["results"][0]["distance_km"], 0)
+        expected = round(haversine_km(*DOWNTOWN, self.airdrie.latitude, self.airdrie.longitude), 2)
+        self.assertEqual(data["results"][-1]["distance_km"], expected)
+
+        self.assertEqual([pet["name"] for pet in self.nearby(radius=10)["results"]], ["Buddy", "Max", "Rex"])
+
+    def test_pagination_across_shelters(self):
+        pages = [self.nearby(radius=50, limit=3, offset=offset) for offset in (0, 2, 4)]
+        self.assertEqual([[pet["name"] for pet in page["results"]] for page in pages],
+                         [["Buddy", "Max", "Rex"], ["Rex", "Whiskers"], []])
+        self.assertEqual({page["count"] for page in pages}, {4})
+
+    def test_query_count(self):
+        self.nearby()  # Builds the index
+        with self.assertNumQueries(2):  # Per-shelter counts and the page
+            self.nearby(radius=50, limit=2, offset=1)
+
+    def test_index_follows_saves_and_deletes(self):
+        self.assertEqual(self.nearby(radius=5)["count"], 3)
+
+        # Moving a shelter by address re-geocodes it and updates the index
+        self.airdrie.address = "Unit 4, 200 Centre St, Calgary T2G 2B3"
+        self.airdrie.latitude = self.airdrie.longitude = None
+        self.airdrie.save()
+        self.assertEqual(self.nearby(radius=5)["count"], 4)
+
+        self.downtown.delete()
+        self.assertEqual([pet["name"] for pet in self.nearby(radius=5)["results"]], ["Whiskers"])
+
+    def moving_airdrie_while_reading(self):
+        def read_then_move():
+            rows = read()  # The index reads the database before these writes
+            self.airdrie.latitude, self.airdrie.longitude = DOWNTOWN
+            self.airdrie.save()
+            self.unknown.latitude, self.unknown.longitude = DOWNTOWN
+            self.unknown.save()
+            self.downtown.delete()
+            return rows
+
+        read = ShelterLocationIndex._read
+        return mock.patch.object(ShelterLocationIndex, "_read", side_effect=read_then_move)
+
+    def assert_moves_indexed(self):
+        self.assertEqual(sorted(pet["name"] for pet in self.nearby(radius=5)["results"]), ["Ghost", "Whiskers"])
+        self.assertIsNone(shelter_location_index._pending)
+
+    def test_saves_during_first_build_are_kept(self):
+        with self.moving_airdrie_while_reading():
+            shelter_location_index.ensure_built()
+        self.assert_moves_indexed()
+
+    def test_saves_during_background_rebuild_are_kept(self):
+        self.nearby()  # Build the index
+        shelter_location_index._built_at = 0.0  # Make it old enough to refresh
+        with mock.patch("api.geo.threading.Thread") as thread:
+            shelter_location_index.ensure_built()
+        rebuild = thread.call_args.kwargs["target"]
+
+        with self.moving_airdrie_while_reading():
+            rebuild()  # Run the background rebuild in this thread
+        self.assert_moves_indexed()
+
+    def test_address_update_through_the_api(self):
+        self.client.force_authenticate(user=User.objects.create_superuser(username="admin", password="admin123"))
+        response = self.client.patch(f"/api/admin/shelter/{self.unknown.shelter_id}/",
+                                     {"address": "9 Bow St, Cochrane"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual((response.data["latitude"], response.data["longitude"]), (51.1894, -114.4669))
+
+        response = self.client.patch(f"/api/admin/shelter/{self.unknown.shelter_id}/", {"latitude": 50}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_invalid_parameters(self):
+        for params in ({}, {"lat": "north", "lon": 0}, {"lat": 95, "lon": 0}, {"lat": 0, "lon": 0, "radius": 0},
+                       {"lat": 0, "lon": 0, "radius": 1000}, {"lat": 0, "lon": 0, "limit": 0}):
+            response = self.client.get("/api/pets/nearby/", params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, params)
+
+    def test_geocode_command(self):
+        Shelter.objects.filter(pk=self.downtown.pk).update(latitude=None, longitude=None)
+        out = StringIO()
+        call_command("geocode_shelters", stdout=out)
+        self.assertIn("Geocoded 1 shelter(s); 1 address(es) could not be located.", out.getvalue())
+        self.assertIn("after their next index rebuild", out.getvalue())  # Other processes' indexes are not reset
+        self.downtown.refresh_from_db()
+        self.assertEqual((self.downtown.latitude, self.downtown.longitude), DOWNTOWN)
+
+class TestShelterLocationIndex(APITestCase):
+    def test_wraps_around_the_antimeridian_and_wide_radii(self):
+        for name, lat, lon in (("East", 0.0, 179.9), ("West", 0.0, -179.9), ("North", 10.0, 0.0)):
+            Shelter.objects.create(name=name, address="", latitude=lat, longitude=lon)
+        index = ShelterLocationIndex()
+        index.build()
+        ids = dict(Shelter.objects.values_list("name", "shelter_id"))
+
+        self.assertEqual([shelter_id for _, shelter_id in index.nearby(0.0, 179.95, 50)], [ids["East"], ids["West"]])
+        self.assertEqual([shelter_id for _, shelter_id in index.nearby(0.0, 0.0, 20100)], [ids["North"], ids["East"], ids["West"]])
@@ -0,0 +1,67 @@
+from unittest import mock
+
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import override_settings
+from api.cache import pet_row_cache, pet_row_cache_key
+from api.models import Pet, Shelter
+from api.serializers import PetSerializer
+
+class TestPetRowCache(APITestCase):
+    def setUp(self):
+        cache.clear()  # Start every test with an empty pet listing cache
+        pet_row_cache().clear()
+
+        self.admin_user = User.objects.create_superuser(username="admin", password="admin123")
+        self.shelter = Shelter.objects.create(name="Happy Tails Shelter", address="123 Shelter Ave")
+        self.other_shelter = Shelter.objects.create(name="Paws Place", address="456 Paws Rd")
+        for i, shelter in enumerate([self.shelter] * 3 + [self.other_shelter] * 2):
+            Pet.objects.create(name=f"Pet {i}", age=i + 1, gender="Male", domesticated=True,
+                               pet_type="Dog", adoption_status="Available", shelter_id=shelter)
+
+    def list_pets(self, params=None):
+        cache.clear()  # Rebuild the page (as after any write), so only the row cache can help
+        response = self.client.get("/api/pets/", params or {})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.json()["results"]
+
+    def count_serialized_rows(self, params=None):
+        with mock.patch.object(PetSerializer, "to_representation", autospec=True,
+                               side_effect=PetSerializer.to_representation) as serialized:
+            self.list_pets(params)
+        return serialized.call_count
+
+    def test_same_output_as_uncached_serializer(self):
+        cached = self.list_pets()
+        self.assertEqual(self.list_pets(), cached)  # Now assembled from cached rows
+        with override_settings(PET_ROW_CACHE_ALIAS=""):
+            self.assertEqual(self.list_pets(), cached)
+        self.assertEqual(self.list_pets({"fields": "name,shelter_name"}),
+                         [{"name": pet["name"], "shelter_name": pet["shelter_name"]} for pet in cached])
+
+    def test_only_changed_rows_are_serialized(self):
+        self.assertEqual(self.count_serialized_rows(), 5)
+        self.assertEqual(self.count_serialized_rows(), 0)
+        self.assertEqual(self.count_serialized_rows({"fields": "pet_id,name"}), 0)  # Cut from the full rows
+
+        pet = Pet.objects.first()
+        pet.adoption_status = "Pending"
+        pet.save()
+        self.assertEqual(self.count_serialized_rows(), 1)
+        self.assertEqual(self.list_pets()[0]["adoption_status"], "Pending")
+
+    def test_shelter_save_reserializes_its_pets(self):
+        self.list_pets()
+        self.client.force_authenticate(user=self.admin_user)
+        self.client.patch(f"/api/admin/shelter/{self.shelter.shelter_id}/", {"name": "Happier Tails"}, format="json")
+
+        self.assertEqual(self.count_serialized_rows(), 3)
+        self.assertEqual([pet["shelter_name"] for pet in self.list_pets()],
+                         ["Happier Tails"] * 3 + ["Paws Place"] * 2)
+
+    def test_rows_without_updated_at_are_not_cached(self):
+        pets = Pet.objects.select_related("shelter_id").only("pet_id", "name", "shelter_id__name")
+        self.assertIsNone(pet_row_cache_key(pets[0]))
+        self.assertEqual(len(PetSerializer(pets, many=True).data), 5)
@@ -0,0 +1,91 @@
+from unittest import mock
+
+from rest_framework.test import APITestCase
+from rest_framework import status
+from api.models import Pet, Shelter
+from api.search import PetSearchIndex, pet_search_index
+
+class TestPetSearchView(APITestCase):
+    def setUp(self):
+        pet_search_index.reset()  # Rebuild from this test's database on the first search
+
+        self.shelter = Shelter.objects.create(name="Happy Tails Shelter", address="123 Maple Street")
+        self.other_shelter = Shelter.objects.create(name="Paws Place", address="456 Oak Road")
+        self.buddy = Pet.objects.create(name="Buddy", age=2, gender="Male", domesticated=True,
+                                        pet_type="Dog", adoption_status="Available", shelter_id=self.shelter)
+        self.whiskers = Pet.objects.create(name="Whiskers", age=3, gender="Female", domesticated=True,
+                                           pet_type="Cat", adoption_status="Available", shelter_id=self.other_shelter)
+        self.max = Pet.objects.create(name="Max", age=4, gender="Male", domesticated=True,
+                                      pet_type="Dog", adoption_status="Available", shelter_id=self.other_shelter)
+
+    def search(self, query):
+        response = self.client.get("/api/pets/search/", {"q": query})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [pet["name"] for pet in response.data["results"]]
+
+    def test_exact_and_prefix_match(self):
+        self.assertEqual(self.search("buddy"), ["Buddy"])
+        self.assertEqual(self.search("whisk"), ["Whiskers"])
+
+    def test_typo_tolerance(self):
+        self.assertEqual(self.search("whiskrs"), ["Whiskers"])
+
+    def test_shelter_fields_and_multiple_terms(self):
+        self.assertEqual(self.search("paws"), ["Whiskers", "Max"])
+        self.assertEqual(self.search("dog oak"), ["Max"])
+
+    def test_name_match_ranks_above_shelter_match(self):
+        Pet.objects.create(name="Oakley", age=1, gender="Female", domesticated=True,
+                           pet_type="Rabbit", adoption_status="Available", shelter_id=self.shelter)
+        self.assertEqual(self.search("oak"), ["Oakley", "Whiskers", "Max"])
+
+    def test_index_follows_saves_and_deletes(self):
+        self.search("buddy")  # Build the index
+
+        self.buddy.name = "Rex"
+        self.buddy.save()
+        self.max.delete()
+        self.other_shelter.name = "Furry Friends"
+        self.other_shelter.save()
+
+        self.assertEqual(self.search("buddy"), [])
+        self.assertEqual(self.search("rex"), ["Rex"])
+        self.assertEqual(self.search("max"), [])
+        self.assertEqual(self.search("furry"), ["Whiskers"])
+
+    def saving_while_reading(self):
+        def read_then_save():
+            rows = read()  # The index reads the database before these writes
+            self.buddy.name = "Rex"
+            self.buddy.save()
+            self.max.delete()
+            return rows
+
+        read = PetSearchIndex._read
+        return mock.patch.object(PetSearchIndex, "_read", side_effect=read_then_save)
+
+    def assert_saves_indexed(self):
+        self.assertEqual(self.search("buddy"), [])
+        self.assertEqual(self.search("rex"), ["Rex"])
+        self.assertEqual(self.search("max"), [])
+        self.assertIsNone(pet_search_index._pending)
+
+    def test_saves_during_background_rebuild_are_kept(self):
+        self.search("buddy")  # Build the index
+        pet_search_index._built_at = 0.0  # Make it old enough to refresh
+        with mock.patch("api.search.threading.Thread") as thread:
+            pet_search_index.ensure_built()
+        rebuild = thread.call_args.kwargs["target"]
+
+        with self.saving_while_reading():
+            rebuild()  # Run the background rebuild in this thread
+        self.assert_saves_indexed()
+
+    def test_saves_during_first_build_are_kept(self):
+        with self.saving_while_reading():
+            pet_search_index.ensure_built()
+        self.assert_saves_indexed()
+
+    def test_missing_query_returns_400(self):
+        response = self.client.get("/api/pets/search/")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
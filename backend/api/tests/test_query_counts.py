@@ -0,0 +1,53 @@
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.core.cache import cache
+from django.contrib.auth.models import User
+from api.models import Pet, Shelter, AdoptionApplication, Favourite
+
+# Number of rows created per table; large enough that an N+1 regression would blow the budget
+ROWS = 10
+
+class TestListQueryCounts(APITestCase):
+    """Each list endpoint must run a constant number of queries, regardless of row count."""
+
+    def setUp(self):
+        cache.clear()  # Start every test with an empty pet listing cache
+
+        self.admin_user = User.objects.create_superuser(username="admin", password="admin123")
+        self.user = User.objects.create_user(username="user", password="user123", first_name="Ada", last_name="Lovelace")
+
+        for i in range(ROWS):
+            shelter = Shelter.objects.create(name=f"Shelter {i}", address=f"{i} Shelter Ave")
+            pet = Pet.objects.create(name=f"Pet {i}", age=2, gender="Male", domesticated=True,
+                                     pet_type="Dog", adoption_status="Pending", shelter_id=shelter)
+            AdoptionApplication.objects.create(pet=pet, adopter_user=self.user)
+            Favourite.objects.create(pet=pet, adopter_user=self.user)
+
+    def assertEndpointQueries(self, user, url, num_queries):
+        # Authenticate without hitting the database so only the view's own queries are counted
+        self.client.force_authenticate(user=user)
+        with self.assertNumQueries(num_queries):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response
+
+    def test_pet_list(self):
+        # The ETag/Last-Modified aggregate, then the page itself
+        response = self.assertEndpointQueries(None, "/api/pets/", 2)
+        self.assertEqual(len(response.data["results"]), ROWS)
+        self.assertTrue(all(pet["shelter_name"] for pet in response.data["results"]))
+
+    def test_adoption_application_list_as_admin(self):
+        response = self.assertEndpointQueries(self.admin_user, "/api/adoption-application/list/", 1)
+        self.assertEqual(len(response.data), ROWS)
+        self.assertEqual(response.data[0]["adopter_user"], {"first_name": "Ada", "last_name": "Lovelace"})
+
+    def test_adoption_application_list_as_user(self):
+        response = self.assertEndpointQueries(self.user, "/api/adoption-application/list/", 1)
+        self.assertTrue(all(application["pet_name"] for application in response.data))
+
+    def test_favourite_list(self):
+        # The ETag/Last-Modified aggregate, then the favourites with their pets
+        response = self.assertEndpointQueries(self.user, "/api/favourite/list/", 2)
+        self.assertEqual(len(response.data), ROWS)
+        self.assertTrue(all(favourite["pet"]["shelter_name"] for favourite in response.data))
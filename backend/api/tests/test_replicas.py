@@ -0,0 +1,92 @@
+from rest_framework.test import APITransactionTestCase
+from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connections
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from api.authentication import user_cache
+from api.models import Pet, Shelter
+from api.replicas import PrimaryReplicaRouter
+
+# "replica" mirrors the test database (see DATABASES in settings.py), so both aliases see the same rows
+@override_settings(DATABASE_REPLICAS=['replica'], REPLICA_STICKY_SECONDS=10)
+class TestReplicaRouting(APITransactionTestCase):
+    databases = {'default', 'replica'}
+
+    def setUp(self):
+        cache.clear()  # Empty pet listing cache and no users pinned to the primary
+        user_cache.clear()
+
+        self.user = User.objects.create(username="user")
+        self.shelter = Shelter.objects.create(name="Happy Tails Shelter", address="123 Shelter Ave")
+        self.pet = Pet.objects.create(name="Buddy", age=2, gender="Male", domesticated=True, adoption_status="Available",
+                                      pet_type="Dog", shelter_id=self.shelter)
+        cache.clear()  # Creating the pet marked the catalogue as written
+
+    def login(self, user):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+
+    def request(self, method, url, data=None):
+        # Returns the response and the number of queries run on (primary, replica)
+        with CaptureQueriesContext(connections['default']) as primary, CaptureQueriesContext(connections['replica']) as replica:
+            response = getattr(self.client, method)(url, data, format="json")
+        return response, (len(primary), len(replica))
+
+    def test_reads_use_the_replica(self):
+        response, (primary, replica) = self.request("get", "/api/pets/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(primary, 0)
+        self.assertGreater(replica, 0)
+
+    def test_writes_use_the_primary(self):
+        self.login(self.user)
+        response, (primary, replica) = self.request("post", "/api/adoption-application/", {"pet_id": self.pet.pet_id})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertGreater(primary, 0)
+        self.assertEqual(replica, 0)  # Including the validation reads of the write request
+
+    def test_user_sticks_to_the_primary_after_a_write(self):
+        other_user = User.objects.create(username="other")
+        self.login(self.user)
+        self.request("post", "/api/adoption-application/", {"pet_id": self.pet.pet_id})
+
+        response, (primary, replica) = self.request("get", "/api/adoption-application/list/")
+        self.assertEqual(len(response.data), 1)
+        self.assertEqual((replica, primary > 0), (0, True))
+
+        # Other users keep reading from the replica
+        self.login(other_user)
+        response, (primary, replica) = self.request("get", "/api/adoption-application/list/")
+        self.assertEqual((primary, replica > 0), (0, True))
+
+    def test_failed_writes_do_not_pin(self):
+        self.login(self.user)
+        response, _ = self.request("post", "/api/adoption-application/", {"pet_id": 999999})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        _, (primary, replica) = self.request("get", "/api/adoption-application/list/")
+        self.assertEqual((primary, replica > 0), (0, True))
+
+    def test_pet_list_is_rebuilt_from_the_primary_after_a_catalogue_write(self):
+        self.login(self.user)
+        self.request("post", "/api/adoption-application/", {"pet_id": self.pet.pet_id})
+        self.client.credentials()  # Anonymous readers get the fresh page too
+
+        response, (primary, replica) = self.request("get", "/api/pets/")
+        self.assertEqual(response.data["results"][0]["adoption_status"], "Pending")
+        self.assertEqual(replica, 0)
+        self.assertGreater(primary, 0)
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_without_replicas_everything_uses_the_primary(self):
+        _, (primary, replica) = self.request("get", "/api/pets/")
+        self.assertEqual((primary > 0, replica), (True, 0))
+
+    def test_migrations_only_run_on_the_primary(self):
+        router = PrimaryReplicaRouter()
+        self.assertTrue(router.allow_migrate('default', 'api'))
+        self.assertFalse(router.allow_migrate('replica', 'api'))
+        self.assertEqual(router.db_for_read(Pet), 'default')  # Outside a request
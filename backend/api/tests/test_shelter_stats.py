@@ -0,0 +1,85 @@
+from decimal import Decimal
+
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from api.models import Pet, Shelter, ShelterStats, AdoptionApplication
+
+class TestShelterStats(APITestCase):
+    def setUp(self):
+        cache.clear()  # Start every test with an empty pet listing cache
+
+        self.admin_user = User.objects.create_superuser(username="admin", password="admin123")
+        self.user = User.objects.create(username="user")
+        self.shelter = Shelter.objects.create(name="Happy Tails Shelter", address="123 Shelter Ave")
+        self.empty_shelter = Shelter.objects.create(name="Paws Place", address="456 Paws Rd")
+
+    def get_stats(self):
+        self.client.force_authenticate(user=self.admin_user)
+        response = self.client.get("/api/admin/shelters/stats/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return {row["shelter_name"]: row for row in response.data}
+
+    def run_workflow(self):
+        # Create two pets, apply for one, favourite both, donate and approve the application
+        self.client.force_authenticate(user=self.admin_user)
+        pet_ids = []
+        for name in ("Buddy", "Max"):
+            response = self.client.post("/api/register-pet/", {
+                "name": name, "age": 2, "gender": "Male", "domesticated": True,
+                "pet_type": "Dog", "adoption_status": "Available", "shelter_id": self.shelter.shelter_id,
+            }, format="json")
+            pet_ids.append(response.data["pet_id"])
+
+        self.client.force_authenticate(user=self.user)
+        self.client.post("/api/adoption-application/", {"pet_id": pet_ids[0]}, format="json")
+        for pet_id in pet_ids:
+            self.client.post(f"/api/favourite/{pet_id}/add/")
+        self.client.delete(f"/api/favourite/{pet_ids[1]}/remove/")
+        self.client.post("/api/donate/", {"shelter_id": self.shelter.shelter_id, "amount": "25.50"}, format="json")
+
+        application = AdoptionApplication.objects.get()
+        self.client.force_authenticate(user=self.admin_user)
+        self.client.patch(f"/api/adoption-application/{application.application_id}/update-status/",
+                          {"application_status": "Approved"}, format="json")
+
+    def test_counters_follow_write_paths(self):
+        self.run_workflow()
+        stats = self.get_stats()
+
+        self.assertEqual(stats["Happy Tails Shelter"]["available_pets"], 1)
+        self.assertEqual(stats["Happy Tails Shelter"]["pending_pets"], 0)
+        self.assertEqual(stats["Happy Tails Shelter"]["adopted_pets"], 1)
+        self.assertEqual(stats["Happy Tails Shelter"]["open_applications"], 0)
+        self.assertEqual(stats["Happy Tails Shelter"]["favourites"], 1)
+        self.assertEqual(Decimal(stats["Happy Tails Shelter"]["donation_total"]), Decimal("25.50"))
+        self.assertEqual(stats["Paws Place"]["available_pets"], 0)  # No stats row yet, reported as zeros
+
+    def test_pet_delete_removes_its_favourites_and_applications(self):
+        pet = Pet.objects.create(name="Buddy", age=2, gender="Male", domesticated=True,
+                                 pet_type="Dog", adoption_status="Available", shelter_id=self.shelter)
+        call_command("rebuild_shelter_stats", stdout=open("/dev/null", "w"))
+        self.client.force_authenticate(user=self.user)
+        self.client.post(f"/api/favourite/{pet.pet_id}/add/")
+        self.client.post("/api/adoption-application/", {"pet_id": pet.pet_id}, format="json")
+
+        self.client.force_authenticate(user=self.admin_user)
+        self.client.delete(f"/api/pets/{pet.pet_id}/")
+        stats = ShelterStats.objects.get(shelter=self.shelter)
+        self.assertEqual((stats.pending_pets, stats.open_applications, stats.favourites), (0, 0, 0))
+
+    def test_rebuild_matches_incremental_counters(self):
+        self.run_workflow()
+        incremental = self.get_stats()
+
+        ShelterStats.objects.all().delete()
+        call_command("rebuild_shelter_stats", stdout=open("/dev/null", "w"))
+        self.assertEqual(self.get_stats(), incremental)
+
+    def test_dashboard_is_a_single_query(self):
+        self.run_workflow()
+        self.client.force_authenticate(user=self.admin_user)
+        with self.assertNumQueries(1):
+            self.client.get("/api/admin/shelters/stats/")
@@ -0,0 +1,56 @@
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from api.models import AdoptionApplication, Pet, Shelter
+
+class TestSparseFields(APITestCase):
+    def setUp(self):
+        cache.clear()  # Start every test with an empty pet listing cache
+
+        self.admin_user = User.objects.create_superuser(username="admin", password="admin123")
+        self.shelter = Shelter.objects.create(name="Happy Tails Shelter", address="123 Shelter Ave")
+        self.pet = Pet.objects.create(name="Buddy", age=2, gender="Male", domesticated=True, adoption_status="Available",
+                                      pet_type="Dog", shelter_id=self.shelter)
+        self.client.force_authenticate(user=self.admin_user)
+
+    def test_pet_list_returns_only_the_requested_fields(self):
+        response = self.client.get("/api/pets/", {"fields": "name,pet_type,image_thumb"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["results"], [{"name": "Buddy", "pet_type": "Dog", "image_thumb": None}])
+
+    def test_pet_list_pages_are_cached_per_fieldset(self):
+        self.assertEqual(set(self.client.get("/api/pets/", {"fields": "name"}).json()["results"][0]), {"name"})
+        self.assertIn("shelter_name", self.client.get("/api/pets/").json()["results"][0])
+
+    def test_pet_detail_search_and_nearby(self):
+        self.assertEqual(self.client.get(f"/api/pets/{self.pet.pet_id}/", {"fields": "pet_id,name"}).json(),
+                         {"pet_id": self.pet.pet_id, "name": "Buddy"})
+        self.assertEqual(self.client.get("/api/pets/search/", {"q": "buddy", "fields": "name"}).json()["results"],
+                         [{"name": "Buddy"}])
+
+    def test_shelter_and_application_endpoints(self):
+        response = self.client.get("/api/admin/shelters/", {"fields": "shelter_id,name"})
+        self.assertEqual(response.json(), [{"shelter_id": self.shelter.shelter_id, "name": "Happy Tails Shelter"}])
+        response = self.client.get(f"/api/admin/shelter/{self.shelter.shelter_id}/", {"fields": "address"})
+        self.assertEqual(response.json(), {"address": "123 Shelter Ave"})
+
+        application = AdoptionApplication.objects.create(pet=self.pet, adopter_user=self.admin_user)
+        response = self.client.get("/api/adoption-application/list/", {"fields": "application_id,application_status"})
+        self.assertEqual(response.json(), [{"application_id": application.application_id, "application_status": "Pending"}])
+        response = self.client.get(f"/api/adoption-application/{application.application_id}/", {"fields": "pet_name"})
+        self.assertEqual(response.json(), {"pet_name": "Buddy"})
+
+    def test_unknown_field_is_rejected(self):
+        for url in ("/api/pets/", f"/api/pets/{self.pet.pet_id}/", "/api/admin/shelters/", "/api/adoption-application/list/"):
+            response = self.client.get(url, {"fields": "name,password"})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, url)
+            self.assertIn("password", response.json()["error"])
+        self.assertEqual(self.client.get("/api/pets/", {"fields": ""}).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_writes_ignore_fields(self):
+        # The fieldset only shapes GET responses; updates still validate and return every field
+        response = self.client.patch(f"/api/admin/shelter/{self.shelter.shelter_id}/?fields=name", {"phone_number": "5551234"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["phone_number"], "5551234")
+        self.assertIn("address", response.json())
@@ -0,0 +1,45 @@
+import subprocess
+import sys
+from io import StringIO
+
+from django.conf import settings
+from django.core.management import call_command
+from django.test import SimpleTestCase
+
+from api.startup import STAGES, parse_importtime
+
+REPORT = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 | site
+stage: settings
+import time:        40 |         40 |     dotenv.main
+import time:       300 |        340 |   dotenv
+import time:      2000 |       2340 | adoptify_backend.settings
+stage: django.setup
+import time:      5000 |       5000 | api.models
+"""
+
+class TestParseImporttime(SimpleTestCase):
+    def test_attributes_modules_to_stages(self):
+        rows = parse_importtime(REPORT)
+        self.assertEqual(rows[0], (None, "site", 120, 120, 0))  # Interpreter startup, before the first stage
+        self.assertEqual(rows[1], ("settings", "dotenv.main", 40, 40, 2))
+        self.assertEqual(rows[3], ("settings", "adoptify_backend.settings", 2000, 2340, 0))
+        self.assertEqual(rows[4], ("django.setup", "api.models", 5000, 5000, 0))
+        self.assertEqual(len(rows), 5)  # The header is skipped
+
+class TestProfileStartupCommand(SimpleTestCase):
+    def test_reports_every_stage(self):
+        out = StringIO()
+        call_command("profile_startup", runs=1, top=5, stdout=out)
+        for stage in STAGES:
+            self.assertIn(stage, out.getvalue())
+        # Which api modules make the top 5 varies with timing noise; the section must list some
+        self.assertRegex(out.getvalue().partition("api modules")[2], r"\) +api\.\w+")
+
+class TestLazyStartupImports(SimpleTestCase):
+    def test_setup_and_urlconf_do_not_import_pillow(self):
+        # Pillow is only needed once an image is resized (see api/images.py)
+        probe = ("import sys, django; django.setup(); import adoptify_backend.urls; "
+                 "print('PIL' in sys.modules)")
+        result = subprocess.run([sys.executable, "-c", probe], cwd=settings.BASE_DIR, capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip(), "False")
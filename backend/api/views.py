@@ -13,6 +13,9 @@ Each view interacts with the database models and serializers to provide the requ
 """
 
 # backend/api/views.py
+
+import logging
+
 from rest_framework.decorators import api_view, renderer_classes
 from rest_framework.response import Response
 from rest_framework.renderers import JSONRenderer
@@ -22,12 +25,34 @@ from rest_framework.views import APIView
 from rest_framework.generics import ListAPIView
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 
-from django.http import JsonResponse
+from django.http import HttpResponse, HttpResponseForbidden, JsonResponse, StreamingHttpResponse
 from django.contrib.auth.models import User
 from django.shortcuts import get_object_or_404
-
-from .models import AdoptionApplication, Pet, Shelter, ShelterManagement, Favourite, Adopter, Donation
-from .serializers import UserSerializer, ApplicationSerializer, AdminUserSerializer, PetSerializer, ShelterSerializer, ShelterManagementSerializer, FavouriteSerializer, DonationSerializer
+from django.core.cache import cache
+from django.conf import settings
+from django.db import DatabaseError, connection
+from django.db.models import Case, Count, When
+from django.views.decorators.http import require_safe
+
+from .models import AdoptionApplication, Pet, Shelter, ShelterManagement, Favourite, Adopter, Donation, ShelterStats
+from .serializers import UserSerializer, ApplicationSerializer, AdminUserSerializer, PetSerializer, ShelterSerializer, ShelterManagementSerializer, FavouriteSerializer, DonationSerializer, ShelterStatsSerializer
+from .pagination import PetCursorPagination
+from .filters import filter_pets
+from .cache import pet_list_cache_key, bump_pet_list_version, pet_list_cache_timeout
+from .replicas import catalogue_recently_written, use_primary
+from .search import pet_search_index
+from .geo import shelter_location_index
+from .images import schedule_pet_image_variants
+from .media import media_response
+from . import bulk, reports, metrics
+from .services import submit_application, review_application, review_applications, APPLICATION_STATUSES
+from .conditional import conditional_response, queryset_validators, not_modified, not_modified_response, set_validators
+from .stats import record_pet_added, record_pet_changed, record_pet_deleted, record_status_change, OPEN_APPLICATION_STATUS
+
+logger = logging.getLogger(__name__)
+
+# Fields a serialized pet depends on (its own row and its shelter's name), for ETag/Last-Modified
+PET_VALIDATOR_FIELDS = ('updated_at', 'shelter_id__updated_at')
 
 # -------------------------------------- Health Check Endpoint -------------------------------------------
 # Check if the backend is working (Test Endpoint)
@@ -49,6 +74,30 @@ def test(request):
 def health_check(request):
     return JsonResponse({"status": "OK", "message": "Backend is working"})
 
+# Readiness Check (the database answers queries); used by the container health check
+def readiness_check(request):
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+    except DatabaseError:
+        return JsonResponse({"status": "unavailable", "message": "Database is not reachable"}, status=503)
+    return JsonResponse({"status": "OK", "message": "Backend is ready"})
+
+# Prometheus Metrics Endpoint (per-endpoint request metrics, see api/metrics.py)
+def metrics_view(request):
+    token = settings.METRICS_TOKEN
+    if token:
+        if request.headers.get('Authorization') != f'Bearer {token}':
+            return HttpResponseForbidden()
+    elif not settings.DEBUG:
+        return HttpResponseForbidden()  # Set METRICS_TOKEN to expose metrics in production
+    return HttpResponse(metrics.render_prometheus(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+# Uploaded Media (pet photos), streamed or handed to the front web server per MEDIA_SERVING (see api/media.py)
+@require_safe
+def media_view(request, path):
+    return media_response(request, path)
+
 # ---------------------------------------- User Details -------------------------------------------
 
 # Get User Details
@@ -63,6 +112,28 @@ class UserDetailsView(APIView):
         user_data = serializer.data
         user_data["role"] = "admin" if user.is_staff else "user"
         return Response(user_data)
+
+# Current User's Profile (details, favourites, applications and donations in one request)
+class MyProfileView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        # One query per section; the combined payload is revalidated with its ETag
+        user = request.user
+        user_data = UserSerializer(user).data
+        user_data["role"] = "admin" if user.is_staff else "user"
+
+        favourites = FavouriteSerializer.setup_eager_loading(Favourite.objects.filter(adopter_user=user))
+        applications = ApplicationSerializer.setup_eager_loading(AdoptionApplication.objects.filter(adopter_user=user))
+        donations = Donation.objects.filter(adopter_user_id=user).order_by('-donation_date')
+
+        data = {
+            "user": user_data,
+            "favourites": FavouriteSerializer(favourites, many=True).data,
+            "applications": ApplicationSerializer(applications, many=True).data,
+            "donations": DonationSerializer(donations, many=True).data,
+        }
+        return conditional_response(request, data)
     
 # -------------------------------------- User Registration -------------------------------------------
 
@@ -93,12 +164,17 @@ class CreateAdoptionApplication(generics.CreateAPIView):
     serializer_class = ApplicationSerializer
     permission_classes = [IsAuthenticated]
 
-    def perform_create(self, serializer):
-        # Automatically set the adopter_user and update the pet's status
-        pet = serializer.validated_data['pet_id']
-        serializer.save(adopter_user=self.request.user)
-        pet.adoption_status = "Pending"  # Update the pet's status to "Pending"
-        pet.save()
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        # Atomically claim the pet ("Pending") and create the application for the current user;
+        # a retry returns the user's open application for the pet with 200 instead of a duplicate
+        application, created = submit_application(serializer, request.user)
+        if not created:
+            return Response(self.get_serializer(application).data, status=status.HTTP_200_OK)
+        bump_pet_list_version(application.pet.shelter_id_id)  # Invalidate cached pet listings
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
 
 # Retrieve and Delete Adoption Application
 class AdoptionView(APIView):
@@ -106,8 +182,9 @@ class AdoptionView(APIView):
 
     def get(self, request, pk):
         # Retrieve the adoption application with the given primary key (pk)
+        fields = ApplicationSerializer.requested_fields(request)  # Optional ?fields= sparse fieldset
         adoption_application = get_object_or_404(AdoptionApplication, pk=pk)
-        serializer = ApplicationSerializer(adoption_application)
+        serializer = ApplicationSerializer(adoption_application, fields=fields)
         return Response(serializer.data)
 
     def delete(self, request, pk):
@@ -115,6 +192,8 @@ class AdoptionView(APIView):
         if request.user != adoption_application.adopter_user and not request.user.is_staff:
             return Response({"error": "You are not authorized to delete this application."}, status=403)
         adoption_application.delete()
+        if adoption_application.application_status == OPEN_APPLICATION_STATUS:
+            record_status_change(adoption_application.pet.shelter_id_id, closed=1)  # Dashboard counters
         return Response({"message": "Adoption application deleted successfully."})
 
 # List Adoption Applications
@@ -129,8 +208,8 @@ class AdoptionApplicationListView(generics.ListAPIView):
         else:
             # Regular user can only see their own applications
             adoption_applications = AdoptionApplication.objects.filter(adopter_user=request.user)
-        serializer = ApplicationSerializer(adoption_applications, many=True)
-        print(serializer.data)  # Log the serialized data for debugging
+        adoption_applications = ApplicationSerializer.setup_eager_loading(adoption_applications)
+        serializer = ApplicationSerializer(adoption_applications, many=True, fields=ApplicationSerializer.requested_fields(request))
         return Response(serializer.data)
 
 # Update Application Status View for Admins
@@ -138,34 +217,63 @@ class UpdateApplicationStatusView(APIView):
     permission_classes = [IsAdminUser]  # Only admins can update application status
 
     def patch(self, request, pk):
-        # Retrieve the adoption application by primary key (pk)
-        adoption_application = get_object_or_404(AdoptionApplication, pk=pk)
-        
-        # Update the application status
+        # Validate the new application status
         new_status = request.data.get('application_status')
-        if new_status not in ['Pending', 'Approved', 'Rejected']:
+        if new_status not in APPLICATION_STATUSES:
             return Response({"error": "Invalid status"}, status=400)
-        
-        adoption_application.application_status = new_status
-        adoption_application.save()
 
-        # Get the related Pet object
-        pet = adoption_application.pet  # Use the `pet` field to get the Pet object
+        # Update the application, its pet and any competing applications in one transaction
+        adoption_application, auto_rejected = review_application(pk, new_status)
+        pet = adoption_application.pet
 
-        if new_status == 'Approved':
-            # Automatically set the pet's adoption status to 'Adopted'
-            pet.adoption_status = 'Adopted'
-            pet.save()
-        elif new_status == 'Rejected':
-            # Automatically set the pet's adoption status to 'Available'
-            pet.adoption_status = 'Available'
-            pet.save()
+        bump_pet_list_version(pet.shelter_id_id)  # Invalidate cached pet listings
 
-        # Include the pet_id in the response
+        # Include the updated application and pet, so clients do not need to fetch them again
         return Response({
             "message": "Application status updated successfully",
             "status": new_status,
-            "pet_id": pet.pet_id
+            "pet_id": pet.pet_id,
+            "auto_rejected": auto_rejected,  # Number of competing applications rejected on approval
+            "application": ApplicationSerializer(adoption_application).data,
+            "pet": PetSerializer(pet).data,
+        })
+
+# Review Many Applications at Once (Admins)
+class BulkReviewApplicationsView(APIView):
+    permission_classes = [IsAdminUser]  # Only admins can update application status
+    max_batch_size = 1000
+
+    def post(self, request):
+        # Accept a list of {application_id, status} (or {"reviews": [...]})
+        reviews = request.data.get('reviews') if isinstance(request.data, dict) else request.data
+        if not isinstance(reviews, list) or not reviews:
+            return Response({"error": "Send a non-empty list of {application_id, status}."}, status=status.HTTP_400_BAD_REQUEST)
+        if len(reviews) > self.max_batch_size:
+            return Response({"error": f"At most {self.max_batch_size} reviews per request."}, status=status.HTTP_400_BAD_REQUEST)
+
+        decisions = {}
+        for review in reviews:
+            try:
+                application_id, new_status = int(review['application_id']), review['status']
+            except (KeyError, TypeError, ValueError):
+                return Response({"error": "Each review needs an integer application_id and a status."}, status=status.HTTP_400_BAD_REQUEST)
+            if new_status not in APPLICATION_STATUSES:
+                return Response({"error": f"Invalid status for application {application_id}"}, status=status.HTTP_400_BAD_REQUEST)
+            if decisions.setdefault(application_id, new_status) != new_status:
+                return Response({"error": f"Conflicting statuses for application {application_id}"}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Apply every decision in one transaction with bulk UPDATEs
+        pet_ids, auto_rejected, shelter_ids = review_applications(decisions)
+        bump_pet_list_version(*shelter_ids)  # Invalidate cached pet listings
+
+        # Return every application of the reviewed pets (including auto-rejected ones) and the pets
+        applications = ApplicationSerializer.setup_eager_loading(AdoptionApplication.objects.filter(pet_id__in=pet_ids))
+        pets = PetSerializer.setup_eager_loading(Pet.objects.filter(pk__in=pet_ids))
+        return Response({
+            "updated": len(decisions),
+            "auto_rejected": auto_rejected,
+            "applications": ApplicationSerializer(applications, many=True).data,
+            "pets": PetSerializer(pets, many=True).data,
         })
 
 
@@ -192,6 +300,9 @@ class CreatePetView(APIView):
             pet.shelter_id = shelter
             pet.save()
 
+        bump_pet_list_version(pet.shelter_id_id)  # Invalidate cached pet listings
+        record_pet_added(pet.shelter_id_id, pet.adoption_status)  # Dashboard counters
+        schedule_pet_image_variants(pet)  # Resize the upload in the background
         return Response(serializer.data, status=201)
 
 # Retrieve and Update Pet Info by PK
@@ -200,14 +311,21 @@ class PetDetailView(APIView):
     parser_classes = [MultiPartParser, FormParser, JSONParser]  # Add JSONParser to support JSON payloads
 
     def get(self, request, pk):
+        fields = PetSerializer.requested_fields(request)  # Optional ?fields= sparse fieldset
+        # Answer a conditional request from the pet's and shelter's updated_at, without loading the pet
+        validators = queryset_validators(Pet.objects.filter(pk=pk), PET_VALIDATOR_FIELDS)
+        if not_modified(request, *validators):
+            return not_modified_response(*validators)
+
         # Retrieve the pet with the given primary key (pk)
         pet = get_object_or_404(Pet, pk=pk)
-        serializer = PetSerializer(pet)
-        return Response(serializer.data)
+        serializer = PetSerializer(pet, fields=fields)
+        return set_validators(Response(serializer.data), *validators)
 
     def put(self, request, pk):
         pet = get_object_or_404(Pet, pk=pk)
-        print("Incoming request data:", request.data)  # Log the incoming data
+        old_shelter_id, old_status = pet.shelter_id_id, pet.adoption_status  # Remember them in case they change
+        logger.debug("Updating pet", extra={'pet_id': pk, 'fields': sorted(request.data.keys())})
 
         data = request.data.copy()
         if not data.get('image'):
@@ -216,47 +334,222 @@ class PetDetailView(APIView):
         serializer = PetSerializer(pet, data=data, partial=True)
         if serializer.is_valid():
             serializer.save()
-            print("Updated pet data:", serializer.data)  # Log the updated data
+            bump_pet_list_version(old_shelter_id, pet.shelter_id_id)  # Invalidate cached pet listings
+            record_pet_changed(pet, old_shelter_id, old_status)  # Dashboard counters
+            if 'image' in request.FILES:
+                schedule_pet_image_variants(pet)  # Resize the new upload in the background
             return Response(serializer.data, status=200)
-        print("Serializer errors:", serializer.errors)  # Log validation errors
+        logger.info("Rejected pet update", extra={'pet_id': pk, 'errors': serializer.errors})
         return Response(serializer.errors, status=400)
 
     def patch(self, request, pk):
         # Retrieve the pet with the given primary key (pk)
         pet = get_object_or_404(Pet, pk=pk)
+        old_shelter_id, old_status = pet.shelter_id_id, pet.adoption_status  # Remember them in case they change
         data = request.data
 
         # Update the pet's adoption status
         serializer = PetSerializer(pet, data=data, partial=True)
         if serializer.is_valid():
             serializer.save()
+            bump_pet_list_version(old_shelter_id, pet.shelter_id_id)  # Invalidate cached pet listings
+            record_pet_changed(pet, old_shelter_id, old_status)  # Dashboard counters
+            if 'image' in request.FILES:
+                schedule_pet_image_variants(pet)  # Resize the new upload in the background
             return Response(serializer.data, status=200)
         return Response(serializer.errors, status=400)
 
     def delete(self, request, pk):
         try:
             pet = Pet.objects.get(pk=pk)
+            shelter_id = pet.shelter_id_id
+            record_pet_deleted(pet)  # Dashboard counters (before the cascade removes favourites and applications)
             pet.delete()
+            bump_pet_list_version(shelter_id)  # Invalidate cached pet listings
             return Response({"message": "Pet deleted successfully"}, status=status.HTTP_204_NO_CONTENT)
         except Pet.DoesNotExist:
             return Response({"error": "Pet not found"}, status=status.HTTP_404_NOT_FOUND)
 
-# List All Pets
+# List All Pets (cursor-paginated and filterable, see api/pagination.py and api/filters.py)
+# Pages are served from the versioned read-through cache in api/cache.py.
 class PetListView(APIView):
     permission_classes = [AllowAny]
+    pagination_class = PetCursorPagination
 
     def get(self, request, shelter_id=None):
+        PetSerializer.requested_fields(request)  # Reject an invalid ?fields= before anything is cached
+        # Serve the page from the cache if this exact listing has been built since the last write
+        cache_key = pet_list_cache_key(request, self.get_cache_shelter_id(request, shelter_id))
+        cached = cache.get(cache_key)
+        if cached is None:
+            if catalogue_recently_written():
+                use_primary()  # The page is shared by everyone, so do not build it from a lagging replica
+            pets = self.get_queryset(request, shelter_id)
+            # Validators from COUNT/MAX(updated_at); a client with a current copy gets a 304 before anything is serialized
+            validators = queryset_validators(pets, PET_VALIDATOR_FIELDS, key=request.get_full_path())
+            if not_modified(request, *validators):
+                return not_modified_response(*validators, private=False)
+            cached = {'data': self.build_page(request, pets), 'validators': tuple(validators)}
+            cache.set(cache_key, cached, pet_list_cache_timeout())
+
+        if not_modified(request, *cached['validators']):
+            return not_modified_response(*cached['validators'], private=False)
+        return set_validators(Response(cached['data']), *cached['validators'], private=False)
+
+    @staticmethod
+    def get_cache_shelter_id(request, shelter_id):
+        # Listings scoped to one shelter are only invalidated by writes to that shelter
+        shelter_id = shelter_id or request.query_params.get('shelter_id')
+        try:
+            return int(shelter_id) if shelter_id else None
+        except ValueError:
+            return None  # Invalid filter; filter_pets will reject it before anything is cached
+
+    def get_queryset(self, request, shelter_id):
         if (shelter_id):
             shelter = get_object_or_404(Shelter, pk=shelter_id)
             pets = shelter.list_all_pets()
         else:
             pets = Pet.objects.all()
 
-        serializer = PetSerializer(pets, many=True)
-        return Response(serializer.data)
+        # Apply the server-side filters from the query string
+        return filter_pets(pets, request.query_params)
+
+    def build_page(self, request, pets):
+        pets = PetSerializer.setup_eager_loading(pets)
+
+        # Return one keyset page instead of the whole table
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(pets, request, view=self)
+        serializer = PetSerializer(page, many=True, fields=PetSerializer.requested_fields(request))
+        return paginator.get_paginated_response(serializer.data).data
+
+# Search Pets (ranked, typo-tolerant search served from the in-process index in api/search.py)
+class PetSearchView(APIView):
+    permission_classes = [AllowAny]
+    default_limit = 20
+    max_limit = 100
+
+    def get(self, request):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response({"error": "The search query 'q' is required."}, status=status.HTTP_400_BAD_REQUEST)
+        fields = PetSerializer.requested_fields(request)  # Optional ?fields= sparse fieldset
+
+        try:
+            limit = min(int(request.query_params.get('limit', self.default_limit)), self.max_limit)
+            offset = int(request.query_params.get('offset', 0))
+        except ValueError:
+            return Response({"error": "limit and offset must be integers."}, status=status.HTTP_400_BAD_REQUEST)
+        if limit < 1 or offset < 0:
+            return Response({"error": "limit must be positive and offset cannot be negative."}, status=status.HTTP_400_BAD_REQUEST)
+
+        count, ranked = pet_search_index.search(query, limit=limit, offset=offset)
+
+        # Load the page of pets by primary key and keep the ranking order
+        pets = PetSerializer.setup_eager_loading(Pet.objects.filter(pk__in=[pet_id for pet_id, _ in ranked]))
+        pets_by_id = {pet.pet_id: pet for pet in pets}
+        page = [pets_by_id[pet_id] for pet_id, _ in ranked if pet_id in pets_by_id]
+
+        serializer = PetSerializer(page, many=True, fields=fields)
+        return Response({"count": count, "results": serializer.data})
+
+# Pets Near Me (available pets of the shelters within a radius, nearest first; see api/geo.py)
+class NearbyPetsView(APIView):
+    permission_classes = [AllowAny]
+    default_radius = 25  # Kilometres
+    max_radius = 500
+    default_limit = 20
+    max_limit = 100
+
+    def get(self, request):
+        try:
+            lat = float(request.query_params['lat'])
+            lon = float(request.query_params['lon'])
+            radius = float(request.query_params.get('radius', self.default_radius))
+            limit = min(int(request.query_params.get('limit', self.default_limit)), self.max_limit)
+            offset = int(request.query_params.get('offset', 0))
+        except KeyError:
+            return Response({"error": "lat and lon are required."}, status=status.HTTP_400_BAD_REQUEST)
+        except ValueError:
+            return Response({"error": "lat, lon and radius must be numbers; limit and offset must be integers."}, status=status.HTTP_400_BAD_REQUEST)
+        if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+            return Response({"error": "lat must be between -90 and 90 and lon between -180 and 180."}, status=status.HTTP_400_BAD_REQUEST)
+        if not 0 < radius <= self.max_radius:
+            return Response({"error": f"radius must be between 0 and {self.max_radius} km."}, status=status.HTTP_400_BAD_REQUEST)
+        if limit < 1 or offset < 0:
+            return Response({"error": "limit must be positive and offset cannot be negative."}, status=status.HTTP_400_BAD_REQUEST)
+        fields = PetSerializer.requested_fields(request)  # Optional ?fields= sparse fieldset
+
+        shelters = shelter_location_index.nearby(lat, lon, radius)  # [(distance, shelter_id)], nearest first
+        pets = filter_pets(Pet.objects.filter(adoption_status="Available"), request.query_params)
+        if not shelters:
+            return Response({"count": 0, "results": []})
+
+        # Count the matching pets per shelter, then find the shelters the requested page falls in
+        distances = {shelter_id: distance for distance, shelter_id in shelters}
+        counts = dict(pets.filter(shelter_id__in=distances).order_by().values_list('shelter_id').annotate(Count('pk')))
+        page_shelters, skip, seen = [], 0, 0
+        for _, shelter_id in shelters:
+            count = counts.get(shelter_id, 0)
+            if count and seen + count > offset and seen < offset + limit:
+                if not page_shelters:
+                    skip = offset - seen
+                page_shelters.append(shelter_id)
+            seen += count
+
+        # Load only that page: pets of those shelters, ordered by shelter distance, then pet_id
+        page = []
+        if page_shelters:
+            nearest_first = Case(*(When(shelter_id=shelter_id, then=rank) for rank, shelter_id in enumerate(page_shelters)))
+            page = PetSerializer.setup_eager_loading(pets.filter(shelter_id__in=page_shelters)).order_by(nearest_first, 'pet_id')[skip:skip + limit]
+
+        results = PetSerializer(page, many=True, fields=fields).data
+        for pet in results:
+            pet['distance_km'] = round(distances[pet['shelter_id']], 2)
+        return Response({"count": seen, "results": results})
+
+# Bulk Import and Export Pets (streamed CSV/NDJSON, see api/bulk.py)
+class PetBulkView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        # Export pets (optionally filtered) as a streamed CSV or NDJSON file
+        file_format = request.query_params.get('file_format', bulk.CSV)
+        if file_format not in bulk.FORMATS:
+            return Response({"error": "file_format must be 'csv' or 'ndjson'."}, status=status.HTTP_400_BAD_REQUEST)
+
+        pets = filter_pets(Pet.objects.all(), request.query_params)
+        response = StreamingHttpResponse(bulk.export_pets(pets, file_format), content_type=bulk.CONTENT_TYPES[file_format])
+        response['Content-Disposition'] = f'attachment; filename="pets.{file_format}"'
+        return response
+
+    def post(self, request):
+        # Import pets from a CSV or NDJSON body, reading it one line at a time
+        file_format = bulk.detect_format(request.content_type, request.query_params.get('file_format'))
+        if file_format is None:
+            return Response({"error": "Send the pets as text/csv or application/x-ndjson."}, status=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
+        if request.stream is None:
+            return Response({"error": "The request body is empty."}, status=status.HTTP_400_BAD_REQUEST)
+
+        report = bulk.import_pets(bulk.read_rows(request.stream, file_format))
+
+        if report['created']:
+            bump_pet_list_version(*report.pop('shelter_ids'))  # Invalidate cached pet listings
+            pet_search_index.reset()  # bulk_create skips post_save, so rebuild the search index on next use
+        else:
+            report.pop('shelter_ids')
+        return Response(report, status=status.HTTP_201_CREATED if report['created'] else status.HTTP_400_BAD_REQUEST)
 
 # --------------------------------------- Shelter Management -------------------------------------------
 
+# Generic views whose GET responses honour ?fields= (see SparseFieldsMixin in api/serializers.py)
+class SparseFieldsViewMixin:
+    def get_serializer(self, *args, **kwargs):
+        if self.request.method == 'GET':
+            kwargs.setdefault('fields', self.get_serializer_class().requested_fields(self.request))
+        return super().get_serializer(*args, **kwargs)
+
 # Create new Shelter
 class CreateShelterView(generics.CreateAPIView):
     queryset = Shelter.objects.all()
@@ -264,17 +557,44 @@ class CreateShelterView(generics.CreateAPIView):
     permission_classes = [IsAdminUser]  # Only admin users can create shelters
 
 # List All Shelters
-class ShelterListView(ListAPIView):
+class ShelterListView(SparseFieldsViewMixin, ListAPIView):
     queryset = Shelter.objects.all()
     serializer_class = ShelterSerializer
     permission_classes = [IsAuthenticated]  # Allow all authenticated users to access
 
+    def list(self, request, *args, **kwargs):
+        # Answer a conditional request from COUNT/MAX(updated_at) before loading the shelters
+        validators = queryset_validators(self.get_queryset())
+        if not_modified(request, *validators):
+            return not_modified_response(*validators)
+        return set_validators(super().list(request, *args, **kwargs), *validators)
+
+# Shelter Dashboard Stats (denormalized counters, see api/stats.py)
+class ShelterStatsView(APIView):
+    permission_classes = [IsAdminUser]  # Only admin users can view the dashboard
+
+    def get(self, request):
+        # One joined query over shelters; shelters without a stats row yet report zeros
+        shelters = Shelter.objects.select_related('stats').order_by('shelter_id')
+        stats = [getattr(shelter, 'stats', None) or ShelterStats(shelter=shelter) for shelter in shelters]
+        serializer = ShelterStatsSerializer(stats, many=True)
+        return Response(serializer.data)
+
 # Update Shelter
-class UpdateShelterView(generics.RetrieveUpdateDestroyAPIView):
+class UpdateShelterView(SparseFieldsViewMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Shelter.objects.all()
     serializer_class = ShelterSerializer
     permission_classes = [IsAdminUser]  # Only admin users can update shelters
 
+    def perform_update(self, serializer):
+        serializer.save()
+        bump_pet_list_version(serializer.instance.shelter_id)  # Pet listings embed the shelter name
+
+    def perform_destroy(self, instance):
+        shelter_id = instance.shelter_id
+        instance.delete()  # Also deletes the shelter's pets
+        bump_pet_list_version(shelter_id)  # Invalidate cached pet listings
+
 # ------------------------------------- Shelter Management Records -------------------------------------------
 
 # Create new Shelter Management Record
@@ -355,8 +675,16 @@ class FavouriteListView(APIView):
     def get(self, request):
         """Get the list of favourite pets for the authenticated user."""
         favourites = Favourite.objects.filter(adopter_user=request.user)  # Updated field name
+
+        # Favourites have no timestamps; a new favourite raises MAX(id) and a removal lowers the count
+        validators = queryset_validators(favourites, ('id',) + tuple(f'pet__{field}' for field in PET_VALIDATOR_FIELDS),
+                                         key=f'user:{request.user.pk}')
+        if not_modified(request, *validators):
+            return not_modified_response(*validators)
+
+        favourites = FavouriteSerializer.setup_eager_loading(favourites)
         serializer = FavouriteSerializer(favourites, many=True)
-        return Response(serializer.data)
+        return set_validators(Response(serializer.data), *validators)
     
 # ---------------------------------------- Donation Management -------------------------------------------
 
@@ -369,7 +697,7 @@ class CreateDonationView(APIView):
         shelter_id = request.data.get("shelter_id")
         amount = request.data.get("amount")
 
-        print("Received data:", {"shelter_id": shelter_id, "amount": amount})  # Debug log
+        logger.debug("Received donation", extra={'shelter_id': shelter_id, 'amount': amount})
 
         # Validate required fields
         if not shelter_id or not amount:
@@ -396,10 +724,14 @@ class DonationView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request, pk):
+        validators = queryset_validators(Donation.objects.filter(pk=pk))
+        if not_modified(request, *validators):
+            return not_modified_response(*validators)
+
         donation = get_object_or_404(Donation, pk=pk)
         donation.getDonationDetails()
         serializer = DonationSerializer(donation)
-        return Response(serializer.data)
+        return set_validators(Response(serializer.data), *validators)
 
 # List All Donations
 class DonationListView(generics.ListAPIView):
@@ -411,3 +743,22 @@ class DonationListView(generics.ListAPIView):
         serializer = DonationSerializer(donations, many=True)
         return Response(serializer.data)
 
+
+# Donation Report (admin totals, see api/reports.py)
+class DonationReportView(APIView):
+    permission_classes = [IsAdminUser]  # Only admin users can see donation totals
+
+    def get(self, request):
+        # Totals grouped by shelter, donor, day, week or month, aggregated in the database
+        params = reports.parse_report_params(request.query_params)
+        file_format = request.query_params.get('file_format', 'json')
+        if file_format not in ('json', bulk.CSV):
+            return Response({"error": "file_format must be 'json' or 'csv'."}, status=status.HTTP_400_BAD_REQUEST)
+
+        group_by = params.pop('group_by')
+        rows = reports.donation_report(group_by, **params)
+        if file_format == bulk.CSV:
+            response = StreamingHttpResponse(reports.report_csv_lines(group_by, rows), content_type=bulk.CONTENT_TYPES[bulk.CSV])
+            response['Content-Disposition'] = f'attachment; filename="donations_by_{group_by}.csv"'
+            return response
+        return Response({"group_by": group_by, "results": list(reports.report_rows(group_by, rows))})
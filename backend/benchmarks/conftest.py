@@ -0,0 +1,109 @@
+"""
+Endpoint benchmarks for the Adoptify Pet Finder API.
+
+Run from backend/ (they are not part of the regular test run):
+
+    python -m pytest benchmarks --ds=benchmarks.settings --reuse-db
+    BENCHMARK_SCALE=full python -m pytest benchmarks --ds=benchmarks.settings --reuse-db
+    BENCHMARK_DATABASE=mysql python -m pytest benchmarks --ds=benchmarks.settings
+
+The session seeds the database once for BENCHMARK_SCALE (small, medium or full; see seed.py), with
+--reuse-db keeping it for the next run. Each endpoint case reports p50/p95/p99 latency, the most
+database queries a request made and the peak Python memory of a request, and is compared with the
+baseline for the database and scale (benchmarks/baselines/<vendor>-<scale>.json):
+
+    --benchmark-save-baseline        Store this run as the new baseline.
+    --benchmark-max-regression=0.25  Fail a case whose p50/p95/peak memory grew by more than 25%, or
+                                     that makes more queries than its baseline.
+    --benchmark-iterations=30        Timed requests per case.
+    --benchmark-warm-cache           Keep the shared cache between requests (cleared by default).
+
+The last run is always written to benchmarks/results/latest.json. Baselines are machine-specific:
+record one on the machine that will run the comparisons.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+from django.db import connection
+
+from .runner import load_results, save_results
+from .seed import SCALES, dataset, seed
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+RESULTS_PATH = BENCHMARKS_DIR / 'results' / 'latest.json'
+
+def pytest_addoption(parser):
+    group = parser.getgroup('benchmarks')
+    group.addoption('--benchmark-scale', default=os.getenv('BENCHMARK_SCALE', 'small'), choices=sorted(SCALES),
+                    help="Fixture volume (default: BENCHMARK_SCALE or small).")
+    group.addoption('--benchmark-iterations', type=int, default=30, help="Timed requests per case.")
+    group.addoption('--benchmark-baseline', default=None, help="Baseline file (default: baselines/<vendor>-<scale>.json).")
+    group.addoption('--benchmark-save-baseline', action='store_true', help="Store this run as the baseline.")
+    group.addoption('--benchmark-max-regression', type=float, default=0.25,
+                    help="Allowed growth of p50/p95/peak memory over the baseline (fraction).")
+    group.addoption('--benchmark-warm-cache', action='store_true', help="Keep the shared cache between requests.")
+
+def pytest_configure(config):
+    config._benchmark_results = {}
+
+@pytest.fixture(scope='session')
+def django_db_setup(django_db_setup, django_db_blocker, pytestconfig):
+    # Seed once per session (skipped when --reuse-db kept a database of the same scale)
+    scale = pytestconfig.getoption('benchmark_scale')
+    with django_db_blocker.unblock():
+        sys.stderr.write(f"\nSeeding the {scale} benchmark dataset ({connection.vendor})...\n")
+        seed(scale, stdout=sys.stderr)
+
+@pytest.fixture(scope='session')
+def benchmark_data(django_db_setup, django_db_blocker, pytestconfig):
+    with django_db_blocker.unblock():
+        return dataset(pytestconfig.getoption('benchmark_scale'))
+
+def baseline_path(config):
+    path = config.getoption('benchmark_baseline')
+    if path:
+        return Path(path)
+    return BENCHMARKS_DIR / 'baselines' / f"{connection.vendor}-{config.getoption('benchmark_scale')}.json"
+
+@pytest.fixture(scope='session')
+def benchmark_baseline(pytestconfig, django_db_setup):
+    if pytestconfig.getoption('benchmark_save_baseline'):
+        return {}  # Recording a new baseline: nothing to compare with
+    return load_results(baseline_path(pytestconfig)).get('results', {})
+
+@pytest.fixture
+def benchmark_results(pytestconfig):
+    return pytestconfig._benchmark_results
+
+def pytest_terminal_summary(terminalreporter, config):
+    results = config._benchmark_results
+    if not results:
+        return
+    baseline = {} if config.getoption('benchmark_save_baseline') else load_results(baseline_path(config)).get('results', {})
+
+    terminalreporter.section('endpoint benchmarks')
+    terminalreporter.write_line(f"{'case':<44}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'queries':>9}{'peak KiB':>11}  vs baseline p50")
+    for name, result in sorted(results.items()):
+        previous = baseline.get(name)
+        change = f"{result['p50_ms'] / previous['p50_ms'] - 1:+.0%}" if previous and previous['p50_ms'] else 'new'
+        terminalreporter.write_line(
+            f"{name:<44}{result['p50_ms']:>10.2f}{result['p95_ms']:>10.2f}{result['p99_ms']:>10.2f}"
+            f"{result['queries']:>9}{result['peak_kib']:>11.1f}  {change}"
+        )
+
+    meta = {
+        'vendor': connection.vendor,
+        'scale': config.getoption('benchmark_scale'),
+        'iterations': config.getoption('benchmark_iterations'),
+        'warm_cache': config.getoption('benchmark_warm_cache'),
+    }
+    save_results(RESULTS_PATH, results, meta)
+    terminalreporter.write_line(f"Results written to {RESULTS_PATH}")
+    if config.getoption('benchmark_save_baseline'):
+        # Merged, so recording a subset of the cases (-k) keeps the others
+        stored = load_results(baseline_path(config)).get('results', {})
+        save_results(baseline_path(config), {**stored, **results}, meta)
+        terminalreporter.write_line(f"Baseline written to {baseline_path(config)}")
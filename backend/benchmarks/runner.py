@@ -0,0 +1,178 @@
+"""
+This module measures endpoints and compares the results with a stored baseline.
+
+It includes:
+- Case: One benchmarked request (URL name, method, data, user), built per iteration from the Dataset.
+- measure: Times a case's requests and records latency percentiles, database queries and peak memory.
+- measure_function: The same measurements for a function (for work below the HTTP layer, e.g. serializing).
+- compare: Lists the regressions of a run against a baseline.
+- load_results / save_results: Read and write result files (JSON, keyed by case name).
+
+Latency is measured without tracing; peak memory (Python allocations, via tracemalloc) is measured in a
+separate, shorter pass because tracing slows every allocation down.
+"""
+
+import json
+import statistics
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Optional
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+NOISE_FLOORS = {'p50_ms': 1.0, 'p95_ms': 2.0, 'peak_kib': 16.0}  # Absolute growth ignored by compare
+
+@dataclass
+class Case:
+    name: str  # Unique, e.g. "pet_list" or "pet_list[pet_type]"
+    url_name: str  # The URL name in adoptify_backend/urls.py
+    method: str = 'get'
+    # Called with (dataset, iteration) and returning the request's kwargs: url kwargs in "args",
+    # "query", "data", "headers", "user" (a User, or None for anonymous) and "expect" (status code)
+    request: Callable = field(default=lambda data, iteration: {})
+    iterations: Optional[int] = None  # Overrides the default (e.g. for whole-catalogue exports)
+
+def _percentile(samples, percent):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(percent / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+def _send(client, case, data, iteration, tokens):
+    spec = case.request(data, iteration)
+    user = spec.get('user', data.admin)
+    if user is None:
+        client.credentials()
+    else:
+        if user.pk not in tokens:
+            tokens[user.pk] = str(AccessToken.for_user(user))
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens[user.pk]}")
+
+    url = reverse(case.url_name, kwargs=spec.get('args'))
+    if spec.get('query'):
+        url = f"{url}?{spec['query']}"
+    kwargs = {'format': 'json'} if case.method != 'get' else {}
+    headers = spec.get('headers') or {}
+    response = getattr(client, case.method)(url, spec.get('data'), headers=headers, **kwargs)
+    if response.streaming:
+        b''.join(response.streaming_content)  # Exports are generated while streaming
+    expected = spec.get('expect', 200)
+    if response.status_code != expected:
+        raise AssertionError(f"{case.name}: {case.method.upper()} {url} returned {response.status_code}, expected {expected}")
+    return response
+
+def measure(case, data, iterations, warmup=3, memory_iterations=3, warm_cache=False):
+    """
+    Benchmark a case.
+
+    Args:
+        case (Case): The requests to send.
+        data (Dataset): The seeded ids (see benchmarks/seed.py).
+        iterations (int): Timed requests (case.iterations takes precedence).
+        warmup (int): Untimed requests first (builds indexes, fills the user cache and connection).
+        memory_iterations (int): Requests traced for peak memory.
+        warm_cache (bool): Keep the shared cache between requests (by default it is cleared, so cached
+            pet listings do not hide the cost of building them).
+
+    Returns:
+        dict: p50_ms, p95_ms, p99_ms, mean_ms, queries (most per request), peak_kib and iterations.
+    """
+    iterations = case.iterations or iterations
+    client, tokens = APIClient(), {}
+    iteration = 0
+
+    def send():
+        nonlocal iteration
+        if not warm_cache:
+            cache.clear()
+        response = _send(client, case, data, iteration, tokens)
+        iteration += 1
+        return response
+
+    return _collect(send, iterations, warmup, memory_iterations)
+
+def measure_function(function, iterations, warmup=1, memory_iterations=1, setup=None):
+    """
+    Benchmark a function, reporting the same metrics as measure.
+
+    Args:
+        function (callable): Called without arguments for every timed run.
+        iterations (int): Timed runs.
+        warmup (int): Untimed runs first.
+        memory_iterations (int): Runs traced for peak memory.
+        setup (callable, optional): Called before every run, outside the timing.
+    """
+    return _collect(function, iterations, warmup, memory_iterations, setup)
+
+def _collect(run, iterations, warmup, memory_iterations, setup=None):
+    # Times run() (one request or call); setup() runs before each one, outside the timing and tracing
+    setup = setup or (lambda: None)
+    for _ in range(warmup):
+        setup()
+        run()
+
+    latencies, queries = [], 0
+    for _ in range(iterations):
+        setup()
+        with CaptureQueriesContext(connection) as captured:
+            start = time.perf_counter()
+            run()
+            latencies.append(time.perf_counter() - start)
+        queries = max(queries, len(captured))
+
+    peak = 0
+    tracemalloc.start()
+    try:
+        for _ in range(memory_iterations):
+            setup()
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+            run()
+            peak = max(peak, tracemalloc.get_traced_memory()[1] - baseline)
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'iterations': iterations,
+        'p50_ms': round(_percentile(latencies, 50) * 1000, 3),
+        'p95_ms': round(_percentile(latencies, 95) * 1000, 3),
+        'p99_ms': round(_percentile(latencies, 99) * 1000, 3),
+        'mean_ms': round(statistics.fmean(latencies) * 1000, 3),
+        'queries': queries,
+        'peak_kib': round(peak / 1024, 1),
+    }
+
+def compare(result, baseline, max_regression):
+    """
+    Return the regressions of a result against its baseline entry.
+
+    Latency regresses when p50 or p95 grows by more than max_regression (a fraction, e.g. 0.25), memory
+    when the peak grows by more than max_regression, and queries whenever there are more of them.
+    Growth within NOISE_FLOORS never counts, so sub-millisecond endpoints do not fail on jitter.
+    """
+    problems = []
+    if baseline is None:
+        return problems
+    for metric, floor in NOISE_FLOORS.items():
+        if baseline[metric] and result[metric] > max(baseline[metric] * (1 + max_regression), baseline[metric] + floor):
+            problems.append(f"{metric} {baseline[metric]} -> {result[metric]} (+{result[metric] / baseline[metric] - 1:.0%})")
+    if result['queries'] > baseline['queries']:
+        problems.append(f"queries {baseline['queries']} -> {result['queries']}")
+    return problems
+
+def load_results(path):
+    path = Path(path)
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())
+
+def save_results(path, results, meta):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({'meta': meta, 'results': results}, indent=2, sort_keys=True) + '\n')
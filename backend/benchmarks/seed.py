@@ -0,0 +1,170 @@
+"""
+This module generates the benchmark fixtures: a realistic catalogue written with bulk_create.
+
+It includes:
+- SCALES: Row counts per scale ("small" for quick runs, "medium", and "full": 1k shelters, 100k pets,
+  1M favourites and 1M adoption applications).
+- seed: Fills an empty database for a scale (or does nothing if it already holds that scale).
+- Dataset / dataset: The ids the benchmark cases pick their requests from.
+
+Rows are generated lazily from a fixed random seed and inserted in batches, so memory stays flat
+whatever the scale and every run measures the same data. Signals do not run for bulk_create, so
+shelter coordinates are set directly and the dashboard counters are rebuilt at the end; the search
+and location indexes are built by the first request, like in a fresh worker.
+"""
+
+import itertools
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.utils import timezone
+
+from api.geo import DEFAULT_GEOCODE_TABLE, _load_table
+from api.models import AdoptionApplication, Donation, Favourite, Pet, Shelter
+from api.stats import rebuild_shelter_stats
+
+SCALES = {
+    'small': dict(shelters=20, users=400, pets=2_000, favourites=20_000, applications=20_000, donations=2_000),
+    'medium': dict(shelters=200, users=4_000, pets=20_000, favourites=200_000, applications=200_000, donations=20_000),
+    'full': dict(shelters=1_000, users=20_000, pets=100_000, favourites=1_000_000, applications=1_000_000, donations=100_000),
+}
+BATCH_SIZE = 5_000
+SEED = 20260101
+PASSWORD = 'benchmark-password'
+USERNAME = 'bench-user-{index}'
+ADMIN_USERNAME = 'bench-admin'
+
+PET_NAMES = ('Buddy', 'Max', 'Bella', 'Luna', 'Charlie', 'Lucy', 'Cooper', 'Daisy', 'Rocky', 'Molly',
+             'Bear', 'Sadie', 'Tucker', 'Maggie', 'Oliver', 'Chloe', 'Milo', 'Zoe', 'Leo', 'Nala')
+PET_TYPES = (('Dog', 0.5), ('Cat', 0.35), ('Rabbit', 0.1), ('Bird', 0.05))
+PET_STATUSES = (('Available', 0.7), ('Pending', 0.1), ('Adopted', 0.2))
+APPLICATION_STATUSES = (('Rejected', 0.6), ('Pending', 0.3), ('Approved', 0.1))
+
+SAMPLE_SIZE = 5_000  # Ids kept per kind of row that write cases consume (one per request)
+
+@dataclass
+class Dataset:
+    scale: str
+    counts: dict
+    admin: User
+    user_ids: list
+    pet_ids: list
+    shelter_ids: list
+    available_pet_ids: list = field(default_factory=list)
+    pending_application_ids: list = field(default_factory=list)
+    favourites: list = field(default_factory=list)  # (user_id, pet_id)
+    donation_ids: list = field(default_factory=list)
+
+def _weighted(rng, choices):
+    values, weights = zip(*choices)
+    return rng.choices(values, weights)[0]
+
+def _bulk(model, rows):
+    """bulk_create a generator of unsaved instances in BATCH_SIZE chunks."""
+    rows = iter(rows)
+    while batch := list(itertools.islice(rows, BATCH_SIZE)):
+        model.objects.bulk_create(batch, batch_size=BATCH_SIZE)
+
+def _user_pet_pairs(rng, user_ids, pet_ids, total):
+    # Every user gets the same number of distinct pets (unique per user, as the constraints require)
+    per_user = max(1, total // len(user_ids))
+    for user_id in user_ids:
+        for pet_id in rng.sample(pet_ids, min(per_user, len(pet_ids))):
+            yield user_id, pet_id
+
+def _locations():
+    # Shelters are spread over the places of the geocoding table, so /api/pets/nearby/ finds them
+    areas, places = _load_table(str(DEFAULT_GEOCODE_TABLE))
+    return list(areas.values()) + list(places.values())
+
+def _shelter(rng, index, location):
+    lat, lon = location
+    return Shelter(name=f'Benchmark Shelter {index}', address=f'{index} Main St',
+                   latitude=lat + rng.uniform(-0.05, 0.05), longitude=lon + rng.uniform(-0.05, 0.05))
+
+def dataset(scale):
+    """Return the Dataset of an already seeded database."""
+    return Dataset(
+        scale=scale,
+        counts=SCALES[scale],
+        admin=User.objects.get(username=ADMIN_USERNAME),
+        user_ids=list(User.objects.filter(username__startswith='bench-user-').order_by('pk').values_list('pk', flat=True)),
+        pet_ids=list(Pet.objects.order_by('pk').values_list('pk', flat=True)),
+        shelter_ids=list(Shelter.objects.order_by('pk').values_list('pk', flat=True)),
+        available_pet_ids=list(Pet.objects.filter(adoption_status='Available').order_by('pk').values_list('pk', flat=True)[:SAMPLE_SIZE]),
+        pending_application_ids=list(AdoptionApplication.objects.filter(application_status='Pending')
+                                     .order_by('pk').values_list('pk', flat=True)[:SAMPLE_SIZE]),
+        favourites=list(Favourite.objects.order_by('pk').values_list('adopter_user_id', 'pet_id')[:SAMPLE_SIZE]),
+        donation_ids=list(Donation.objects.order_by('pk').values_list('pk', flat=True)[:SAMPLE_SIZE]),
+    )
+
+def seed(scale='small', stdout=None):
+    """
+    Fill the database with the fixtures of a scale.
+
+    Args:
+        scale (str): A key of SCALES.
+        stdout: Where to report progress (None for silence).
+
+    Returns:
+        Dataset: The seeded ids.
+    """
+    counts = SCALES[scale]
+    if Pet.objects.count() == counts['pets'] and User.objects.filter(username=ADMIN_USERNAME).exists():
+        return dataset(scale)  # Reused database (e.g. pytest --reuse-db)
+
+    def report(message, started):
+        if stdout is not None:
+            stdout.write(f"  {message} in {time.perf_counter() - started:.1f}s\n")
+
+    rng = random.Random(SEED)
+    now = timezone.now()
+    password = make_password(PASSWORD)  # Hashed once; every user shares it
+    locations = _locations()
+
+    with transaction.atomic():
+        started = time.perf_counter()
+        User.objects.create_superuser(username=ADMIN_USERNAME, password=PASSWORD)
+        _bulk(User, (User(username=USERNAME.format(index=index), password=password, first_name=rng.choice(PET_NAMES),
+                          last_name='Benchmark', email=f'user{index}@example.com') for index in range(counts['users'])))
+        _bulk(Shelter, (_shelter(rng, index, locations[index % len(locations)]) for index in range(counts['shelters'])))
+        data = dataset(scale)  # The user and shelter ids the other rows point to
+        report(f"{counts['users']} users and {counts['shelters']} shelters", started)
+
+        started = time.perf_counter()
+        _bulk(Pet, (Pet(name=rng.choice(PET_NAMES), age=rng.randint(1, 15), gender=rng.choice(('Male', 'Female')),
+                        domesticated=rng.random() < 0.8, pet_type=_weighted(rng, PET_TYPES),
+                        adoption_status=_weighted(rng, PET_STATUSES), shelter_id_id=rng.choice(data.shelter_ids))
+                    for _ in range(counts['pets'])))
+        data.pet_ids = list(Pet.objects.values_list('pk', flat=True))
+        report(f"{counts['pets']} pets", started)
+
+        started = time.perf_counter()
+        _bulk(Favourite, (Favourite(adopter_user_id=user_id, pet_id=pet_id)
+                          for user_id, pet_id in _user_pet_pairs(rng, data.user_ids, data.pet_ids, counts['favourites'])))
+        report(f"{counts['favourites']} favourites", started)
+
+        started = time.perf_counter()
+        _bulk(AdoptionApplication, (AdoptionApplication(adopter_user_id=user_id, pet_id=pet_id, message='I would love to adopt.',
+                                                        application_status=_weighted(rng, APPLICATION_STATUSES))
+                                    for user_id, pet_id in _user_pet_pairs(rng, data.user_ids, data.pet_ids, counts['applications'])))
+        report(f"{counts['applications']} applications", started)
+
+        started = time.perf_counter()
+        # Spread over the last two years, so the report's day/week/month groupings have real work to do
+        _bulk(Donation, (Donation(adopter_user_id_id=rng.choice(data.user_ids), shelter_id_id=rng.choice(data.shelter_ids),
+                                  amount=rng.choice((10, 20, 25, 50, 100, 250))) for _ in range(counts['donations'])))
+        days = {}  # donation_date is auto_now_add, so the dates are spread with one UPDATE per day
+        for donation_id in Donation.objects.values_list('pk', flat=True).iterator():
+            days.setdefault(rng.randint(0, 730), []).append(donation_id)
+        for offset, donation_ids in days.items():
+            Donation.objects.filter(pk__in=donation_ids).update(donation_date=now - timedelta(days=offset))
+        report(f"{counts['donations']} donations", started)
+
+        rebuild_shelter_stats()
+    return dataset(scale)
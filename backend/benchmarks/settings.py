@@ -0,0 +1,30 @@
+"""
+Django settings for the endpoint benchmarks (see benchmarks/conftest.py).
+
+BENCHMARK_DATABASE picks the database:
+- sqlite (default): benchmarks/benchmark.sqlite3, kept between runs with pytest --reuse-db.
+- mysql: the DB_* settings of adoptify_backend/settings.py; pytest-django creates and seeds test_<DB_NAME>.
+"""
+
+import os
+
+from adoptify_backend.settings import *  # noqa: F401,F403
+from adoptify_backend.settings import BASE_DIR, CACHES, DATABASES
+
+SECRET_KEY = os.getenv('SECRET_KEY') or 'benchmark-secret-key-not-for-production-use'
+METRICS_TOKEN = 'benchmark'  # Lets the metrics endpoint be benchmarked like production scrapes it
+
+BENCHMARK_DATABASE = os.getenv('BENCHMARK_DATABASE', 'sqlite')
+if BENCHMARK_DATABASE == 'sqlite':
+    _sqlite = str(BASE_DIR / 'benchmarks' / 'benchmark.sqlite3')
+    DATABASES = {
+        'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': _sqlite, 'TEST': {'NAME': _sqlite}},
+    }
+elif BENCHMARK_DATABASE == 'mysql':
+    DATABASES = {'default': DATABASES['default']}  # Replicas would only mirror the primary here
+else:
+    raise ValueError(f"BENCHMARK_DATABASE must be 'sqlite' or 'mysql' (got {BENCHMARK_DATABASE!r})")
+DATABASE_REPLICAS = []
+
+# Room for the whole catalogue of the largest pet row benchmark (see test_pet_rows.py)
+CACHES['pet_rows']['OPTIONS']['MAX_ENTRIES'] = 200_000
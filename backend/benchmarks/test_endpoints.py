@@ -0,0 +1,117 @@
+import pytest
+from django.contrib.auth.models import User
+from django.urls import URLPattern, URLResolver, get_resolver
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .runner import Case, compare, measure
+from .seed import PASSWORD, USERNAME
+
+def user(data, iteration):
+    # A different regular user per request; tokens only need the id
+    return User(pk=data.user_ids[iteration % len(data.user_ids)], is_staff=False)
+
+def pick(ids, iteration):
+    return ids[iteration % len(ids)]
+
+CALGARY = "lat=51.0478&lon=-114.0700"
+
+CASES = [
+    # Health and metrics
+    Case('health_check', 'health_check', request=lambda data, i: {'user': None}),
+    Case('readiness_check', 'readiness_check', request=lambda data, i: {'user': None}),
+    Case('metrics', 'metrics', request=lambda data, i: {'user': None, 'headers': {'Authorization': 'Bearer benchmark'}}),
+
+    # Authentication and users (password hashing dominates these on purpose: it is the real cost)
+    Case('get_token', 'get_token', method='post', iterations=5,
+         request=lambda data, i: {'user': None, 'data': {'username': USERNAME.format(index=i % 10), 'password': PASSWORD}}),
+    Case('refresh', 'refresh', method='post',
+         request=lambda data, i: {'user': None, 'data': {'refresh': str(RefreshToken.for_user(user(data, i)))}}),
+    Case('register', 'register', method='post', iterations=5,
+         request=lambda data, i: {'user': None, 'expect': 201,
+                                  'data': {'username': f'new-user-{i}', 'password': PASSWORD, 'email': f'new{i}@example.com'}}),
+    Case('user_details', 'user_details', request=lambda data, i: {'user': user(data, i)}),
+    Case('my_profile', 'my_profile', request=lambda data, i: {'user': user(data, i)}),
+
+    # Adoption applications
+    Case('adoption_application', 'adoption_application', method='post',
+         request=lambda data, i: {'expect': 201, 'data': {'pet_id': pick(data.available_pet_ids, i), 'message': 'Hello!'}}),
+    Case('adoption_application_detail', 'adoption_application_detail',
+         request=lambda data, i: {'args': {'pk': pick(data.pending_application_ids, i)}}),
+    Case('adoption_applications', 'adoption_applications', request=lambda data, i: {'user': user(data, i)}),
+    Case('update_application_status', 'update_application_status', method='patch',
+         request=lambda data, i: {'args': {'pk': pick(data.pending_application_ids, -1 - i)}, 'data': {'application_status': 'Rejected'}}),
+    Case('bulk_review_applications[50]', 'bulk_review_applications', method='post',
+         request=lambda data, i: {'data': [{'application_id': application_id, 'status': 'Rejected'}
+                                           for application_id in data.pending_application_ids[i * 50:(i + 1) * 50]]}),
+
+    # Shelters
+    Case('create_shelter', 'create_shelter', method='post',
+         request=lambda data, i: {'expect': 201, 'data': {'name': f'New Shelter {i}', 'address': '100 7 Ave SW, Calgary, AB T2P 1A1'}}),
+    Case('shelter_list', 'shelter_list', request=lambda data, i: {'user': user(data, i)}),
+    Case('shelter_stats', 'shelter_stats'),
+    Case('update_shelter', 'update_shelter', request=lambda data, i: {'args': {'pk': pick(data.shelter_ids, i)}}),
+
+    # Pets
+    Case('register_pet', 'register_pet', method='post',
+         request=lambda data, i: {'expect': 201, 'data': {'name': 'Newbie', 'age': 2, 'gender': 'Female', 'domesticated': True,
+                                                          'pet_type': 'Cat', 'shelter_id': pick(data.shelter_ids, i)}}),
+    Case('pet_list', 'pet_list', request=lambda data, i: {'user': None}),
+    Case('pet_list[filtered]', 'pet_list', request=lambda data, i: {'user': None, 'query': 'pet_type=Cat&gender=Female&min_age=3'}),
+    Case('pet_list[shelter]', 'pet_list', request=lambda data, i: {'user': None, 'query': f'shelter_id={pick(data.shelter_ids, i)}'}),
+    Case('pet_search', 'pet_search', request=lambda data, i: {'user': None, 'query': 'q=buddy'}),
+    Case('pet_nearby', 'pet_nearby', request=lambda data, i: {'user': None, 'query': f'{CALGARY}&radius=50'}),
+    Case('pet_bulk[csv export]', 'pet_bulk', iterations=5, request=lambda data, i: {'query': 'file_format=csv'}),
+    Case('pet_detail', 'pet_detail', request=lambda data, i: {'user': user(data, i), 'args': {'pk': pick(data.pet_ids, i * 7)}}),
+
+    # Favourites
+    Case('favourite_pet', 'favourite_pet', method='post',
+         request=lambda data, i: {'expect': 201, 'args': {'pk': pick(data.pet_ids, i)}}),
+    Case('remove_favourite', 'remove_favourite', method='delete',
+         request=lambda data, i: {'expect': 204, 'user': User(pk=data.favourites[i][0]), 'args': {'pet_id': data.favourites[i][1]}}),
+    Case('favourite_list', 'favourite_list', request=lambda data, i: {'user': user(data, i)}),
+
+    # Donations
+    Case('donate', 'donate', method='post',
+         request=lambda data, i: {'user': user(data, i), 'expect': 201, 'data': {'shelter_id': pick(data.shelter_ids, i), 'amount': '25.00'}}),
+    Case('donation_detail', 'donation_detail', request=lambda data, i: {'user': user(data, i), 'args': {'pk': pick(data.donation_ids, i)}}),
+    Case('donation_list', 'donation_list', request=lambda data, i: {'user': user(data, i)}),
+    Case('donation_report[shelter]', 'donation_report'),
+    Case('donation_report[month]', 'donation_report', request=lambda data, i: {'query': 'group_by=month'}),
+]
+
+# URL names without a case, and why
+SKIPPED = {
+    'test': "Example endpoint returning a constant.",
+    'register_admin': "Same work as register.",
+    'create_shelter_management': "Shelter management records are not part of the benchmark dataset.",
+    'shelter_management_detail': "Shelter management records are not part of the benchmark dataset.",
+    'update_shelter_management': "Shelter management records are not part of the benchmark dataset.",
+    'media': "Serves files from disk; the fixtures have no images.",
+}
+
+def url_names(patterns=None):
+    """Return the names of the project's URLs, leaving out namespaced apps (admin, api-auth)."""
+    names = set()
+    for pattern in get_resolver().url_patterns if patterns is None else patterns:
+        if isinstance(pattern, URLResolver):
+            if pattern.namespace is None:
+                names |= url_names(pattern.url_patterns)
+        elif isinstance(pattern, URLPattern) and pattern.name:
+            names.add(pattern.name)
+    return names
+
+def test_every_endpoint_has_a_case():
+    covered = {case.url_name for case in CASES} | set(SKIPPED)
+    assert url_names() - covered == set(), "Add a benchmark case (or a SKIPPED reason) for these URL names"
+    assert len({case.name for case in CASES}) == len(CASES), "Case names must be unique"
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('case', CASES, ids=[case.name for case in CASES])
+def test_endpoint(case, benchmark_data, benchmark_baseline, benchmark_results, pytestconfig):
+    result = measure(case, benchmark_data, pytestconfig.getoption('benchmark_iterations'),
+                     warm_cache=pytestconfig.getoption('benchmark_warm_cache'))
+    benchmark_results[case.name] = result
+
+    regressions = compare(result, benchmark_baseline.get(case.name), pytestconfig.getoption('benchmark_max_regression'))
+    if regressions:
+        pytest.fail(f"{case.name} regressed: " + "; ".join(regressions), pytrace=False)
@@ -0,0 +1,72 @@
+"""
+Benchmarks of the serialized pet row cache (CachedPetListSerializer in api/serializers.py).
+
+Serializes 10k and 100k pets (built in memory, so the numbers are the serializer's alone) in four ways:
+- uncached: the row cache disabled (PET_ROW_CACHE_ALIAS='').
+- cold: an empty row cache; every row is serialized and stored.
+- warm: every row is a cache hit.
+- changed: 1% of the rows were saved since the last run, as when a page is rebuilt after writes.
+
+Results are reported and compared with the baseline like the endpoint cases (pet_rows[<rows> <mode>]).
+"""
+
+import random
+from datetime import timedelta
+
+import pytest
+from django.test import override_settings
+from django.utils import timezone
+
+from api.cache import pet_row_cache
+from api.models import Pet, Shelter
+from api.serializers import PetSerializer
+
+from .runner import compare, measure_function
+
+ROW_COUNTS = (10_000, 100_000)
+CHANGED_FRACTION = 0.01
+ITERATIONS = {10_000: 10, 100_000: 3}
+
+def build_pets(count):
+    # Half of the pets have a photo, so the image and variant URL fields do their usual work
+    now = timezone.now()
+    shelters = [Shelter(shelter_id=index, name=f"Shelter {index}", updated_at=now) for index in range(1, 101)]
+    return [
+        Pet(pet_id=index, name=f"Pet {index}", age=index % 15 + 1, gender="Female" if index % 2 else "Male",
+            domesticated=True, adoption_status="Available", pet_type="Dog", updated_at=now,
+            image=f"pet_images/{index:064x}.jpg" if index % 2 else None, shelter_id=shelters[index % len(shelters)])
+        for index in range(1, count + 1)
+    ]
+
+def serialize(pets):
+    return PetSerializer(pets, many=True).data
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('rows', ROW_COUNTS)
+def test_pet_row_cache(rows, benchmark_baseline, benchmark_results, pytestconfig):
+    pets = build_pets(rows)
+    rng = random.Random(rows)
+
+    def touch_some():
+        # Saving a pet moves its updated_at forward, which gives it a new row key
+        for pet in rng.sample(pets, int(rows * CHANGED_FRACTION)):
+            pet.updated_at += timedelta(microseconds=1)
+
+    iterations = ITERATIONS[rows]
+    with override_settings(PET_ROW_CACHE_ALIAS=''):
+        expected = serialize(pets)
+        results = {'uncached': measure_function(lambda: serialize(pets), iterations)}
+    results['cold'] = measure_function(lambda: serialize(pets), iterations, setup=pet_row_cache().clear)
+    results['warm'] = measure_function(lambda: serialize(pets), iterations)
+    results['changed'] = measure_function(lambda: serialize(pets), iterations, setup=touch_some)
+    assert serialize(pets) == expected  # Cached rows are the same representation
+
+    failures = []
+    for mode, result in results.items():
+        name = f"pet_rows[{rows} {mode}]"
+        benchmark_results[name] = result
+        regressions = compare(result, benchmark_baseline.get(name), pytestconfig.getoption('benchmark_max_regression'))
+        failures += [f"{name} regressed: " + "; ".join(regressions)] if regressions else []
+    if failures:
+        pytest.fail("\n".join(failures), pytrace=False)
+    assert results['warm']['p50_ms'] < results['uncached']['p50_ms'], "Cached rows should be faster than serializing"
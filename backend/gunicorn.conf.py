@@ -0,0 +1,44 @@
+"""
+Gunicorn configuration for the production backend (see start.sh).
+
+SERVER_MODE selects the application:
+- wsgi (default): adoptify_backend/wsgi.py on threaded (gthread) workers.
+- asgi: adoptify_backend/asgi.py on uvicorn workers (for the async views).
+
+Every setting can be overridden from the environment:
+- WEB_CONCURRENCY: Worker processes (default: 2 x CPUs + 1).
+- GUNICORN_THREADS: Threads per wsgi worker (default: 4). Each thread keeps its own persistent
+  database connection, so the MySQL connections in use are at most WEB_CONCURRENCY x GUNICORN_THREADS.
+- GUNICORN_TIMEOUT, GUNICORN_MAX_REQUESTS, GUNICORN_BIND.
+"""
+
+import multiprocessing
+import os
+
+SERVER_MODE = os.getenv('SERVER_MODE', 'wsgi')
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:8000')
+workers = int(os.getenv('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+
+if SERVER_MODE == 'asgi':
+    wsgi_app = 'adoptify_backend.asgi:application'
+    worker_class = 'uvicorn.workers.UvicornWorker'
+else:
+    wsgi_app = 'adoptify_backend.wsgi:application'
+    worker_class = 'gthread'
+    threads = int(os.getenv('GUNICORN_THREADS', '4'))
+
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '30'))
+graceful_timeout = 30
+keepalive = 5  # Seconds to keep idle client connections open (behind a proxy or load balancer)
+
+# Restart workers periodically (with jitter, so they do not all restart at once) to bound memory growth
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', '2000'))
+max_requests_jitter = max_requests // 10
+
+# The app is loaded in each worker (not preloaded), so the background image threads and the
+# in-process caches are created after the fork
+preload_app = False
+
+accesslog = None  # Requests are already logged by api.middleware.RequestMetricsMiddleware
+errorlog = '-'
@@ -0,0 +1,100 @@
+"""
+A small HTTP load generator for comparing backend serving modes (standard library only).
+
+Usage:
+    python loadtest.py http://localhost:8000/api/pets/ --concurrency 16 --duration 20
+    python loadtest.py http://localhost:8000/api/pets/ http://localhost:8000/api/pets/search/?q=dog
+
+Each client thread keeps one HTTP/1.1 keep-alive connection and requests the URLs in turn for the
+given duration. The report shows throughput, latency percentiles and errors (non-2xx/304 responses
+or failed connections), e.g. to compare SERVER_MODE=dev (runserver) with SERVER_MODE=wsgi (gunicorn),
+or SERVER_MODE=wsgi with SERVER_MODE=asgi (async views) at the same WEB_CONCURRENCY:
+
+    SERVER_MODE=asgi WEB_CONCURRENCY=1 gunicorn -c gunicorn.conf.py
+    python loadtest.py http://localhost:8000/api/pets/ http://localhost:8000/api/pets/1/ --concurrency 64 --token <access token>
+"""
+
+import argparse
+import http.client
+import statistics
+import threading
+import time
+from urllib.parse import urlsplit
+
+def _client(urls, deadline, headers, latencies, errors, lock):
+    connection = None
+    local_latencies, local_errors = [], 0
+    index = 0
+    while time.monotonic() < deadline:
+        url = urls[index % len(urls)]
+        index += 1
+        parts = urlsplit(url)
+        path = parts.path + (f'?{parts.query}' if parts.query else '')
+        start = time.perf_counter()
+        try:
+            if connection is None:
+                connection_class = http.client.HTTPSConnection if parts.scheme == 'https' else http.client.HTTPConnection
+                connection = connection_class(parts.netloc, timeout=30)
+            connection.request('GET', path, headers=headers)
+            response = connection.getresponse()
+            response.read()
+            if response.status >= 400:
+                local_errors += 1
+            if response.getheader('Connection', '').lower() == 'close':
+                connection.close()
+                connection = None
+        except (OSError, http.client.HTTPException):
+            local_errors += 1
+            if connection is not None:
+                connection.close()
+            connection = None
+            continue
+        local_latencies.append(time.perf_counter() - start)
+    if connection is not None:
+        connection.close()
+    with lock:
+        latencies.extend(local_latencies)
+        errors[0] += local_errors
+
+def run(urls, concurrency, duration, headers=None):
+    """
+    Run the load test.
+
+    Returns:
+        dict: requests, errors, requests_per_second and p50/p95/p99 latencies in milliseconds.
+    """
+    latencies, errors, lock = [], [0], threading.Lock()
+    deadline = time.monotonic() + duration
+    threads = [
+        threading.Thread(target=_client, args=(urls, deadline, headers or {}, latencies, errors, lock))
+        for _ in range(concurrency)
+    ]
+    started = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - started
+
+    report = {'requests': len(latencies), 'errors': errors[0], 'requests_per_second': len(latencies) / elapsed}
+    if len(latencies) >= 2:
+        cuts = statistics.quantiles(latencies, n=100)
+        report.update({'p50_ms': cuts[49] * 1000, 'p95_ms': cuts[94] * 1000, 'p99_ms': cuts[98] * 1000})
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test one or more backend URLs.")
+    parser.add_argument('urls', nargs='+', help="URLs to request in turn.")
+    parser.add_argument('--concurrency', type=int, default=16, help="Concurrent client connections.")
+    parser.add_argument('--duration', type=float, default=20, help="Seconds to run.")
+    parser.add_argument('--token', help="JWT access token to send as a Bearer token.")
+    args = parser.parse_args()
+
+    headers = {'Authorization': f'Bearer {args.token}'} if args.token else {}
+    report = run(args.urls, args.concurrency, args.duration, headers)
+    print(f"{report['requests']} requests, {report['errors']} errors, {report['requests_per_second']:.1f} req/s")
+    if 'p50_ms' in report:
+        print(f"latency p50 {report['p50_ms']:.1f} ms, p95 {report['p95_ms']:.1f} ms, p99 {report['p99_ms']:.1f} ms")
+
+if __name__ == '__main__':
+    main()
@@ -6,7 +6,9 @@ import sys
 
 def main():
     """Run administrative tasks."""
-    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'adoptify_backend.settings')
+    # "manage.py test" runs against the in-memory test database (see adoptify_backend/test_settings.py)
+    testing = len(sys.argv) > 1 and sys.argv[1] == 'test'
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'adoptify_backend.test_settings' if testing else 'adoptify_backend.settings')
     try:
         from django.core.management import execute_from_command_line
     except ImportError as exc:
@@ -0,0 +1,25 @@
+#!/bin/sh
+# Start the backend container: wait for MySQL, apply migrations (unless MIGRATE_ON_START=0), then serve according to SERVER_MODE
+# (dev: Django's autoreloading development server; wsgi/asgi: gunicorn, see gunicorn.conf.py).
+set -e
+
+python wait_for_db.py
+# Release tasks; with several replicas, run them once per deploy and start the others with MIGRATE_ON_START=0
+# (each one is a full Python + Django startup, see python manage.py profile_startup)
+if [ "${MIGRATE_ON_START:-1}" = "1" ]; then
+    python manage.py migrate --noinput
+    python manage.py geocode_shelters  # Locate shelters saved before they had coordinates (offline lookup)
+fi
+
+case "${SERVER_MODE:-wsgi}" in
+    dev)
+        exec python manage.py runserver 0.0.0.0:8000
+        ;;
+    wsgi|asgi)
+        exec gunicorn -c gunicorn.conf.py
+        ;;
+    *)
+        echo "Unknown SERVER_MODE '${SERVER_MODE}' (use dev, wsgi or asgi)" >&2
+        exit 1
+        ;;
+esac
@@ -1,19 +1,63 @@
-import time
-import MySQLdb
+"""
+Database readiness probe for the backend container.
+
+Usage:
+    python wait_for_db.py                 # Wait until the database accepts queries (container start-up)
+    python wait_for_db.py --once          # Check once; exit 0 if ready, 1 if not (health checks)
+    python wait_for_db.py --migrations    # Also require every migration to be applied
+
+The check uses the Django DATABASES settings, so it probes exactly the database the app will use.
+"""
+
+import argparse
 import os
+import sys
+import time
 
-db_settings = {
-    "host": os.environ.get("DB_HOST", "db"),
-    "user": os.environ.get("DB_USER", "adoptify_user"),
-    "passwd": os.environ.get("DB_PASSWORD", "yourpassword"),
-    "db": os.environ.get("DB_NAME", "adoptify"),
-}
+import django
 
-while True:
+def check_database(require_migrations=False):
+    """Return None if the database is ready, otherwise the reason it is not."""
+    from django.db import DatabaseError, connections
+    from django.db.migrations.executor import MigrationExecutor
+
+    connection = connections['default']
     try:
-        conn = MySQLdb.connect(**db_settings)
-        print("✅ Database is ready!")
-        break
-    except MySQLdb.OperationalError as e:
-        print("⏳ Waiting for database...", str(e))
-        time.sleep(2)
+        connection.close_if_unusable_or_obsolete()
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        if require_migrations:
+            executor = MigrationExecutor(connection)
+            pending = executor.migration_plan(executor.loader.graph.leaf_nodes())
+            if pending:
+                return f"{len(pending)} unapplied migration(s)"
+    except DatabaseError as e:
+        connection.close()  # Reconnect from scratch on the next attempt
+        return str(e)
+    return None
+
+def main():
+    parser = argparse.ArgumentParser(description="Wait for (or check) the backend database.")
+    parser.add_argument('--once', action='store_true', help="Check once and exit 0 (ready) or 1 (not ready).")
+    parser.add_argument('--migrations', action='store_true', help="Also require all migrations to be applied.")
+    parser.add_argument('--timeout', type=float, default=120, help="Seconds to wait before giving up (0 waits forever).")
+    parser.add_argument('--interval', type=float, default=2, help="Seconds between attempts.")
+    args = parser.parse_args()
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'adoptify_backend.settings')
+    django.setup()
+
+    deadline = time.monotonic() + args.timeout if args.timeout else None
+    while True:
+        error = check_database(args.migrations)
+        if error is None:
+            print("✅ Database is ready!")
+            return 0
+        if args.once or (deadline and time.monotonic() >= deadline):
+            print("❌ Database is not ready:", error, file=sys.stderr)
+            return 1
+        print("⏳ Waiting for database...", error)
+        time.sleep(args.interval)
+
+if __name__ == '__main__':
+    sys.exit(main())
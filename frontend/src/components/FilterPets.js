@@ -1,6 +1,6 @@
 import React, { useState } from 'react';
 
-function FilterPets({ pets, onFilter }) {
+function FilterPets({ onFilter }) {
     const [filter, setFilter] = useState({
         pet_type: '',
         gender: '',
@@ -15,16 +15,8 @@ function FilterPets({ pets, onFilter }) {
         };
         setFilter(updatedFilter);
 
-        // Apply the filter and pass the filtered pets to the parent
-        const filteredPets = pets.filter((pet) => {
-            return (
-                (updatedFilter.pet_type === '' || pet.pet_type === updatedFilter.pet_type) &&
-                (updatedFilter.gender === '' || pet.gender === updatedFilter.gender) &&
-                (updatedFilter.adoption_status === '' || pet.adoption_status === updatedFilter.adoption_status)
-            );
-        });
-
-        onFilter(filteredPets);
+        // Pass the selected filters to the parent, which asks the API for the matching pets
+        onFilter(updatedFilter);
     };
 
     return (
@@ -77,4 +69,4 @@ function FilterPets({ pets, onFilter }) {
     );
 }
 
-export default FilterPets;
\ No newline at end of file
+export default FilterPets;
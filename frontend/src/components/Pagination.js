@@ -0,0 +1,21 @@
+import React from 'react';
+
+// Previous/Next buttons for a cursor-paginated list (the URLs come from the API's previous/next links)
+function Pagination({ previous, next, onPageChange }) {
+    if (!previous && !next) {
+        return null; // Everything fits on one page
+    }
+
+    return (
+        <div className="pagination">
+            <button className="button button--outline" onClick={() => onPageChange(previous)} disabled={!previous}>
+                Previous
+            </button>
+            <button className="button button--outline" onClick={() => onPageChange(next)} disabled={!next}>
+                Next
+            </button>
+        </div>
+    );
+}
+
+export default Pagination;
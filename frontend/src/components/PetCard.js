@@ -72,7 +72,8 @@ function PetCard({ pet, isAdmin, onEdit, onDelete }) {
                 </button>
             )}
 
-            <img src={`http://localhost:8000${pet.image}`} alt={pet.name} className="pet-image" />
+            {/* Use the resized variant once the backend has generated it, otherwise the original upload */}
+            <img src={`http://localhost:8000${pet.image_medium || pet.image}`} alt={pet.name} className="pet-image" />
             <h3>{pet.name}</h3>
             <p><strong>Gender:</strong> {pet.gender}</p>
             <p><strong>Age:</strong> {pet.age} years</p>
@@ -108,6 +109,7 @@ PetCard.propTypes = {
         adoption_status: PropTypes.string.isRequired,
         shelter_name: PropTypes.string.isRequired, // Added Shelter
         image: PropTypes.string.isRequired,
+        image_medium: PropTypes.string, // Resized WebP variant (null until generated)
     }).isRequired,
     isAdmin: PropTypes.bool,
     onEdit: PropTypes.func,
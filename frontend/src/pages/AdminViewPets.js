@@ -2,9 +2,14 @@ import React, { useEffect, useState } from 'react';
 import { useNavigate } from 'react-router-dom'; // Import useNavigate for navigation
 import AdminPanel from '../components/AdminPanel';
 import PetCard from '../components/PetCard'; // Import the PetCard component
+import Pagination from '../components/Pagination'; // Import the Pagination component for the page buttons
+import { fetchPetsPage, petsUrl } from '../utils/FetchPets'; // Import the pet list helpers
 
 function AdminViewPets() {
-  const [pets, setPets] = useState([]); // State to store the list of pets
+  const [url, setUrl] = useState(petsUrl()); // URL of the page being shown (cursor included)
+  const [pets, setPets] = useState([]); // State to store the pets on the current page
+  const [next, setNext] = useState(null); // Cursor URL of the next page (null on the last page)
+  const [previous, setPrevious] = useState(null); // Cursor URL of the previous page (null on the first page)
   const [error, setError] = useState(''); // State to store error messages
   const [refresh, setRefresh] = useState(false); // State to trigger re-fetching of pets
   const navigate = useNavigate(); // Initialize navigation
@@ -13,25 +18,19 @@ function AdminViewPets() {
     const fetchPets = async () => {
       const token = localStorage.getItem('access'); // Get the admin token from localStorage
       try {
-        const response = await fetch('http://localhost:8000/api/pets/', {
-          method: 'GET',
-          headers: {
-            Authorization: `Bearer ${token}`, // Include token for authentication
-          },
-        });
-        if (response.ok) {
-          const data = await response.json(); // Parse the response JSON
-          setPets(data); // Update the pets state with the fetched data
-        } else {
-          setError('Failed to fetch pets'); // Set an error message if the request fails
-        }
+        // The API paginates, so only the page being shown is fetched
+        const data = await fetchPetsPage(url, token);
+        setPets(data.results); // Update the pets state with this page
+        setNext(data.next);
+        setPrevious(data.previous);
+        setError('');
       } catch (err) {
         setError('An error occurred while fetching pets'); // Handle any errors during the fetch process
       }
     };
 
-    fetchPets(); // Fetch the list of pets when the component mounts
-  }, [refresh]); // Re-fetch pets when the refresh state changes
+    fetchPets(); // Fetch the page when the component mounts or the URL changes
+  }, [url, refresh]); // Re-fetch when the page or the refresh state changes
 
   const handleEditClick = (petId) => {
     // Navigate to the edit pet page with the pet ID as a query parameter
@@ -52,7 +51,7 @@ function AdminViewPets() {
         },
       });
       if (response.ok) {
-        setPets((prevPets) => prevPets.filter((pet) => pet.pet_id !== petId)); // Remove the deleted pet from the state
+        setRefresh((prev) => !prev); // Re-fetch the page so the next pet moves up into it
         alert('Pet deleted successfully!'); // Show a success alert
       } else {
         setError('Failed to delete pet'); // Set an error message if the delete request fails
@@ -86,6 +85,9 @@ function AdminViewPets() {
           ))
         )}
       </div>
+
+      {/* Page buttons */}
+      <Pagination previous={previous} next={next} onPageChange={setUrl} />
     </div>
   );
 }
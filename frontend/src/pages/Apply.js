@@ -1,4 +1,4 @@
-import React, { useEffect, useState } from 'react';
+import React, { useEffect, useRef, useState } from 'react';
 import { useNavigate, useSearchParams } from 'react-router-dom';
 import Navbar from '../components/Navbar'; // Import the Navbar component
 
@@ -9,6 +9,7 @@ function Apply() {
   const [message, setMessage] = useState(''); // State for the adoption message
   const [error, setError] = useState(''); // State for error messages
   const navigate = useNavigate();
+  const idempotencyKey = useRef(crypto.randomUUID()); // Sent with every submission of this form, so a retry is not applied twice
 
   useEffect(() => {
     const fetchUserInfo = async () => {
@@ -65,6 +66,7 @@ function Apply() {
         headers: {
           'Content-Type': 'application/json', // Specify the content type as JSON
           Authorization: `Bearer ${token}`, // Include the token in the request headers
+          'Idempotency-Key': idempotencyKey.current, // Replays the first response if this is a retry
         },
         body: JSON.stringify(payload), // Convert the payload to a JSON string
       });
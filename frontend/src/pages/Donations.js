@@ -5,7 +5,7 @@
  * The `useStripe` and `useElements` hooks are used to interact with Stripe's API for creating payment methods.
  */
 
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { useNavigate } from 'react-router-dom';
 import { loadStripe } from '@stripe/stripe-js'; // Import Stripe for payment processing
 import { Elements, CardElement, useStripe, useElements } from '@stripe/react-stripe-js'; // Import Stripe components
@@ -23,6 +23,7 @@ function Donations() {
     const navigate = useNavigate(); // Initialize navigation
     const stripe = useStripe(); // Initialize Stripe
     const elements = useElements(); // Initialize Stripe elements
+    const attempt = useRef(null); // Idempotency key and payment method of the donation being submitted (reused on retry)
 
     useEffect(() => {
         const fetchShelters = async () => {
@@ -54,6 +55,10 @@ function Donations() {
         fetchShelters(); // Fetch the list of shelters when the component mounts
     }, [navigate]); // Dependency array ensures the effect runs when `navigate` changes
 
+    useEffect(() => {
+        attempt.current = null; // A different shelter or amount is a new donation
+    }, [selectedShelter, amount]);
+
     const handleDonate = async (e) => {
         e.preventDefault(); // Prevent the default form submission behavior
         setError(''); // Clear any previous error messages
@@ -67,14 +72,18 @@ function Donations() {
         const cardElement = elements.getElement(CardElement); // Get the CardElement from Stripe
 
         try {
-            const { paymentMethod, error: stripeError } = await stripe.createPaymentMethod({
-                type: 'card', // Specify the payment method type as "card"
-                card: cardElement, // Pass the CardElement
-            });
+            if (!attempt.current) {
+                const { paymentMethod, error: stripeError } = await stripe.createPaymentMethod({
+                    type: 'card', // Specify the payment method type as "card"
+                    card: cardElement, // Pass the CardElement
+                });
 
-            if (stripeError) {
-                setError(stripeError.message); // Set the error message if Stripe returns an error
-                return;
+                if (stripeError) {
+                    setError(stripeError.message); // Set the error message if Stripe returns an error
+                    return;
+                }
+                // Retries of this donation send the same key, so the backend records it only once
+                attempt.current = { key: crypto.randomUUID(), paymentMethodId: paymentMethod.id };
             }
 
             const token = localStorage.getItem('access'); // Retrieve the access token from localStorage
@@ -88,15 +97,17 @@ function Donations() {
                 headers: {
                     'Content-Type': 'application/json', // Specify the content type as JSON
                     Authorization: `Bearer ${token}`, // Include the token for authentication
+                    'Idempotency-Key': attempt.current.key, // Replays the first response if this is a retry
                 },
                 body: JSON.stringify({
                     shelter_id: selectedShelter, // Include the selected shelter ID
                     amount: parseFloat(amount), // Include the donation amount
-                    payment_method_id: paymentMethod.id, // Include the payment method ID from Stripe
+                    payment_method_id: attempt.current.paymentMethodId, // Include the payment method ID from Stripe
                 }),
             });
 
             if (response.ok) {
+                attempt.current = null; // The next donation gets a new key
                 setSuccess('Thank you for your donation!'); // Show a success message
                 setAmount(''); // Clear the donation amount
                 setSelectedShelter(''); // Clear the selected shelter
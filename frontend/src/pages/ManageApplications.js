@@ -41,6 +41,21 @@ function ManageApplications() {
         fetchApplications(); // Fetch the list of applications when the component mounts
     }, [navigate]); // Dependency array ensures the effect runs when `navigate` changes
 
+    const applyStatusUpdate = (data) => {
+        // Replace the reviewed application; on approval, competing pending applications were rejected
+        setApplications((prevApplications) =>
+            prevApplications.map((application) => {
+                if (application.application_id === data.application.application_id) {
+                    return data.application;
+                }
+                if (data.status === 'Approved' && application.pet_id === data.pet_id && application.application_status === 'Pending') {
+                    return { ...application, application_status: 'Rejected' };
+                }
+                return application;
+            })
+        );
+    };
+
     const handleApprove = async (applicationId) => {
         const token = localStorage.getItem('access'); // Retrieve the access token from localStorage
         if (!token) {
@@ -64,34 +79,10 @@ function ManageApplications() {
                 const data = await response.json(); // Parse the response JSON
                 console.log('Application approved:', data); // Log the success response
 
-                // Ensure pet_id is retrieved correctly
-                const petId = data.pet_id; // Extract the pet ID from the response
-                if (!petId) {
-                    console.error('Pet ID is missing in the response.'); // Log an error if the pet ID is missing
-                    alert('Failed to update pet status. Please try again.'); // Show an error alert
-                    return;
-                }
-
-                // Update the pet's status to "Adopted"
-                const petResponse = await fetch(`http://localhost:8000/api/pets/${petId}/`, {
-                    method: 'PATCH',
-                    headers: {
-                        'Content-Type': 'application/json', // Specify the content type as JSON
-                        Authorization: `Bearer ${token}`, // Include the token for authentication
-                    },
-                    body: JSON.stringify({ adoption_status: 'Adopted' }), // Update the pet's adoption status to "Adopted"
-                });
-
-                if (petResponse.ok) {
-                    console.log('Pet status updated to Adopted.'); // Log the success response
-                    setSelectedApplication(null); // Close the modal
-                    fetchApplications(); // Refresh the list of applications
-                    alert('Application approved successfully!'); // Show a success alert
-                    navigate('/admin/applications'); // Redirect after refreshing
-                } else {
-                    console.error('Failed to update pet status.'); // Log an error if the request fails
-                    alert('Failed to update pet status. Please try again.'); // Show an error alert
-                }
+                // The response already contains the updated application and pet; no follow-up request needed
+                applyStatusUpdate(data);
+                setSelectedApplication(null); // Close the modal
+                alert('Application approved successfully!'); // Show a success alert
             } else {
                 console.error('Failed to approve application.'); // Log an error if the request fails
                 alert('Failed to approve application. Please try again.'); // Show an error alert
@@ -125,34 +116,10 @@ function ManageApplications() {
                 const data = await response.json(); // Parse the response JSON
                 console.log('Application rejected:', data); // Log the success response
 
-                // Ensure pet_id is retrieved correctly
-                const petId = data.pet_id; // Extract the pet ID from the response
-                if (!petId) {
-                    console.error('Pet ID is missing in the response.'); // Log an error if the pet ID is missing
-                    alert('Failed to update pet status. Please try again.'); // Show an error alert
-                    return;
-                }
-
-                // Update the pet's status to "Available"
-                const petResponse = await fetch(`http://localhost:8000/api/pets/${petId}/`, {
-                    method: 'PATCH',
-                    headers: {
-                        'Content-Type': 'application/json', // Specify the content type as JSON
-                        Authorization: `Bearer ${token}`, // Include the token for authentication
-                    },
-                    body: JSON.stringify({ adoption_status: 'Available' }), // Update the pet's adoption status to "Available"
-                });
-
-                if (petResponse.ok) {
-                    console.log('Pet status updated to Available.'); // Log the success response
-                    setSelectedApplication(null); // Close the modal
-                    fetchApplications(); // Refresh the list of applications
-                    alert('Application rejected successfully!'); // Show a success alert
-                    navigate('/admin/applications'); // Redirect after refreshing
-                } else {
-                    console.error('Failed to update pet status.'); // Log an error if the request fails
-                    alert('Failed to update pet status. Please try again.'); // Show an error alert
-                }
+                // The response already contains the updated application and pet; no follow-up request needed
+                applyStatusUpdate(data);
+                setSelectedApplication(null); // Close the modal
+                alert('Application rejected successfully!'); // Show a success alert
             } else {
                 console.error('Failed to reject application.'); // Log an error if the request fails
                 alert('Failed to reject application. Please try again.'); // Show an error alert
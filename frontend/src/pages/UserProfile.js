@@ -19,36 +19,20 @@ function UserProfile() {
             }
 
             try {
-                // Fetch favourited animals
-                const favouritesResponse = await fetch('http://localhost:8000/api/favourite/list/', {
+                // Fetch the profile, favourites and applications in one request
+                const response = await fetch('http://localhost:8000/api/me/', {
                     method: 'GET',
                     headers: {
                         Authorization: `Bearer ${token}`, // Include the token in the request headers
                     },
                 });
 
-                if (favouritesResponse.ok) {
-                    const favouritesData = await favouritesResponse.json(); // Parse the response JSON
-                    console.log('Favourites data:', favouritesData); // Debug the response
-                    setFavourites(favouritesData); // Update the favourites state
+                if (response.ok) {
+                    const profileData = await response.json(); // Parse the response JSON (revalidated by ETag)
+                    setFavourites(profileData.favourites); // Update the favourites state
+                    setApplications(profileData.applications); // Update the applications state
                 } else {
-                    console.error('Failed to fetch favourites'); // Log an error if the request fails
-                }
-
-                // Fetch user applications
-                const applicationsResponse = await fetch('http://localhost:8000/api/adoption-application/list', {
-                    method: 'GET',
-                    headers: {
-                        Authorization: `Bearer ${token}`, // Include the token in the request headers
-                    },
-                });
-
-                if (applicationsResponse.ok) {
-                    const applicationsData = await applicationsResponse.json(); // Parse the response JSON
-                    console.log('Applications data:', applicationsData); // Debug the response
-                    setApplications(applicationsData); // Update the applications state
-                } else {
-                    console.error('Failed to fetch applications'); // Log an error if the request fails
+                    console.error('Failed to fetch profile data'); // Log an error if the request fails
                 }
             } catch (err) {
                 console.error('Error fetching user data:', err); // Log any errors during the fetch process
@@ -3,31 +3,37 @@ import { useNavigate } from 'react-router-dom'; // Import useNavigate for naviga
 import Navbar from '../components/Navbar'; // Import the Navbar component
 import PetCard from '../components/PetCard'; // Import the PetCard component for displaying pet details
 import FilterPets from '../components/FilterPets'; // Import the FilterPets component for filtering pets
+import Pagination from '../components/Pagination'; // Import the Pagination component for the page buttons
+import { fetchPetsPage, petsUrl } from '../utils/FetchPets'; // Import the pet list helpers
 
 function ViewPets() {
-  const [pets, setPets] = useState([]); // State to store the list of pets
-  const [filteredPets, setFilteredPets] = useState([]); // State to store the filtered list of pets
+  const [url, setUrl] = useState(petsUrl()); // URL of the page being shown (filters and cursor included)
+  const [pets, setPets] = useState([]); // State to store the pets on the current page
+  const [next, setNext] = useState(null); // Cursor URL of the next page (null on the last page)
+  const [previous, setPrevious] = useState(null); // Cursor URL of the previous page (null on the first page)
   const [error, setError] = useState(''); // State to store error messages
   const navigate = useNavigate(); // Initialize navigation
 
   useEffect(() => {
     const fetchPets = async () => {
       try {
-        const response = await fetch('http://localhost:8000/api/pets/'); // Fetch the list of pets from the API
-        if (response.ok) {
-          const data = await response.json(); // Parse the response JSON
-          setPets(data); // Update the pets state with the fetched data
-          setFilteredPets(data); // Initialize filteredPets with all pets
-        } else {
-          setError('Failed to fetch pets'); // Set an error message if the request fails
-        }
+        // The API filters and paginates, so only the page being shown is fetched
+        const data = await fetchPetsPage(url);
+        setPets(data.results); // Update the pets state with this page
+        setNext(data.next);
+        setPrevious(data.previous);
+        setError('');
       } catch (err) {
         setError('An error occurred while fetching pets'); // Handle any errors during the fetch process
       }
     };
 
-    fetchPets(); // Fetch the list of pets when the component mounts
-  }, []); // Empty dependency array ensures the effect runs only once
+    fetchPets(); // Fetch the page when the component mounts or the URL changes
+  }, [url]); // Re-fetch when the filters or the page change
+
+  const handleFilter = (filters) => {
+    setUrl(petsUrl(filters)); // Start again from the first page of the matching pets
+  };
 
   const handleApplyClick = (petId) => {
     // Navigate to the application page with the pet ID as a query parameter
@@ -46,13 +52,13 @@ function ViewPets() {
       </section>
 
       {/* FilterPets Component */}
-      <FilterPets pets={pets} onFilter={setFilteredPets} /> {/* Render the FilterPets component */}
+      <FilterPets onFilter={handleFilter} /> {/* Render the FilterPets component */}
 
       {/* Pets List */}
       <div className="pets-list">
         {error && <p className="error-message">{error}</p>} {/* Display error message if any */}
-        {filteredPets.length > 0 ? (
-          filteredPets.map((pet) => (
+        {pets.length > 0 ? (
+          pets.map((pet) => (
             <PetCard
               key={pet.petID} // Unique key for each PetCard
               pet={pet} // Pass the pet data to the PetCard
@@ -64,6 +70,9 @@ function ViewPets() {
           <p>No pets match the selected criteria.</p> /* Message if no pets match the filter */
         )}
       </div>
+
+      {/* Page buttons */}
+      <Pagination previous={previous} next={next} onPageChange={setUrl} />
     </div>
   );
 }
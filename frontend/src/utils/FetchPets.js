@@ -0,0 +1,26 @@
+// The pet list is filtered and cursor-paginated on the server (see backend/api/filters.py and pagination.py)
+export const PETS_URL = 'http://localhost:8000/api/pets/';
+export const PETS_PAGE_SIZE = 24;
+
+// Build the first-page URL for a set of filters, leaving out the ones set to "All" ('')
+export const petsUrl = (filters = {}) => {
+  const params = new URLSearchParams({ page_size: PETS_PAGE_SIZE });
+  Object.entries(filters).forEach(([name, value]) => {
+    if (value !== '') {
+      params.append(name, value);
+    }
+  });
+  return `${PETS_URL}?${params.toString()}`;
+};
+
+// Fetch one page of pets: { results, next, previous } (next/previous are cursor URLs or null)
+export const fetchPetsPage = async (url, token) => {
+  const response = await fetch(url, {
+    method: 'GET',
+    headers: token ? { Authorization: `Bearer ${token}` } : {},
+  });
+  if (!response.ok) {
+    throw new Error('Failed to fetch pets');
+  }
+  return response.json();
+};